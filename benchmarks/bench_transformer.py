@@ -0,0 +1,146 @@
+"""
+Benchmarks steps of etl.from_wp_ga4_to_report.transformer.Transformer on synthetic
+GA4-like data, comparing each optimized step with the code it replaced
+and checking that both give the same result:
+
+    url_paths   Transformer._normalize_url_paths vs Series.apply(_normalize_url_path)
+    benchmarks  Transformer._add_benchmark_differences vs one groupby and merge per metric
+    rolling     rolling_benchmarks over windows of 100 articles vs sorting every window
+
+Usage:
+
+    python benchmarks/bench_transformer.py --rows 100000 1000000 --unique-pages 5000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STEPS = ("url_paths", "benchmarks", "rolling")
+ROLLING_WINDOW_ARTICLES = 100
+
+
+def _best_seconds(function, repeat):
+    """Returns the best time of `repeat` calls of function, and its last result."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def _page_urls(n_rows, n_pages, seed=0):
+    """GA4 page paths and WordPress links: a few thousand pages repeated over the rows."""
+    rng = random.Random(seed)
+    pages = [f"/{rng.choice(['cinema', 'serie-tv', 'news'])}/{i}/titolo-articolo-{i}.html" for i in range(n_pages)]
+    variants = ["", "/", "?utm_source=newsletter", "#commenti", "https://www.example.it"]
+    urls = []
+    for _ in range(n_rows):
+        variant = rng.choice(variants)
+        page = rng.choice(pages)
+        urls.append(variant + page if variant.startswith("http") else page + variant)
+    urls[::1000] = [None] * len(urls[::1000])
+    return pd.Series(urls, dtype=object)
+
+
+def _bench_url_paths(transformer, n_rows, n_pages, repeat):
+    urls = _page_urls(n_rows, n_pages)
+    before, expected = _best_seconds(lambda: urls.apply(transformer._normalize_url_path), repeat)
+    after, result = _best_seconds(lambda: transformer._normalize_url_paths(urls), repeat)
+    pd.testing.assert_series_equal(result, expected)
+    return before, after
+
+
+def _articles(n_rows, seed=0):
+    """Merged WordPress and GA4 rows: a year of articles with their metrics."""
+    rng = np.random.default_rng(seed)
+    pubdate = pd.Series(pd.to_datetime("2024-05-01") + pd.to_timedelta(rng.integers(0, 365 * 86400, n_rows), unit="s"))
+    return pd.DataFrame({
+        "pubdate": pubdate.where(rng.random(n_rows) > 0.01),
+        "views": pd.Series(rng.integers(0, 5000, n_rows), dtype=float).where(rng.random(n_rows) > 0.05),
+        "active users": rng.integers(0, 500, n_rows),
+        "average engagement time per active user": rng.gamma(2, 30, n_rows),
+    })
+
+
+def _benchmark_differences_per_metric(df, metrics_for_benchmark, pubdate_col="pubdate"):
+    """The previous _add_benchmark_differences: a copy, a groupby and a merge per metric."""
+    df = df.copy()
+    df[pubdate_col] = pd.to_datetime(df[pubdate_col], errors="coerce")
+    df["merge_date_key"] = df[pubdate_col].dt.date
+    for metric, base_name in metrics_for_benchmark.items():
+        metric_df = df.copy()
+        metric_df[pubdate_col] = pd.to_datetime(metric_df[pubdate_col], errors="coerce")
+        metric_df = metric_df.dropna(subset=[pubdate_col, metric])
+        metric_df["date"] = metric_df[pubdate_col].dt.date
+        medians = metric_df.groupby("date", as_index=False)[metric].median().rename(columns={metric: "median"})
+        df = pd.merge(df, medians, left_on="merge_date_key", right_on="date", how="left")
+        df[f"diff_with_daily_benchmark_{base_name}"] = df[metric] - df["median"]
+        df = df.drop(columns=["median", "date"])
+    return df.drop(columns="merge_date_key")
+
+
+def _bench_benchmarks(transformer, n_rows, n_pages, repeat):
+    articles = _articles(n_rows)
+    metrics = transformer.metrics_for_benchmark
+    before, expected = _best_seconds(lambda: _benchmark_differences_per_metric(articles, metrics), repeat)
+    after, result = _best_seconds(lambda: transformer._add_benchmark_differences(articles, "pubdate"), repeat)
+    for base_name in metrics.values():
+        column = f"diff_with_daily_benchmark_{base_name}"
+        pd.testing.assert_series_equal(result[column], expected[column])
+    return before, after
+
+
+def _rolling_medians_resorting(articles, metric):
+    """Median of the last ROLLING_WINDOW_ARTICLES articles up to each article, sorting every window."""
+    articles = articles.dropna(subset=["pubdate"]).sort_values("pubdate", kind="stable")
+    values = articles[metric].to_numpy(dtype=float)
+    medians = np.full(len(values), np.nan)
+    for i in range(len(values)):
+        window = values[max(0, i - ROLLING_WINDOW_ARTICLES + 1):i + 1]
+        window = window[~np.isnan(window)]
+        if len(window):
+            medians[i] = np.median(window)
+    return pd.Series(medians, index=articles.index)
+
+
+def _bench_rolling(transformer, n_rows, n_pages, repeat):
+    from etl.from_wp_ga4_to_report.rolling_benchmark import rolling_benchmarks
+    articles = _articles(n_rows)
+    before, expected = _best_seconds(lambda: _rolling_medians_resorting(articles, "views"), repeat)
+    after, result = _best_seconds(
+        lambda: rolling_benchmarks(articles, "pubdate", ["views"], ROLLING_WINDOW_ARTICLES), repeat
+    )
+    np.testing.assert_array_equal(result[("views", 50)].reindex(expected.index).to_numpy(), expected.to_numpy())
+    return before, after
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100000, 1000000], help="Rows per run.")
+    parser.add_argument("--unique-pages", type=int, default=5000, help="Distinct pages in the data.")
+    parser.add_argument("--steps", nargs="+", choices=STEPS, default=list(STEPS), help="Steps to run.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per step and size, the best is kept.")
+    args = parser.parse_args()
+
+    sys.path.append(PROJECT_ROOT)
+    from etl.from_wp_ga4_to_report.transformer import Transformer
+    transformer = Transformer({})
+    benchmarks = {"url_paths": _bench_url_paths, "benchmarks": _bench_benchmarks, "rolling": _bench_rolling}
+
+    print(f"{'step':<12}{'rows':>10}{'before s':>10}{'after s':>10}{'speedup':>9}")
+    for step in args.steps:
+        for n_rows in args.rows:
+            before, after = benchmarks[step](transformer, n_rows, args.unique_pages, args.repeat)
+            print(f"{step:<12}{n_rows:>10}{before:>10.3f}{after:>10.3f}{before / after:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
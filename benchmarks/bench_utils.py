@@ -0,0 +1,44 @@
+"""
+Helpers shared by the benchmark scripts.
+
+Every measured run happens in a fresh child process running the benchmark script
+itself with `--child ...` arguments, so its peak RSS is not skewed by other runs.
+The child prints its result as a JSON line.
+"""
+import json
+import resource
+import subprocess
+import sys
+
+
+def peak_rss_mb():
+    """Peak resident set size of the current process, in MB."""
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux, in bytes on macOS
+    return peak_rss / (1 << 20) if sys.platform == "darwin" else peak_rss / 1024
+
+
+def print_result(**result):
+    """Prints a child's result for `run_child`, with its peak RSS."""
+    print(json.dumps(dict(result, peak_rss_mb=peak_rss_mb())))
+
+
+def run_child(script_path, child_args, repeat=1):
+    """
+    Runs `script_path --child *child_args` `repeat` times.
+    Returns the result of the first run, with the best 'seconds' and the highest 'peak_rss_mb'.
+    """
+    results = []
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, script_path, "--child", *map(str, child_args)],
+            capture_output=True, text=True
+        )
+        if completed.returncode != 0:
+            raise RuntimeError(f"Benchmark run {child_args} failed:\n{completed.stderr}")
+        results.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+    return dict(
+        results[0],
+        seconds=min(r["seconds"] for r in results),
+        peak_rss_mb=max(r["peak_rss_mb"] for r in results)
+    )
@@ -0,0 +1,85 @@
+"""
+Benchmarks the three WordPress export parsers on synthetic exports of growing size:
+
+    extractor  etl.from_wp_ga4_to_report.extractor.Extractor.extract_wp_data (XML)
+    xml_utils  td_data_toolkit.utils.xml_utils.get_articles_from_xml
+    get_data   postgresql_server/get_data.get_articles_from_xml
+
+For every size and parser it reports items/sec (items in the export, whatever their
+post type), MB/sec of XML and the peak RSS of the parsing process. Usage:
+
+    python benchmarks/bench_wp_parsers.py --sizes 1000 10000 100000 --content-words 300 --postmeta 5
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from bench_utils import print_result, run_child
+from wxr_generator import write_wxr
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PARSERS = ("extractor", "xml_utils", "get_data")
+
+
+def _parse_once(parser_name, file_path, extractor_mode):
+    """Parses the export with one parser and prints the timing and peak RSS."""
+    sys.path.append(PROJECT_ROOT)
+    if parser_name == "extractor":
+        from etl.from_wp_ga4_to_report.extractor import Extractor
+        extractor = Extractor({
+            "GA4_FILE_PATH": None, "WP_FILE_PATH": file_path, "WP_FILE_TYPE": "xml", "WP_XML_MODE": extractor_mode
+        })
+        parse = extractor.extract_wp_data
+    elif parser_name == "xml_utils":
+        from td_data_toolkit.utils.xml_utils import get_articles_from_xml
+        parse = lambda: get_articles_from_xml(file_path)
+    else:
+        # get_data imports the server's models as top-level modules
+        sys.path.append(os.path.join(PROJECT_ROOT, "postgresql_server"))
+        from get_data import get_articles_from_xml
+        parse = lambda: get_articles_from_xml(file_path)
+
+    start = time.perf_counter()
+    rows = parse()
+    print_result(rows=len(rows), seconds=time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="Items per export.")
+    parser.add_argument("--content-words", type=int, default=300, help="Words in each post content.")
+    parser.add_argument("--postmeta", type=int, default=5, help="Extra postmeta entries per item.")
+    parser.add_argument("--parsers", nargs="+", choices=PARSERS, default=list(PARSERS), help="Parsers to run.")
+    parser.add_argument("--extractor-mode", default="stream", choices=("stream", "tree", "parallel"),
+                        help="WP_XML_MODE of the Extractor.")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per parser and size, the best is kept.")
+    parser.add_argument("--data-dir", help="Keep the generated exports here and reuse them on later runs.")
+    parser.add_argument("--child", nargs=3, metavar=("PARSER", "FILE", "MODE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _parse_once(*args.child)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_dir = args.data_dir or tmp_dir
+        os.makedirs(data_dir, exist_ok=True)
+        print(f"{'items':>8}{'MB':>8}  {'parser':<11}{'rows':>8}{'seconds':>10}{'items/s':>11}{'MB/s':>8}{'peak RSS MB':>13}")
+        for n_items in args.sizes:
+            file_path = os.path.join(data_dir, f"wxr_{n_items}_{args.content_words}w_{args.postmeta}m.xml")
+            if not os.path.exists(file_path):
+                write_wxr(file_path, n_items, content_words=args.content_words, n_postmeta=args.postmeta)
+            size_mb = os.path.getsize(file_path) / (1 << 20)
+            for parser_name in args.parsers:
+                result = run_child(os.path.abspath(__file__), (parser_name, file_path, args.extractor_mode), args.repeat)
+                seconds = result["seconds"]
+                print(
+                    f"{n_items:>8}{size_mb:>8.1f}  {parser_name:<11}{result['rows']:>8}{seconds:>10.2f}"
+                    f"{n_items / seconds:>11.0f}{size_mb / seconds:>8.1f}{result['peak_rss_mb']:>13.1f}"
+                )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Compares the lxml and ElementTree XML backends on a synthetic WordPress export.
+
+Each run parses the export in a fresh process (see bench_utils). Usage:
+
+    python benchmarks/bench_xml_backend.py --items 20000 --repeat 3
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from bench_utils import print_result, run_child
+from wxr_generator import write_wxr
+
+MODES = ("stream", "tree")
+
+
+def _parse_once(backend, mode, file_path):
+    """Parses the export with one backend and prints the timing and peak RSS."""
+    from td_data_toolkit.utils.xml_utils import get_articles_from_xml, iter_wxr_items, read_wxr_item
+
+    start = time.perf_counter()
+    if mode == "stream":
+        n_items = 0
+        for item in iter_wxr_items(file_path, backend=backend):
+            read_wxr_item(item)
+            n_items += 1
+    else:
+        n_items = len(get_articles_from_xml(file_path, backend=backend))
+    print_result(items=n_items, seconds=time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=20000, help="Number of items in the synthetic export.")
+    parser.add_argument("--content-words", type=int, default=300, help="Words in each post content.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per backend and mode.")
+    parser.add_argument("--file", help="Benchmark this export instead of a synthetic one.")
+    parser.add_argument("--child", nargs=3, metavar=("BACKEND", "MODE", "FILE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _parse_once(*args.child)
+        return
+
+    from td_data_toolkit.utils.xml_backend import lxml_etree
+    backends = ["etree"] if lxml_etree is None else ["etree", "lxml"]
+    if lxml_etree is None:
+        print("lxml is not installed: only the ElementTree backend is benchmarked.")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = args.file
+        if file_path is None:
+            file_path = os.path.join(tmp_dir, "synthetic.xml")
+            write_wxr(file_path, args.items, content_words=args.content_words)
+        size_mb = os.path.getsize(file_path) / (1 << 20)
+        print(f"{file_path}: {size_mb:.1f} MB")
+        print(f"{'mode':<8}{'backend':<9}{'items':>9}{'seconds':>10}{'items/s':>11}{'speedup':>9}{'peak RSS MB':>13}")
+        for mode in MODES:
+            baseline = None
+            for backend in backends:
+                result = run_child(os.path.abspath(__file__), (backend, mode, file_path), args.repeat)
+                baseline = baseline or result["seconds"]
+                print(
+                    f"{mode:<8}{backend:<9}{result['items']:>9}{result['seconds']:>10.2f}"
+                    f"{result['items'] / result['seconds']:>11.0f}{baseline / result['seconds']:>8.2f}x"
+                    f"{result['peak_rss_mb']:>13.1f}"
+                )
+
+
+if __name__ == '__main__':
+    main()
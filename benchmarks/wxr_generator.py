@@ -0,0 +1,175 @@
+"""
+Writes synthetic WordPress (WXR) exports for benchmarking the XML readers.
+
+The files use the namespaces and layout of a real WordPress 1.2 export: a channel
+header with authors and terms, then one <item> per post, page or attachment with
+its categories, tags, postmeta and comments. Usage:
+
+    python benchmarks/wxr_generator.py export.xml --items 10000 --content-words 600 --postmeta 20
+"""
+import argparse
+import datetime
+import random
+from email.utils import format_datetime
+from xml.sax.saxutils import escape
+
+WXR_HEADER = '''<?xml version="1.0" encoding="UTF-8" ?>
+<!-- This is a WordPress eXtended RSS file generated by WordPress as an export of your site. -->
+<rss version="2.0"
+	xmlns:excerpt="http://wordpress.org/export/1.2/excerpt/"
+	xmlns:content="http://purl.org/rss/1.0/modules/content/"
+	xmlns:wfw="http://wellformedweb.org/CommentAPI/"
+	xmlns:dc="http://purl.org/dc/elements/1.1/"
+	xmlns:wp="http://wordpress.org/export/1.2/"
+>
+
+<channel>
+	<title>Taxidrivers</title>
+	<link>https://www.taxidrivers.it</link>
+	<description>Rivista di cinema</description>
+	<pubDate>Mon, 14 Apr 2025 08:00:00 +0000</pubDate>
+	<language>it-IT</language>
+	<wp:wxr_version>1.2</wp:wxr_version>
+	<wp:base_site_url>https://www.taxidrivers.it</wp:base_site_url>
+	<wp:base_blog_url>https://www.taxidrivers.it</wp:base_blog_url>
+
+	<wp:author><wp:author_id>1</wp:author_id><wp:author_login><![CDATA[redazione]]></wp:author_login><wp:author_email><![CDATA[redazione@taxidrivers.it]]></wp:author_email><wp:author_display_name><![CDATA[Redazione]]></wp:author_display_name></wp:author>
+	<wp:category><wp:term_id>1</wp:term_id><wp:category_nicename><![CDATA[recensioni]]></wp:category_nicename><wp:category_parent><![CDATA[]]></wp:category_parent><wp:cat_name><![CDATA[Recensioni]]></wp:cat_name></wp:category>
+	<wp:category><wp:term_id>2</wp:term_id><wp:category_nicename><![CDATA[in-sala]]></wp:category_nicename><wp:category_parent><![CDATA[]]></wp:category_parent><wp:cat_name><![CDATA[In Sala]]></wp:cat_name></wp:category>
+
+	<generator>https://wordpress.org/?v=6.5</generator>
+'''
+WXR_FOOTER = '''</channel>
+</rss>
+'''
+
+_WORDS = (
+    "film", "regia", "cinema", "sala", "attore", "attrice", "festival", "trama", "scena",
+    "recensione", "serie", "sguardo", "racconto", "personaggio", "montaggio", "fotografia",
+)
+_CATEGORIES = (("recensioni", "Recensioni"), ("in-sala", "In Sala"), ("festival", "Festival"),
+               ("anticipazioni", "Anticipazioni"), ("serie-tv", "Serie TV"))
+# Postmeta every post carries in a real export, before the `n_postmeta` filler keys.
+_POST_META = ("_edit_last", "_thumbnail_id", "post_views_count", "_yoast_wpseo_focuskw",
+              "_yoast_wpseo_metadesc", "_yoast_wpseo_linkdex", "_yoast_wpseo_content_score",
+              "_yoast_wpseo_keywordsynonyms", "_yoast_wpseo_estimated-reading-time-minutes")
+
+
+def _words(rng, n):
+    return " ".join(rng.choice(_WORDS) for _ in range(n))
+
+
+def _content(rng, content_words):
+    paragraphs = []
+    remaining = content_words
+    while remaining > 0:
+        n = min(remaining, rng.randint(40, 120))
+        paragraphs.append(f"<p>{_words(rng, n)} <a href=\"https://www.taxidrivers.it/\">{rng.choice(_WORDS)}</a> &amp; {rng.choice(_WORDS)}</p>")
+        remaining -= n
+    return "\n\n".join(paragraphs)
+
+
+def _meta_value(rng, key):
+    if key == "_yoast_wpseo_keywordsynonyms":
+        return f'["{rng.choice(_WORDS)}","{rng.choice(_WORDS)}"]'
+    if key == "_yoast_wpseo_metadesc":
+        return _words(rng, 20)
+    if key == "_yoast_wpseo_focuskw":
+        return _words(rng, 2)
+    if key in ("_thumbnail_id", "post_views_count", "_yoast_wpseo_linkdex", "_yoast_wpseo_content_score"):
+        return str(rng.randint(0, 5000 if key == "post_views_count" else 100))
+    return str(rng.randint(1, 10))
+
+
+def _postmeta(key, value):
+    return f'''		<wp:postmeta>
+			<wp:meta_key><![CDATA[{key}]]></wp:meta_key>
+			<wp:meta_value><![CDATA[{value}]]></wp:meta_value>
+		</wp:postmeta>
+'''
+
+
+def _item(i, rng, content_words, n_postmeta):
+    # Mostly posts, with the attachments and pages a news site export also holds
+    kind = rng.random()
+    post_type = "post" if kind < 0.85 else "attachment" if kind < 0.95 else "page"
+    published = datetime.datetime(2025, rng.randint(1, 12), rng.randint(1, 28), rng.randrange(24),
+                                  tzinfo=datetime.timezone.utc)
+    title = f"Titolo {i}: {_words(rng, 4)}"
+    slug = f"film-{i}-{rng.choice(_WORDS)}"
+    category_slug, category_name = rng.choice(_CATEGORIES)
+    link = (f"https://www.taxidrivers.it/{i}/{category_slug}/{slug}.html" if post_type == "post"
+            else f"https://www.taxidrivers.it/{slug}/")
+    content = _content(rng, content_words) if post_type != "attachment" else ""
+
+    parts = [f'''	<item>
+		<title><![CDATA[{title}]]></title>
+		<link>{escape(link)}</link>
+		<pubDate>{format_datetime(published)}</pubDate>
+		<dc:creator><![CDATA[redazione]]></dc:creator>
+		<guid isPermaLink="false">https://www.taxidrivers.it/?p={i}</guid>
+		<description></description>
+		<content:encoded><![CDATA[{content}]]></content:encoded>
+		<excerpt:encoded><![CDATA[]]></excerpt:encoded>
+		<wp:post_id>{i}</wp:post_id>
+		<wp:post_date><![CDATA[{published:%Y-%m-%d %H:%M:%S}]]></wp:post_date>
+		<wp:post_date_gmt><![CDATA[{published:%Y-%m-%d %H:%M:%S}]]></wp:post_date_gmt>
+		<wp:comment_status><![CDATA[open]]></wp:comment_status>
+		<wp:ping_status><![CDATA[open]]></wp:ping_status>
+		<wp:post_name><![CDATA[{slug}]]></wp:post_name>
+		<wp:status><![CDATA[publish]]></wp:status>
+		<wp:post_parent>0</wp:post_parent>
+		<wp:menu_order>0</wp:menu_order>
+		<wp:post_type><![CDATA[{post_type}]]></wp:post_type>
+		<wp:post_password><![CDATA[]]></wp:post_password>
+		<wp:is_sticky>0</wp:is_sticky>
+''']
+    if post_type == "post":
+        parts.append(f'		<category domain="category" nicename="{category_slug}"><![CDATA[{category_name}]]></category>\n')
+        for _ in range(rng.randint(1, 5)):
+            tag = rng.choice(_WORDS)
+            parts.append(f'		<category domain="post_tag" nicename="{tag}"><![CDATA[{tag}]]></category>\n')
+        for key in _POST_META:
+            parts.append(_postmeta(key, _meta_value(rng, key)))
+    for k in range(n_postmeta):
+        parts.append(_postmeta(f"_meta_{k}", _meta_value(rng, "")))
+    if post_type == "post" and rng.random() < 0.2:
+        parts.append(f'''		<wp:comment>
+			<wp:comment_id>{i}</wp:comment_id>
+			<wp:comment_author><![CDATA[lettore]]></wp:comment_author>
+			<wp:comment_date><![CDATA[{published + datetime.timedelta(minutes=30):%Y-%m-%d %H:%M:%S}]]></wp:comment_date>
+			<wp:comment_content><![CDATA[{_words(rng, 30)}]]></wp:comment_content>
+			<wp:comment_approved><![CDATA[1]]></wp:comment_approved>
+		</wp:comment>
+''')
+    parts.append('	</item>\n')
+    return "".join(parts)
+
+
+def write_wxr(file_path, n_items, content_words=300, n_postmeta=5, seed=0):
+    """
+    Writes a synthetic WordPress export.
+    Args:
+        file_path (str): Path of the XML file to write.
+        n_items (int): Number of <item> elements: mostly posts, with some attachments and pages.
+        content_words (int): Number of words in each post content.
+        n_postmeta (int): Postmeta entries added to every item, on top of the Yoast ones of posts.
+        seed (int): Seed of the random generator, the same arguments give the same file.
+    """
+    rng = random.Random(seed)
+    with open(file_path, 'w', encoding='utf-8') as f:
+        f.write(WXR_HEADER)
+        for i in range(1, n_items + 1):
+            f.write(_item(i, rng, content_words, n_postmeta))
+        f.write(WXR_FOOTER)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("file_path", help="XML file to write.")
+    parser.add_argument("--items", type=int, default=10000, help="Number of items.")
+    parser.add_argument("--content-words", type=int, default=300, help="Words in each post content.")
+    parser.add_argument("--postmeta", type=int, default=5, help="Extra postmeta entries per item.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+    args = parser.parse_args()
+    write_wxr(args.file_path, args.items, content_words=args.content_words, n_postmeta=args.postmeta, seed=args.seed)
@@ -14,6 +14,8 @@ ETL_DATA_DIR = os.path.join(BASE_DIR, 'etl', 'data')
 ETL_OUTPUT_DIR = os.path.join(BASE_DIR, 'etl', 'output')
 INPUT_DIR = os.path.join(BASE_DIR, 'data')
 OUTPUT_DIR = os.path.join(BASE_DIR, 'output')
+# On-disk cache of GA4 API query results (see ga4_api.response_cache)
+GA4_CACHE_DIR = os.path.join(DATA_DIR, 'ga4_cache')
 
 # Weekly directories
 WEEKLY_INPUT_DIR = os.path.join(INPUT_DIR, 'weekly_data')
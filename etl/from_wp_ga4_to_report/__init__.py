@@ -1,6 +1,6 @@
-from .etl import ETLPipeline
+from .etl import EtlPipeline
 
 
 __all__ = [
-    "ETLPipeline"
-]
\ No newline at end of file
+    "EtlPipeline"
+]
@@ -1,3 +1,4 @@
+from td_data_toolkit.utils.data_catalog import GA4_PAGE_SCREEN, WXR, DataCatalog
 from .extractor import Extractor
 from .transformer import Transformer
 from .loader import Loader
@@ -9,14 +10,63 @@ class EtlPipeline:
         Initializes the ETL pipeline with a configuration dictionary.
         The config dictionary should contain all necessary paths and parameters.
         Example keys: "GA4_FILE_PATH", "WP_FILE_PATH", "WP_FILE_TYPE",
+                      "WP_XML_MODE" (optional, "stream", "tree" or "parallel"),
+                      "WP_XML_WORKERS" (optional, for the "parallel" mode),
+                      "WP_XML_BACKEND" (optional, "auto", "lxml" or "etree"),
+                      "WP_CACHE_DIR", "WP_CACHE_MAX_BYTES", "WP_CACHE_REFRESH"
+                      (optional, Parquet cache of parsed XML exports),
+                      "WP_LAZY_CONTENT" (optional, skip parsing post content; it is
+                      read back by offset when "content" is in COLUMNS_TO_KEEP),
+                      "PUBDATE_WINDOW" (optional, (start, end) publication dates of the posts to keep),
+                      "GA4_DATE_WINDOW" (optional, (start, end) dates of the GA4 traffic to keep,
+                      for exports with a date column),
                       "OUTPUT_FILE_PATH", "COLUMNS_TO_KEEP",
+                      "COPY_FREE", "MEMORY_HOOK" (optional, see Transformer),
                       "LOAD_KWARGS" (optional, for loader.load_data).
+                      "GA4_FILE_PATH" and "WP_FILE_PATH" may be left out when "DATA_DIR" and
+                      "DATE_RANGE" ((start, end) dates) are given: the files covering the
+                      range are then looked up in the catalog of DATA_DIR.
         """
+        config = self._resolve_input_files(config)
         self.config = config
         self.extractor = Extractor(config)
         self.transformer = Transformer(config)
         self.loader = Loader(config)
 
+    @staticmethod
+    def _resolve_input_files(config):
+        """Fills in the missing GA4 and WordPress file paths from the DATA_DIR catalog."""
+        missing = [key for key in ("GA4_FILE_PATH", "WP_FILE_PATH") if not config.get(key)]
+        if not missing or not (config.get("DATA_DIR") and config.get("DATE_RANGE")):
+            return config
+
+        catalog = DataCatalog(config["DATA_DIR"])
+        catalog.refresh()
+        start, end = config["DATE_RANGE"]
+        kinds = {"GA4_FILE_PATH": GA4_PAGE_SCREEN, "WP_FILE_PATH": WXR}
+        config = dict(config)
+        for key in missing:
+            config[key] = catalog.find(kinds[key], start, end)
+            if config[key] is None:
+                print(f"Warning: no file in {config['DATA_DIR']} covers {start} - {end} for {key}.")
+            else:
+                print(f"Using {config[key]} as {key}.")
+        return config
+
+    def _read_lazy_content(self, wp_data, required_columns):
+        """
+        Reads the post content of the WordPress rows extracted with "WP_LAZY_CONTENT",
+        when the content is needed downstream. Every row is kept by the merge with GA4,
+        so the content of each of them is read.
+        """
+        if 'content_start' not in wp_data.columns or 'content' in wp_data.columns:
+            return wp_data
+        if required_columns is not None and 'content' not in required_columns:
+            return wp_data
+        print(f"Reading the content of {len(wp_data)} WordPress posts...")
+        wp_data = wp_data.assign(content=self.extractor.read_wp_content(wp_data))
+        return wp_data.drop(columns=['content_start', 'content_end'])
+
     def run(self):
         """
         Executes the full ETL pipeline.
@@ -26,7 +76,10 @@ class EtlPipeline:
         # 1. Extract data
         print("Step 1: Extracting data...")
         try:
-            ga4_data, wp_data = self.extractor.extract_all_data()
+            # Only the columns needed downstream are read from the sources
+            required_columns = self.transformer.required_input_columns()
+            ga4_data, wp_data = self.extractor.extract_all_data(columns=required_columns)
+            wp_data = self._read_lazy_content(wp_data, required_columns)
             if ga4_data.empty:
                 print("Warning: GA4 data is empty after extraction.")
             else:
@@ -1,7 +1,50 @@
+import datetime
+import hashlib
+from email.utils import parsedate_to_datetime
 import pandas as pd
-import xml.etree.ElementTree as ET
+from td_data_toolkit.ga4_toolkit import GA4_EXPORT_DTYPES, iter_ga4_export, read_ga4_export, read_ga4_preamble
+from td_data_toolkit.utils.xml_backend import XML_PARSE_ERRORS, get_xml_backend
+from td_data_toolkit.utils.xml_utils import WxrContentReader, iter_wxr_items, parse_wxr_parallel, read_wxr_item
+from .wp_cache import WpParseCache
 # import config  # Removed direct import of config
 
+# Columns produced for each post of a WordPress XML export, in output order.
+WP_XML_COLUMNS = (
+    'title', 'link', 'category', 'pubdate',
+    '_yoast_wpseo_focuskw', '_yoast_wpseo_metadesc', '_yoast_wpseo_linkdex', 'content'
+)
+# Same, with 'WP_LAZY_CONTENT': byte offsets of the content instead of the content itself.
+WP_XML_LAZY_COLUMNS = tuple(c for c in WP_XML_COLUMNS if c != 'content') + ('content_start', 'content_end')
+
+# Bump whenever the rows produced from an XML export change, so cached parses are not reused.
+WP_XML_PARSER_VERSION = "3"
+
+# Yoast SEO postmeta keys read from each post.
+WP_XML_META_KEYS = frozenset(('_yoast_wpseo_focuskw', '_yoast_wpseo_metadesc', '_yoast_wpseo_linkdex'))
+
+# Date dimension of a GA4 export (Italian and English headers), formatted YYYYMMDD.
+GA4_DATE_COLUMNS = ('Data', 'Date', 'date')
+# Rows per chunk when a GA4 export is filtered on its date column while being read.
+GA4_CHUNK_ROWS = 100_000
+
+
+def _parse_date_window(window):
+    """
+    Normalizes a (start, end) window of dates or ISO strings; either bound may be None.
+    Returns None if there is no window.
+    """
+    if window is None:
+        return None
+    start, end = window
+    def to_date(value):
+        if value is None or isinstance(value, datetime.date) and not isinstance(value, datetime.datetime):
+            return value
+        return pd.Timestamp(value).date()
+    start, end = to_date(start), to_date(end)
+    if start is None and end is None:
+        return None
+    return start, end
+
 class Extractor:
     def __init__(self, config):
         """
@@ -9,113 +52,314 @@ class Extractor:
         Args:
             config (dict): A dictionary containing 'GA4_FILE_PATH', 
                            'WP_FILE_PATH', and 'WP_FILE_TYPE'.
+                           May also contain 'WP_XML_MODE': "stream" (default) parses
+                           the XML export incrementally, "tree" loads it all at once,
+                           "parallel" parses it with 'WP_XML_WORKERS' processes
+                           (defaults to the number of CPUs).
+                           'WP_XML_BACKEND' picks the XML parser: "lxml", "etree", or
+                           "auto" (default) for lxml when installed, ElementTree otherwise.
+                           'WP_CACHE_DIR' enables a Parquet cache of parsed XML exports,
+                           bounded by 'WP_CACHE_MAX_BYTES' if given; 'WP_CACHE_REFRESH'
+                           drops the cached parse of 'WP_FILE_PATH' before extracting.
+                           'WP_LAZY_CONTENT' skips the post content while parsing and
+                           returns its byte offsets ('content_start', 'content_end')
+                           instead of 'content'; see `read_wp_content`.
+                           'PUBDATE_WINDOW' (start, end), inclusive dates or ISO strings
+                           with either bound None, drops the posts published outside it
+                           while parsing. It is a window on publication dates: GA4 traffic
+                           of the dropped posts goes away in the merge on pagepath, whatever
+                           the date of the visits.
+                           'GA4_DATE_WINDOW', in the same format, is a window on traffic
+                           dates: it drops the GA4 rows of visits outside it when the export
+                           has a date column.
         """
         self.ga4_file_path = config['GA4_FILE_PATH']
         self.wp_file_path = config['WP_FILE_PATH']
         self.wp_file_type = config.get('WP_FILE_TYPE', 'xml') # Default to xml if not provided
+        self.wp_xml_mode = config.get('WP_XML_MODE', 'stream')
+        self.wp_xml_workers = config.get('WP_XML_WORKERS')
+        self.wp_xml_backend = config.get('WP_XML_BACKEND', 'auto')
+        self.wp_lazy_content = config.get('WP_LAZY_CONTENT', False)
+        self.pubdate_window = _parse_date_window(config.get('PUBDATE_WINDOW'))
+        self.ga4_date_window = _parse_date_window(config.get('GA4_DATE_WINDOW'))
+        self.ga4_metadata = None
+        self._set_wp_projection(None)
+        self.wp_cache_refresh = config.get('WP_CACHE_REFRESH', False)
+        cache_dir = config.get('WP_CACHE_DIR')
+        self.wp_cache = WpParseCache(cache_dir, max_bytes=config.get('WP_CACHE_MAX_BYTES')) if cache_dir else None
 
-    def extract_ga4_data(self):
-        """Extracts data from the GA4 CSV file."""
+    def _set_wp_projection(self, columns):
+        """
+        Selects the WordPress XML columns to build (all of them if columns is None).
+        The post content is skipped while parsing when it is not selected.
+        """
+        base_columns = WP_XML_LAZY_COLUMNS if self.wp_lazy_content else WP_XML_COLUMNS
+        if columns is None:
+            self.wp_columns = base_columns
+        else:
+            wanted = set(columns)
+            if 'content' in wanted:
+                wanted |= {'content_start', 'content_end'}
+            self.wp_columns = tuple(c for c in base_columns if c in wanted)
+        self.wp_skip_content = 'content' not in self.wp_columns
+        self._wp_items_lazy = self.wp_skip_content
+        # Cached parses depend on the columns built, on the pubdate window and on the XML backend
+        backend_name = get_xml_backend(self.wp_xml_backend).name
+        columns_key = ','.join(self.wp_columns) + f"|{self.pubdate_window}|{backend_name}"
+        columns_digest = hashlib.md5(columns_key.encode('utf-8')).hexdigest()[:8]
+        self.wp_cache_version = f"{WP_XML_PARSER_VERSION}-{columns_digest}"
+
+    @staticmethod
+    def _usecols(columns):
+        """pd.read_csv usecols keeping only the given columns, or all if None."""
+        if columns is None:
+            return None
+        columns = set(columns)
+        return lambda column: column in columns
+
+    @staticmethod
+    def _in_date_window(dates, window):
+        """Boolean mask of the dates (a datetime Series) falling in a (start, end) window."""
+        start, end = window
+        mask = dates.notna()
+        if start is not None:
+            mask &= dates >= pd.Timestamp(start)
+        if end is not None:
+            mask &= dates < pd.Timestamp(end) + pd.Timedelta(days=1)
+        return mask
+
+    def _pubdate_in_window(self, pubdate):
+        """Whether an RFC 822 <pubDate> falls in the pubdate window. Unparsable dates never do."""
+        try:
+            day = parsedate_to_datetime(pubdate).date()
+        except (TypeError, ValueError, IndexError):
+            return False
+        start, end = self.pubdate_window
+        return (start is None or day >= start) and (end is None or day <= end)
+
+    def extract_ga4_data(self, columns=None):
+        """
+        Extracts data from the GA4 CSV file, with typed metric columns.
+        The preamble of the export is kept in `self.ga4_metadata`.
+        With 'GA4_DATE_WINDOW', an export with a date column is read in chunks
+        and only the rows in the window are kept.
+        Args:
+            columns (iterable, optional): Columns to read, others are skipped. All if None.
+        """
         try:
-            # Skip the first 9 rows and use the 10th row as header
-            ga4_df = pd.read_csv(self.ga4_file_path, skiprows=9, header=0)
-            return ga4_df
+            self.ga4_metadata = read_ga4_preamble(self.ga4_file_path)
+            date_column = None
+            if self.ga4_date_window is not None:
+                date_column = next((c for c in GA4_DATE_COLUMNS if c in self.ga4_metadata['columns']), None)
+                if date_column is None:
+                    print("GA4 data has no date column, GA4_DATE_WINDOW is not applied to it.")
+            if date_column is None:
+                return read_ga4_export(self.ga4_file_path, columns)
+
+            if columns is not None:
+                columns = set(columns) | {date_column}
+            chunks = iter_ga4_export(
+                self.ga4_file_path, chunksize=GA4_CHUNK_ROWS, columns=columns,
+                dtypes={**GA4_EXPORT_DTYPES, date_column: 'str'}
+            )
+            kept = []
+            for chunk in chunks:
+                dates = pd.to_datetime(chunk[date_column], format='%Y%m%d', errors='coerce')
+                kept.append(chunk[self._in_date_window(dates, self.ga4_date_window)])
+            if not kept:
+                return pd.DataFrame()
+            return pd.concat(kept, ignore_index=True)
         except Exception as e:
             print(f"Error extracting GA4 data: {e}")
             return pd.DataFrame()
 
-    def extract_wp_data(self):
-        """Extracts data from the WordPress export file (XML or CSV)."""
+    def extract_wp_data(self, columns=None):
+        """
+        Extracts data from the WordPress export file (XML or CSV).
+        Args:
+            columns (iterable, optional): Columns to build, others are never materialized.
+                                          All if None.
+        """
         if self.wp_file_type == "xml":
-            return self._extract_wp_xml()
+            self._set_wp_projection(columns)
+            if self.wp_cache is None:
+                return self._extract_wp_xml()
+            return self._extract_wp_xml_cached()
         elif self.wp_file_type == "csv":
-            return self._extract_wp_csv()
+            return self._extract_wp_csv(columns)
         else:
             print(f"Unsupported WordPress file type: {self.wp_file_type}")
             return pd.DataFrame()
 
+    def _extract_wp_xml_cached(self):
+        """Extracts data from a WordPress XML export, going through the parse cache."""
+        try:
+            if self.wp_cache_refresh:
+                self.wp_cache.invalidate(self.wp_file_path)
+            cached_df = self.wp_cache.load(self.wp_file_path, self.wp_cache_version)
+            if cached_df is not None:
+                print(f"Using cached WordPress data for {self.wp_file_path}")
+                return cached_df
+        except Exception as e:
+            print(f"Error reading the WordPress parse cache: {e}")
+            return self._extract_wp_xml()
+
+        wp_df = self._extract_wp_xml()
+        if not wp_df.empty:
+            try:
+                self.wp_cache.store(self.wp_file_path, self.wp_cache_version, wp_df)
+            except Exception as e:
+                print(f"Error writing the WordPress parse cache: {e}")
+        return wp_df
+
     def _extract_wp_xml(self):
         """Extracts data from a WordPress XML export file."""
+        mode = self.wp_xml_mode
+        if mode == "tree" and self.wp_lazy_content:
+            print("WP_LAZY_CONTENT is not supported by the 'tree' XML mode, using 'stream'.")
+            mode = "stream"
+
+        self._wp_items_lazy = self.wp_skip_content
+        if mode == "stream":
+            return self._extract_wp_xml_stream()
+        elif mode == "tree":
+            # The whole tree is parsed: items always carry their content
+            self._wp_items_lazy = False
+            return self._extract_wp_xml_tree()
+        elif mode == "parallel":
+            return self._extract_wp_xml_parallel()
+        else:
+            print(f"Unsupported WordPress XML mode: {mode}")
+            return pd.DataFrame()
+
+    def _extract_wp_xml_tree(self):
+        """Extracts data from a WordPress XML export by loading the whole tree in memory."""
         try:
-            tree = ET.parse(self.wp_file_path)
+            xml_backend = get_xml_backend(self.wp_xml_backend)
+            tree = xml_backend.parse(self.wp_file_path)
             root = tree.getroot()
-            
+
             posts_data = []
-            
-            # Namespace dictionary to handle XML namespaces
-            ns = {
-                'wp': 'http://wordpress.org/export/1.2/',
-                'content': 'http://purl.org/rss/1.0/modules/content/',
-                'dc': 'http://purl.org/dc/elements/1.1/'
-            }
-
-            for item in root.findall('.//channel/item'):
-                post_type = item.find('wp:post_type', ns)
-                if post_type is not None and post_type.text == 'post': # Ensure it's a blog post
-                    title = item.find('title').text if item.find('title') is not None else None
-                    link = item.find('link').text if item.find('link') is not None else None
-                    pub_date_str = item.find('pubDate').text if item.find('pubDate') is not None else None
-                    
-                    # Extract categories
-                    categories = []
-                    for cat_element in item.findall('category[@domain="category"]'):
-                        categories.append(cat_element.text)
-                    category_str = ', '.join(categories) if categories else None
-
-                    # Extract content
-                    content_encoded = item.find('content:encoded', ns)
-                    content = content_encoded.text if content_encoded is not None else None
-
-                    # Extract Yoast SEO metadata
-                    focus_kw = None
-                    meta_desc = None
-                    linkdex = None
-                    
-                    for postmeta in item.findall('wp:postmeta', ns):
-                        meta_key_element = postmeta.find('wp:meta_key', ns)
-                        meta_value_element = postmeta.find('wp:meta_value', ns)
-                        if meta_key_element is not None and meta_value_element is not None:
-                            meta_key = meta_key_element.text
-                            meta_value = meta_value_element.text
-                            if meta_key == '_yoast_wpseo_focuskw':
-                                focus_kw = meta_value
-                            elif meta_key == '_yoast_wpseo_metadesc':
-                                meta_desc = meta_value
-                            elif meta_key == '_yoast_wpseo_linkdex':
-                                linkdex = meta_value
-                                
-                    posts_data.append({
-                        'title': title,
-                        'link': link,
-                        'category': category_str,
-                        'pubdate': pub_date_str,
-                        '_yoast_wpseo_focuskw': focus_kw,
-                        '_yoast_wpseo_metadesc': meta_desc,
-                        '_yoast_wpseo_linkdex': linkdex,
-                        'content': content
-                    })
-            
+            for item in xml_backend.channel_items(root):
+                post = self._parse_wp_item(item)
+                if post is not None:
+                    posts_data.append(post)
+
             return pd.DataFrame(posts_data)
-        except ET.ParseError as e:
+        except XML_PARSE_ERRORS as e:
             print(f"Error parsing WordPress XML file: {e}")
             return pd.DataFrame()
         except Exception as e:
             print(f"An unexpected error occurred during WordPress XML extraction: {e}")
             return pd.DataFrame()
 
-    def _extract_wp_csv(self):
+    def _extract_wp_xml_stream(self):
+        """
+        Extracts data from a WordPress XML export one <item> at a time.
+        Each item is cleared as soon as it has been read and its fields are
+        appended to per-column buffers, so peak memory does not grow with the
+        size of the export (apart from the extracted values themselves).
+        """
+        try:
+            columns = {name: [] for name in self.wp_columns}
+            n_posts = 0
+            items = iter_wxr_items(self.wp_file_path, lazy_content=self.wp_skip_content, backend=self.wp_xml_backend)
+            for item in items:
+                post = self._parse_wp_item(item)
+                if post is not None:
+                    n_posts += 1
+                    for name in self.wp_columns:
+                        columns[name].append(post[name])
+
+            if n_posts == 0:
+                return pd.DataFrame()
+            return pd.DataFrame(columns)
+        except XML_PARSE_ERRORS as e:
+            print(f"Error parsing WordPress XML file: {e}")
+            return pd.DataFrame()
+        except Exception as e:
+            print(f"An unexpected error occurred during WordPress XML extraction: {e}")
+            return pd.DataFrame()
+
+    def _extract_wp_xml_parallel(self):
+        """
+        Extracts data from a WordPress XML export split on <item> boundaries
+        and parsed by a pool of processes. Rows keep the export order.
+        """
+        try:
+            posts_data = parse_wxr_parallel(
+                self.wp_file_path, self._parse_wp_item, workers=self.wp_xml_workers,
+                lazy_content=self.wp_skip_content, backend=self.wp_xml_backend
+            )
+            return pd.DataFrame(posts_data)
+        except XML_PARSE_ERRORS as e:
+            print(f"Error parsing WordPress XML file: {e}")
+            return pd.DataFrame()
+        except Exception as e:
+            print(f"An unexpected error occurred during WordPress XML extraction: {e}")
+            return pd.DataFrame()
+
+    def _parse_wp_item(self, item):
+        """
+        Extracts the selected fields of a single <item> element.
+        Returns None if the item is not a blog post, or is outside the pubdate window.
+        """
+        # Out of range items are dropped before reading the rest of their fields
+        if self.pubdate_window is not None and not self._pubdate_in_window(item.findtext('pubDate')):
+            return None
+        # The last value of a repeated meta key wins, as it always has in the Extractor
+        fields = read_wxr_item(item, WP_XML_META_KEYS, lazy_content=self._wp_items_lazy, meta_wins='last')
+        if fields['post_type'] != 'post': # Ensure it's a blog post
+            return None
+
+        categories = [text for domain, text in fields['categories'] if domain == 'category']
+        meta = fields['meta']
+        post = {
+            'title': fields['title'],
+            'link': fields['link'],
+            'category': ', '.join(categories) if categories else None,
+            'pubdate': fields['pubdate'],
+            '_yoast_wpseo_focuskw': meta.get('_yoast_wpseo_focuskw'),
+            '_yoast_wpseo_metadesc': meta.get('_yoast_wpseo_metadesc'),
+            '_yoast_wpseo_linkdex': meta.get('_yoast_wpseo_linkdex'),
+        }
+        if self._wp_items_lazy:
+            post['content_start'], post['content_end'] = fields['content_span'] or (None, None)
+        else:
+            post['content'] = fields['content']
+        return {name: post[name] for name in self.wp_columns}
+
+    def read_wp_content(self, wp_df):
+        """
+        Reads the post content of the given rows from the XML export.
+        Only useful with 'WP_LAZY_CONTENT': pass just the rows that need it.
+        Args:
+            wp_df (pd.DataFrame): Rows with 'content_start' and 'content_end' columns.
+        Returns:
+            pd.Series: The content of each row, aligned on wp_df's index.
+        """
+        with WxrContentReader(self.wp_file_path) as reader:
+            contents = reader.read_many(wp_df['content_start'], wp_df['content_end'])
+        return pd.Series(contents, index=wp_df.index, name='content', dtype=object)
+
+    def _extract_wp_csv(self, columns=None):
         """Extracts data from a WordPress CSV export file."""
         try:
-            wp_df = pd.read_csv(self.wp_file_path)
+            wp_df = pd.read_csv(self.wp_file_path, usecols=self._usecols(columns))
             return wp_df
         except Exception as e:
             print(f"Error extracting WordPress CSV data: {e}")
             return pd.DataFrame()
 
-    def extract_all_data(self):
-        """Extracts data from all configured sources."""
-        ga4_data = self.extract_ga4_data()
-        wp_data = self.extract_wp_data()
+    def extract_all_data(self, columns=None):
+        """
+        Extracts data from all configured sources.
+        Args:
+            columns (iterable, optional): Columns needed downstream, under their
+                                          source names. All columns if None.
+        """
+        ga4_data = self.extract_ga4_data(columns)
+        wp_data = self.extract_wp_data(columns)
         return ga4_data, wp_data
 
 # Example usage (for testing, will be removed or adapted in main etl.py)
@@ -0,0 +1,100 @@
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import pyarrow as pa
+except ImportError:  # pandas then keeps strings as Python objects, which tracemalloc sees
+    pa = None
+
+MB = 1 << 20
+
+
+def print_stage_memory(report):
+    """MEMORY_HOOK that prints each stage report on one line."""
+    print(
+        f"Memory {report['stage']:<12} delta {report['delta_mb']:>+9.1f} MB"
+        f"  peak {report['peak_mb']:>9.1f} MB  current {report['current_mb']:>9.1f} MB"
+    )
+
+
+class MemoryTracker:
+    """
+    Measures the memory allocated by the stages of a run and reports each stage to a hook.
+
+    Python and NumPy allocations are traced with tracemalloc from `start` on; the memory
+    held by pyarrow (pandas string columns) is read from its allocator at the stage
+    boundaries. All figures are relative to `start`, so the inputs of the run are not
+    counted. For each stage the hook receives a dict with:
+        stage       the stage name ('total' for the whole run, reported by `stop`)
+        delta_mb    memory allocated at the end of the stage minus at its start
+        peak_mb     highest memory allocated during the stage
+        current_mb  memory allocated at the end of the stage
+
+    Example:
+        tracker = MemoryTracker(print_stage_memory)
+        tracker.start()
+        with tracker.stage("merge"):
+            merged_df = pd.merge(wp_df, ga4_df, on='pagepath')
+        tracker.stop()
+    """
+    def __init__(self, hook):
+        """
+        Args:
+            hook (callable): Called with the report dict of each stage.
+        """
+        self.hook = hook
+        self.stages = []
+        self._started_tracing = False
+        self._traced_baseline = 0
+        self._arrow_baseline = 0
+
+    @staticmethod
+    def _arrow_bytes():
+        return pa.total_allocated_bytes() if pa is not None else 0
+
+    def _current_bytes(self):
+        traced = tracemalloc.get_traced_memory()[0] - self._traced_baseline
+        return traced + self._arrow_bytes() - self._arrow_baseline
+
+    def start(self):
+        """Starts tracing, unless tracemalloc already runs, and sets the baseline."""
+        self.stages = []
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._traced_baseline = tracemalloc.get_traced_memory()[0]
+        self._arrow_baseline = self._arrow_bytes()
+
+    @contextmanager
+    def stage(self, name):
+        """Measures the block as the stage `name` and reports it when the block ends."""
+        start_bytes = self._current_bytes()
+        arrow_start = self._arrow_bytes()
+        tracemalloc.reset_peak()
+        yield
+        traced_peak = tracemalloc.get_traced_memory()[1] - self._traced_baseline
+        arrow_peak = max(arrow_start, self._arrow_bytes()) - self._arrow_baseline
+        current_bytes = self._current_bytes()
+        self._report({
+            "stage": name,
+            "delta_mb": (current_bytes - start_bytes) / MB,
+            "peak_mb": max(traced_peak + arrow_peak, current_bytes) / MB,
+            "current_mb": current_bytes / MB,
+        })
+
+    def stop(self):
+        """Reports the 'total' stage and stops tracing if `start` started it."""
+        current_mb = self._current_bytes() / MB
+        self._report({
+            "stage": "total",
+            "delta_mb": current_mb,
+            "peak_mb": max([s["peak_mb"] for s in self.stages] + [current_mb]),
+            "current_mb": current_mb,
+        })
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def _report(self, report):
+        self.stages.append(report)
+        self.hook(report)
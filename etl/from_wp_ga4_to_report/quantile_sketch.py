@@ -0,0 +1,115 @@
+import math
+import numpy as np
+
+# A KLL sketch with parameter k estimates ranks within about KLL_ERROR_FACTOR / k
+# of the number of values (normalized rank error), with high probability.
+KLL_ERROR_FACTOR = 4.0
+# Capacity ratio between consecutive levels
+LEVEL_CAPACITY_RATIO = 2 / 3
+
+
+class QuantileSketch:
+    """
+    Mergeable sketch of a stream of numbers answering approximate quantiles (KLL).
+
+    Values are kept in levels of sorted compactors: a value at level h stands for 2**h
+    values of the stream. When a level exceeds its capacity, it is sorted and every other
+    value, from a random offset, moves up a level. The memory used grows with the
+    precision, not with the number of values, and sketches built on separate chunks or
+    by parallel workers merge into the sketch of their union.
+
+    Example:
+        sketch = QuantileSketch(rank_error=0.005)
+        for chunk in chunks:
+            sketch.update(chunk['diff_with_daily_benchmark_views'])
+        edges = sketch.quantiles([0.2, 0.4, 0.6, 0.8])
+    """
+    def __init__(self, rank_error=0.005, seed=None):
+        """
+        Args:
+            rank_error (float): Target error of the quantiles, as a fraction of the values:
+                                with 0.005 the 0.5 quantile returned lies between the
+                                0.495 and 0.505 ones.
+            seed (int, optional): Seed of the compaction offsets.
+        """
+        if not 0 < rank_error < 1:
+            raise ValueError(f"rank_error must be between 0 and 1, got {rank_error}")
+        self.rank_error = rank_error
+        self.k = max(8, math.ceil(KLL_ERROR_FACTOR / rank_error))
+        self.levels = [np.empty(0)]
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - 1 - level
+        return max(2, math.ceil(self.k * LEVEL_CAPACITY_RATIO ** depth))
+
+    def update(self, values):
+        """Adds values (array-like; NaN values are ignored). Returns the sketch."""
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if len(values):
+            self.count += len(values)
+            self.min = min(self.min, values.min())
+            self.max = max(self.max, values.max())
+            self.levels[0] = np.concatenate((self.levels[0], values))
+            self._compress()
+        return self
+
+    def merge(self, other):
+        """Adds the values summarized by another sketch. Returns the sketch."""
+        if other.count:
+            while len(self.levels) < len(other.levels):
+                self.levels.append(np.empty(0))
+            for level, items in enumerate(other.levels):
+                self.levels[level] = np.concatenate((self.levels[level], items))
+            self.count += other.count
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+            self._compress()
+        return self
+
+    def _compress(self):
+        """Compacts the levels over capacity, until none is."""
+        compacted = True
+        while compacted:
+            compacted = False
+            for level in range(len(self.levels)):
+                if len(self.levels[level]) > self._capacity(level):
+                    self._compact(level)
+                    compacted = True
+
+    def _compact(self, level):
+        if level + 1 == len(self.levels):
+            self.levels.append(np.empty(0))
+        items = np.sort(self.levels[level])
+        # With an odd count, one end value stays at this level
+        kept = items[:0]
+        if len(items) % 2:
+            if self._rng.integers(2):
+                kept, items = items[:1], items[1:]
+            else:
+                kept, items = items[-1:], items[:-1]
+        promoted = items[self._rng.integers(2)::2]
+        self.levels[level] = kept
+        self.levels[level + 1] = np.concatenate((self.levels[level + 1], promoted))
+
+    def quantiles(self, levels):
+        """
+        Returns the approximate quantiles of the values for quantile levels between 0 and 1
+        (0 and 1 give the exact minimum and maximum). NaN if the sketch is empty.
+        """
+        levels = np.asarray(levels, dtype=float)
+        if not self.count:
+            return np.full(levels.shape, np.nan)
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2 ** h) for h, items in enumerate(self.levels)])
+        order = np.argsort(values, kind='stable')
+        values = values[order]
+        cumulative = np.cumsum(weights[order])
+        positions = np.searchsorted(cumulative, levels * cumulative[-1], side='left')
+        result = values[np.minimum(positions, len(values) - 1)]
+        result = np.where(levels <= 0, self.min, result)
+        return np.where(levels >= 1, self.max, result)
@@ -0,0 +1,154 @@
+import numpy as np
+import pandas as pd
+
+
+class RangeQuantiles:
+    """
+    Percentiles of any contiguous range of a sequence of values, in O(log n) per range.
+
+    The values are replaced by their ranks and stored in a wavelet matrix: one bit
+    level per bit of the ranks, each keeping the prefix counts of its ones. The k-th
+    smallest value of a range is found by walking down the levels, for all the
+    queried ranges at once with numpy, so no window is ever sorted.
+    """
+    def __init__(self, values):
+        """
+        Args:
+            values (np.ndarray): The sequence of values, without NaN.
+        """
+        order = np.argsort(values, kind='stable')
+        self.sorted_values = values[order]
+        ranks = np.empty(len(values), dtype=np.int64)
+        ranks[order] = np.arange(len(values))
+        self.levels = []
+        current = ranks
+        for bit in reversed(range(max(1, (len(values) - 1).bit_length()))):
+            ones = (current >> bit) & 1
+            ones_before = np.concatenate(([0], np.cumsum(ones)))
+            n_zeros = len(values) - int(ones_before[-1])
+            self.levels.append((bit, ones_before, n_zeros))
+            current = np.concatenate((current[ones == 0], current[ones == 1]))
+
+    def kth(self, starts, ends, k):
+        """Returns the k-th smallest value (k from 0) of each range [start, end)."""
+        rank = np.zeros(len(k), dtype=np.int64)
+        for bit, ones_before, n_zeros in self.levels:
+            start_ones, end_ones = ones_before[starts], ones_before[ends]
+            start_zeros, end_zeros = starts - start_ones, ends - end_ones
+            zeros_in_range = end_zeros - start_zeros
+            high = k >= zeros_in_range
+            rank |= high.astype(np.int64) << bit
+            k = np.where(high, k - zeros_in_range, k)
+            starts = np.where(high, n_zeros + start_ones, start_zeros)
+            ends = np.where(high, n_zeros + end_ones, end_zeros)
+        return self.sorted_values[rank]
+
+    def percentile(self, starts, ends, p):
+        """
+        Returns the p-th percentile (0-100) of each range [start, end), interpolated like
+        Series.quantile; the 50th is the median, as Series.median computes it.
+        Empty ranges get NaN.
+        """
+        counts = ends - starts
+        result = np.full(len(counts), np.nan)
+        filled = counts > 0
+        if not filled.any():
+            return result
+        starts, ends, counts = starts[filled], ends[filled], counts[filled]
+        position = p / 100 * (counts - 1)
+        lower = np.floor(position).astype(np.int64)
+        low = self.kth(starts, ends, lower)
+        high = self.kth(starts, ends, np.minimum(lower + 1, counts - 1))
+        t = position - lower
+        if p == 50:
+            values = np.where(t == 0, low, (low + high) / 2)
+        else:
+            # numpy's linear interpolation, which Series.quantile uses
+            values = np.where(t >= 0.5, high - (high - low) * (1 - t), low + (high - low) * t)
+        result[filled] = values
+        return result
+
+
+def _window_days(window):
+    """Returns the number of days of a '28D'-like window, or None for a window of articles (int)."""
+    if isinstance(window, (int, np.integer)):
+        if window < 1:
+            raise ValueError(f"Benchmark window must hold at least one article, got {window}")
+        return None
+    days = pd.Timedelta(window) / pd.Timedelta(days=1)
+    if days < 1 or days != int(days):
+        raise ValueError(f"Benchmark window must be a whole number of days, got {window!r}")
+    return int(days)
+
+
+def _window_bounds(days, window, window_days):
+    """Returns the [start, end) article range of the window of each article, in publication order."""
+    positions = np.arange(len(days))
+    if window_days is None:
+        return np.maximum(positions - window + 1, 0), positions + 1
+    starts = np.searchsorted(days, days - window_days + 1, side='left')
+    ends = np.searchsorted(days, days, side='right')
+    return starts, ends
+
+
+def rolling_benchmarks(df, date_column, metric_columns, window, percentiles=(50,), group_column=None):
+    """
+    Computes trailing-window benchmarks of the metrics for each article: percentiles of
+    the metric over the articles published in the window ending with it.
+    Windows are contiguous in publication order, so their percentiles come from
+    RangeQuantiles in O(log n) each, without sorting any window.
+    Args:
+        df (pd.DataFrame): Articles, with their publication datetime and numeric metrics.
+        date_column (str): Publication datetime column; rows without one get NaN.
+        metric_columns (list): Numeric metric columns; NaN values are left out of the windows.
+        window (int or str): The last N articles, the current one included (int), or the
+                             last N publication days, the current day included ('28D').
+                             '1D' gives the same-day benchmark.
+        percentiles (list): Percentiles to compute, from 0 to 100 (50 is the median).
+        group_column (str, optional): Column whose values have separate windows (e.g. 'category');
+                                      rows without a value get NaN.
+    Returns:
+        pd.DataFrame: Aligned with df, one column per (metric, percentile) pair.
+    """
+    window_days = _window_days(window)
+    timestamps = pd.to_datetime(df[date_column], errors='coerce')
+    if timestamps.dt.tz is not None:
+        # Publication days are local days
+        timestamps = timestamps.dt.tz_localize(None)
+    valid = timestamps.notna().to_numpy()
+    if group_column is not None:
+        valid = valid & df[group_column].notna().to_numpy()
+
+    days = timestamps.to_numpy(dtype='datetime64[D]').astype('int64')
+    sort_keys = timestamps.to_numpy(dtype='datetime64[ns]').astype('int64')
+
+    rows = np.flatnonzero(valid)
+    if group_column is None:
+        groups = [rows]
+    else:
+        labels = pd.factorize(df[group_column].to_numpy()[rows])[0]
+        by_label = np.argsort(labels, kind='stable')
+        groups = np.split(rows[by_label], np.flatnonzero(np.diff(labels[by_label])) + 1)
+    groups = [group[np.argsort(sort_keys[group], kind='stable')] for group in groups if len(group)]
+    bounds = [_window_bounds(days[group], window, window_days) for group in groups]
+
+    result = {}
+    for metric in metric_columns:
+        values = pd.to_numeric(df[metric], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+        outputs = {p: np.full(len(df), np.nan) for p in percentiles}
+        for group, (starts, ends) in zip(groups, bounds):
+            group_values = values[group]
+            present = ~np.isnan(group_values)
+            # Window bounds among the articles with a value; articles sharing a window
+            # (the same day, for windows of days) are queried once
+            present_before = np.concatenate(([0], np.cumsum(present)))
+            value_bounds = present_before[starts] * (len(group) + 1) + present_before[ends]
+            value_bounds, window_of_article = np.unique(value_bounds, return_inverse=True)
+            value_starts, value_ends = np.divmod(value_bounds, len(group) + 1)
+            quantiles = RangeQuantiles(group_values[present])
+            for p in percentiles:
+                outputs[p][group] = quantiles.percentile(value_starts, value_ends, p)[window_of_article]
+        for p in percentiles:
+            result[(metric, p)] = outputs[p]
+    columns = pd.MultiIndex.from_tuples(result.keys()) if result else None
+    return pd.DataFrame(result, index=df.index, columns=columns)
@@ -1,7 +1,36 @@
 import pandas as pd
+from contextlib import nullcontext
 from urllib.parse import urlparse
 from datetime import datetime, timedelta # Added
 import numpy as np # Added
+from .memory_tracker import MemoryTracker
+from .quantile_sketch import QuantileSketch
+from .rolling_benchmark import rolling_benchmarks
+
+# GA4 export column names (Italian UI) and the names used downstream
+GA4_COLUMN_RENAMES = {
+    'Percorso pagina e classe schermata': 'pagepath',
+    'Visualizzazioni': 'views',
+    'Utenti attivi': 'active users',
+    'Visualizzazioni per utente attivo': 'views per active user',
+    'Durata media del coinvolgimento per utente attivo': 'average engagement time per active user',
+    'Conteggio eventi': 'event count',
+}
+
+# URLs whose urlparse path can be read with a regex: an optional http(s)://netloc, then
+# a path without params (';') or whitespace (and not starting with '//' when there is
+# no netloc), then an optional query or fragment. Other URLs go through urlparse.
+_SIMPLE_URL_PATTERN = (
+    r'^(?:[Hh][Tt][Tt][Pp][Ss]?://[!"$-.0->@-Z\\^-~]*(?P<netloc_path>(?:/[^?#;\x00-\x20]*)?)'
+    r'|(?P<path>(?:/(?!/)[^?#;\x00-\x20]*)?))(?:[?#][^\x00-\x20]*)?$'
+)
+
+
+def _copy_on_write_enabled():
+    """True if pandas copies shared data on the first write (always the case from pandas 3)."""
+    if int(pd.__version__.split('.')[0]) >= 3:
+        return True
+    return pd.options.mode.copy_on_write is True
 
 class Transformer:
     def __init__(self, config):
@@ -10,11 +39,31 @@ class Transformer:
         Args:
             config (dict): A dictionary containing 'COLUMNS_TO_KEEP'.
                            May also contain 'BUCKET_LABELS', 'N_BUCKETS',
-                           'METRICS_FOR_BENCHMARK', 'METRICS_FOR_BUCKETS'.
+                           'METRICS_FOR_BENCHMARK', 'METRICS_FOR_BUCKETS',
+                           'COPY_FREE' (work on shallow copies of the inputs, which
+                           copy-on-write keeps from being modified, instead of deep
+                           copies at every step; needs pandas copy-on-write),
+                           'MEMORY_HOOK' (a callable receiving the memory report of
+                           each transform_data stage, see MemoryTracker),
+                           'BENCHMARK_WINDOW' (benchmark each article against the last
+                           N articles, an int, or the last N days, e.g. '28D', instead
+                           of its publication day), 'BENCHMARK_PERCENTILES' (percentiles
+                           of the window to add as columns, e.g. [25, 75]) and
+                           'BENCHMARK_GROUP_BY' (a column, e.g. 'category', whose values
+                           are benchmarked separately) and 'BUCKET_RANK_ERROR' (error of
+                           the quantile sketches of bucket_sketches, 0.005 by default).
         """
         self.columns_to_keep = config.get('COLUMNS_TO_KEEP', [])
+        self.copy_free = config.get('COPY_FREE', False)
+        if self.copy_free and not _copy_on_write_enabled():
+            print("Warning: COPY_FREE needs pandas copy-on-write (pd.options.mode.copy_on_write = True). Copying the data instead.")
+            self.copy_free = False
+        self.memory_hook = config.get('MEMORY_HOOK')
+        self.memory_report = []
+        self._memory_tracker = None
         self.bucket_labels = config.get('BUCKET_LABELS', ["Molto Basso", "Basso", "Medio", "Alto", "Molto Alto"])
         self.n_buckets = config.get('N_BUCKETS', 5)
+        self.bucket_rank_error = config.get('BUCKET_RANK_ERROR', 0.005)
         
         # Defines which metrics to calculate daily benchmarks for.
         # Keys are original metric column names, values are base names for derived columns.
@@ -33,6 +82,38 @@ class Transformer:
                 for original_name, base_name in self.metrics_for_benchmark.items()
             }
 
+        # Trailing-window benchmarks, see rolling_benchmarks. Percentiles or a grouping
+        # without a window use a window of one day, the same-day benchmark.
+        self.benchmark_window = config.get("BENCHMARK_WINDOW")
+        self.benchmark_percentiles = list(config.get("BENCHMARK_PERCENTILES", []))
+        self.benchmark_group_by = config.get("BENCHMARK_GROUP_BY")
+
+    def _working_copy(self, df):
+        """
+        Returns a copy of df to modify: a deep copy, or in COPY_FREE mode a shallow one,
+        whose column assignments copy-on-write keeps from reaching df.
+        """
+        return df.copy(deep=not self.copy_free)
+
+    def _stage(self, name):
+        """Context of a transform_data stage, measured when a MEMORY_HOOK is configured."""
+        return self._memory_tracker.stage(name) if self._memory_tracker else nullcontext()
+
+    def required_input_columns(self):
+        """
+        Returns the input columns needed to produce COLUMNS_TO_KEEP and the benchmarks,
+        under both their GA4 export name and their renamed one, plus the merge and
+        date keys ('link', 'pagepath', 'pubdate').
+        Returns None (every column is needed) if COLUMNS_TO_KEEP is empty.
+        """
+        if not self.columns_to_keep:
+            return None
+        needed = set(self.columns_to_keep) | set(self.metrics_for_benchmark) | {'link', 'pagepath', 'pubdate'}
+        if self.benchmark_group_by:
+            needed.add(self.benchmark_group_by)
+        needed |= {source for source, name in GA4_COLUMN_RENAMES.items() if name in needed}
+        return needed
+
     def _normalize_url_path(self, url):
         """Extracts the path from a URL and removes trailing slashes."""
         if pd.isna(url):
@@ -43,24 +124,33 @@ class Transformer:
         except Exception:
             return None # Return None for invalid URLs
 
+    def _normalize_url_paths(self, urls):
+        """
+        Applies _normalize_url_path to a Series. Each distinct URL is normalized once
+        and the results are broadcast back through the factorization codes.
+        """
+        codes, uniques = pd.factorize(urls)
+        uniques = pd.Series(np.asarray(uniques, dtype=object)).astype(str)
+        extracted = uniques.str.extract(_SIMPLE_URL_PATTERN)
+        paths = extracted['netloc_path'].fillna(extracted['path'])
+        unmatched = paths.isna()
+        paths = paths.str.rstrip('/').astype(object)
+        paths[unmatched] = uniques[unmatched].map(self._normalize_url_path)
+        # Missing URLs have code -1, which picks the trailing None
+        normalized = np.append(paths.to_numpy(dtype=object), None)
+        return pd.Series(normalized[codes], index=urls.index, name=urls.name)
+
     def _clean_ga4_data(self, ga4_df):
         """Cleans the GA4 DataFrame."""
         if ga4_df.empty:
             return pd.DataFrame()
         
         # Rename columns for clarity and consistency
-        ga4_df = ga4_df.rename(columns={
-            'Percorso pagina e classe schermata': 'pagepath',
-            'Visualizzazioni': 'views',
-            'Utenti attivi': 'active users',
-            'Visualizzazioni per utente attivo': 'views per active user',
-            'Durata media del coinvolgimento per utente attivo': 'average engagement time per active user',
-            'Conteggio eventi': 'event count',
-        })
+        ga4_df = ga4_df.rename(columns=GA4_COLUMN_RENAMES)
         
         # Ensure 'pagepath' exists before trying to normalize it
         if 'pagepath' in ga4_df.columns:
-            ga4_df['pagepath'] = ga4_df['pagepath'].apply(self._normalize_url_path)
+            ga4_df['pagepath'] = self._normalize_url_paths(ga4_df['pagepath'])
         else:
             print("Warning: 'pagepath' column not found in GA4 data. Skipping normalization.")
 
@@ -82,7 +172,7 @@ class Transformer:
         
         # Normalize 'link' to 'pagepath' for merging
         if 'link' in wp_df.columns:
-            wp_df['pagepath'] = wp_df['link'].apply(self._normalize_url_path)
+            wp_df['pagepath'] = self._normalize_url_paths(wp_df['link'])
         else:
             print("Warning: 'link' column not found in WP data. Cannot create 'pagepath' for merging.")
 
@@ -98,39 +188,21 @@ class Transformer:
         
         return wp_df
 
-    def _calculate_daily_median_benchmark(self, dataframe, timestamp_column, metric_column):
+    def _daily_median_benchmarks(self, df, date_key, metric_columns):
         """
-        Calculates the daily median benchmark for a specified metric.
+        Returns the daily median benchmark of each metric, aligned with the rows of df.
+        The medians of all the metrics come from a single groupby on the date key
+        and are broadcast back with transform; rows without a date get NaN.
         """
-        df_copy = dataframe.copy()
-        if timestamp_column not in df_copy.columns:
-            print(f"Warning: Timestamp column '{timestamp_column}' not found for benchmark calculation of '{metric_column}'.")
-            return pd.DataFrame(columns=['date', f'daily_median_benchmark_{metric_column}'])
-        if metric_column not in df_copy.columns:
-            print(f"Warning: Metric column '{metric_column}' not found for benchmark calculation.")
-            return pd.DataFrame(columns=['date', f'daily_median_benchmark_{metric_column}'])
-
-        df_copy[timestamp_column] = pd.to_datetime(df_copy[timestamp_column], errors='coerce')
-        df_copy.dropna(subset=[timestamp_column, metric_column], how='any', inplace=True) # Drop if date or metric is NA
-
-        if df_copy.empty:
-            return pd.DataFrame(columns=['date', f'daily_median_benchmark_{metric_column}'])
-
-        df_copy['date'] = df_copy[timestamp_column].dt.date
-        df_copy[metric_column] = pd.to_numeric(df_copy[metric_column], errors='coerce')
-        
-        daily_median = (
-            df_copy.groupby('date', as_index=False)[metric_column]
-            .median()
-            .rename(columns={metric_column: f'daily_median_benchmark_{metric_column}'})
-        )
-        return daily_median
+        if date_key.isna().all():
+            return pd.DataFrame(np.nan, index=df.index, columns=metric_columns)
+        return df[metric_columns].groupby(date_key).transform('median')
 
     def _add_benchmark_differences(self, df, pubdate_col):
         """
         Computes the difference from the daily median benchmark for configured metrics.
         """
-        df_copy = df.copy()
+        df_copy = self._working_copy(df)
         if pubdate_col not in df_copy.columns or df_copy[pubdate_col].isnull().all():
             print(f"Warning: Publication date column '{pubdate_col}' not found or all null. Skipping benchmark difference calculation.")
             for original_metric_name, base_name in self.metrics_for_benchmark.items():
@@ -139,92 +211,105 @@ class Transformer:
             return df_copy
 
         df_copy[pubdate_col] = pd.to_datetime(df_copy[pubdate_col], errors='coerce')
-        df_copy['merge_date_key'] = df_copy[pubdate_col].dt.date
+
+        metric_columns = [metric for metric in self.metrics_for_benchmark if metric in df_copy.columns]
+        for metric in metric_columns:
+            df_copy[metric] = pd.to_numeric(df_copy[metric], errors='coerce')
+
+        window_percentiles = None
+        if not metric_columns:
+            daily_medians = None
+        elif self.benchmark_window or self.benchmark_percentiles or self.benchmark_group_by:
+            group_column = self.benchmark_group_by
+            if group_column and group_column not in df_copy.columns:
+                print(f"Warning: Benchmark group column '{group_column}' not found. Benchmarking all articles together.")
+                group_column = None
+            window_percentiles = rolling_benchmarks(
+                df_copy, pubdate_col, metric_columns, self.benchmark_window or '1D',
+                percentiles=[50] + [p for p in self.benchmark_percentiles if p != 50], group_column=group_column
+            )
+            daily_medians = window_percentiles.xs(50, axis=1, level=1)
+        else:
+            # Publication day, computed once for all the metrics
+            date_key = df_copy[pubdate_col].dt.normalize()
+            daily_medians = self._daily_median_benchmarks(df_copy, date_key, metric_columns)
 
         for original_metric_name, base_name in self.metrics_for_benchmark.items():
             diff_col_name = f"diff_with_daily_benchmark_{base_name}"
-            benchmark_col_for_merge = f"daily_median_benchmark_{original_metric_name}"
-
-            if original_metric_name not in df_copy.columns:
+            if original_metric_name not in metric_columns:
                 print(f"Warning: Metric column '{original_metric_name}' not found for benchmark difference. Adding NaN column '{diff_col_name}'.")
                 df_copy[diff_col_name] = np.nan
                 continue
-
-            daily_medians_df = self._calculate_daily_median_benchmark(df_copy, pubdate_col, original_metric_name)
-
-            if daily_medians_df.empty or 'date' not in daily_medians_df.columns or benchmark_col_for_merge not in daily_medians_df.columns:
-                print(f"Warning: No daily medians or benchmark column missing for '{original_metric_name}'. Diff column '{diff_col_name}' will be NaN.")
-                df_copy[diff_col_name] = np.nan
-                continue
-            
-            daily_medians_df['date'] = pd.to_datetime(daily_medians_df['date']).dt.date
-            
-            df_copy = pd.merge(df_copy, daily_medians_df, left_on='merge_date_key', right_on='date', how='left', suffixes=('', '_bm_median'))
-            
-            if benchmark_col_for_merge in df_copy.columns:
-                df_copy[original_metric_name] = pd.to_numeric(df_copy[original_metric_name], errors='coerce')
-                df_copy[benchmark_col_for_merge] = pd.to_numeric(df_copy[benchmark_col_for_merge], errors='coerce')
-                df_copy[diff_col_name] = df_copy[original_metric_name] - df_copy[benchmark_col_for_merge]
-                df_copy.drop(columns=[benchmark_col_for_merge], inplace=True, errors='ignore')
-            else:
-                print(f"Warning: Benchmark column '{benchmark_col_for_merge}' not found after merge for '{original_metric_name}'. Diff column '{diff_col_name}' will be NaN.")
-                df_copy[diff_col_name] = np.nan
-            
-            if 'date_bm_median' in df_copy.columns: df_copy.drop(columns=['date_bm_median'], inplace=True, errors='ignore')
-            if 'date' in df_copy.columns and 'merge_date_key' in df_copy.columns and df_copy['date'].equals(df_copy['merge_date_key']): # if 'date' was from merge
-                 pass # keep the original 'date' if it was just the merge key
-            elif 'date' in df_copy.columns and 'merge_date_key' in df_copy.columns and not df_copy['date'].equals(df_copy['merge_date_key']): # if 'date' was from merge and different
-                 df_copy.drop(columns=['date'], inplace=True, errors='ignore')
-
-
-        if 'merge_date_key' in df_copy.columns: df_copy.drop(columns=['merge_date_key'], inplace=True, errors='ignore')
+            df_copy[diff_col_name] = df_copy[original_metric_name] - daily_medians[original_metric_name]
+            for p in self.benchmark_percentiles:
+                df_copy[f"benchmark_p{p:g}_{base_name}"] = window_percentiles[(original_metric_name, p)]
         return df_copy
 
-    def _add_quantile_buckets(self, df):
+    def _bucket_column(self, values, edges):
+        """
+        Assigns each value the bucket between consecutive quantile edges: the first bucket
+        is [edges[0], edges[1]], the next ones (edges[i], edges[i + 1]], as pd.qcut does.
+        Repeated edges leave the buckets between them empty; values outside the edges
+        go to the first or last bucket. NaN values get no bucket.
+        """
+        labels = self.bucket_labels if len(self.bucket_labels) == self.n_buckets else list(range(self.n_buckets))
+        codes = np.searchsorted(edges[1:-1], values, side='left')
+        codes[np.isnan(values)] = -1
+        return pd.Categorical.from_codes(codes, categories=labels, ordered=True)
+
+    def _add_quantile_buckets(self, df, sketches=None):
         """
         Adds quantile-based buckets for configured difference metrics.
+        The bucket edges are the quantiles of the column in df, or come from `sketches`
+        ({difference column: QuantileSketch}, see bucket_sketches).
         """
-        df_copy = df.copy()
+        df_copy = self._working_copy(df)
+        quantile_levels = np.linspace(0, 1, self.n_buckets + 1)
         for diff_col_name, bucket_col_name in self.metrics_to_bucket_map.items():
             if diff_col_name not in df_copy.columns:
                 print(f"Warning: Source column '{diff_col_name}' not found for bucketing. Skipping bucket '{bucket_col_name}'.")
                 df_copy[bucket_col_name] = pd.NA
                 continue
-            
-            numeric_source_col = pd.to_numeric(df_copy[diff_col_name], errors='coerce')
-            non_na_count = numeric_source_col.count()
-
-            if non_na_count == 0 : # No data to bucket
-                 df_copy[bucket_col_name] = pd.NA
-                 continue
-            if non_na_count < self.n_buckets and non_na_count > 0 :
-                print(f"Warning: Not enough unique non-NA values in '{diff_col_name}' ({numeric_source_col.nunique()}) to create {self.n_buckets} distinct buckets for '{bucket_col_name}'. Resulting buckets may be fewer or pd.cut will be used.")
-                # Fallback to pd.cut if qcut is problematic due to too few unique values for N buckets
-                try:
-                    df_copy[bucket_col_name] = pd.cut(
-                        numeric_source_col,
-                        bins=self.n_buckets, # Let pandas determine bin edges
-                        labels=self.bucket_labels if len(self.bucket_labels) == self.n_buckets else False, # Ensure labels match bins
-                        duplicates='drop',
-                        include_lowest=True
-                    )
-                except Exception as e_cut:
-                    print(f"Error with pd.cut for '{diff_col_name}': {e_cut}. Assigning NA to '{bucket_col_name}'.")
-                    df_copy[bucket_col_name] = pd.NA
-                continue
 
-            try:
-                df_copy[bucket_col_name] = pd.qcut(
-                    numeric_source_col,
-                    q=self.n_buckets,
-                    labels=self.bucket_labels,
-                    duplicates='drop'
-                )
-            except Exception as e_qcut:
-                print(f"Error creating quantile buckets for '{diff_col_name}' with pd.qcut: {e_qcut}. Assigning NA to '{bucket_col_name}'.")
+            values = pd.to_numeric(df_copy[diff_col_name], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+            if sketches is not None:
+                sketch = sketches.get(diff_col_name)
+                edges = sketch.quantiles(quantile_levels) if sketch is not None and sketch.count else None
+            else:
+                non_na_values = pd.Series(values[~np.isnan(values)])
+                edges = non_na_values.quantile(quantile_levels).to_numpy() if len(non_na_values) else None
+
+            if edges is None: # No data to bucket
                 df_copy[bucket_col_name] = pd.NA
+                continue
+            df_copy[bucket_col_name] = self._bucket_column(values, edges)
         return df_copy
 
+    def bucket_sketches(self, df):
+        """
+        Returns a QuantileSketch of each difference column of df, for bucketing data
+        processed in chunks or by parallel workers: merge the sketches of all the chunks,
+        then label each chunk with assign_buckets. df must hold the difference columns.
+
+        Example:
+            sketches = transformer.bucket_sketches(chunks[0])
+            for chunk in chunks[1:]:
+                for column, sketch in transformer.bucket_sketches(chunk).items():
+                    sketches[column].merge(sketch)
+            labelled = [transformer.assign_buckets(chunk, sketches) for chunk in chunks]
+        """
+        sketches = {}
+        for diff_col_name in self.metrics_to_bucket_map:
+            sketch = QuantileSketch(self.bucket_rank_error)
+            if diff_col_name in df.columns:
+                sketch.update(pd.to_numeric(df[diff_col_name], errors='coerce').to_numpy(dtype=float, na_value=np.nan))
+            sketches[diff_col_name] = sketch
+        return sketches
+
+    def assign_buckets(self, df, sketches):
+        """Adds the bucket columns to df, with the edges of the merged sketches of bucket_sketches."""
+        return self._add_quantile_buckets(df, sketches)
+
     def merge_data(self, ga4_df, wp_df):
         """Merges GA4 and WordPress dataframes."""
         if 'pagepath' not in ga4_df.columns or ga4_df['pagepath'].isnull().all():
@@ -263,8 +348,22 @@ class Transformer:
 
     def transform_data(self, ga4_df, wp_df):
         """Main transformation pipeline."""
-        cleaned_ga4_df = self._clean_ga4_data(ga4_df.copy() if ga4_df is not None else pd.DataFrame())
-        cleaned_wp_df = self._clean_wp_data(wp_df.copy() if wp_df is not None else pd.DataFrame())
+        if not self.memory_hook:
+            return self._transform(ga4_df, wp_df)
+        self._memory_tracker = MemoryTracker(self.memory_hook)
+        self._memory_tracker.start()
+        try:
+            return self._transform(ga4_df, wp_df)
+        finally:
+            self._memory_tracker.stop()
+            self.memory_report = self._memory_tracker.stages
+            self._memory_tracker = None
+
+    def _transform(self, ga4_df, wp_df):
+        with self._stage("clean_ga4"):
+            cleaned_ga4_df = self._clean_ga4_data(self._working_copy(ga4_df) if ga4_df is not None else pd.DataFrame())
+        with self._stage("clean_wp"):
+            cleaned_wp_df = self._clean_wp_data(self._working_copy(wp_df) if wp_df is not None else pd.DataFrame())
         
         if cleaned_ga4_df.empty and cleaned_wp_df.empty:
             print("Both GA4 and WordPress input data are empty after cleaning. Returning empty DataFrame.")
@@ -274,7 +373,10 @@ class Transformer:
             return self.select_and_rename_columns(pd.DataFrame())
 
 
-        merged_df = self.merge_data(cleaned_ga4_df, cleaned_wp_df)
+        with self._stage("merge"):
+            merged_df = self.merge_data(cleaned_ga4_df, cleaned_wp_df)
+            # The merged frame holds its own data: release the cleaned inputs
+            del cleaned_ga4_df, cleaned_wp_df
         
         if merged_df.empty:
             print("Merge resulted in an empty DataFrame. Check merge keys and data integrity.")
@@ -283,11 +385,15 @@ class Transformer:
         
         pubdate_column_name = 'pubdate'
         
-        # Add benchmark difference columns and quantile bucket columns
-        merged_df_with_calcs = self._add_benchmark_differences(merged_df, pubdate_column_name)
-        transformed_df_final = self._add_quantile_buckets(merged_df_with_calcs)
-
-        final_df_selected = self.select_and_rename_columns(transformed_df_final)
+        # Add benchmark difference columns and quantile bucket columns,
+        # rebinding the name so each intermediate frame can be released
+        with self._stage("benchmarks"):
+            merged_df = self._add_benchmark_differences(merged_df, pubdate_column_name)
+        with self._stage("buckets"):
+            merged_df = self._add_quantile_buckets(merged_df)
+
+        with self._stage("select"):
+            final_df_selected = self.select_and_rename_columns(merged_df)
         
         return final_df_selected
 
@@ -0,0 +1,149 @@
+import hashlib
+import json
+import os
+import time
+import pandas as pd
+
+
+class WpParseCache:
+    """
+    Content-addressed cache of parsed WordPress exports.
+
+    Each entry is a Parquet file named after the SHA-256 of the export's bytes and
+    the parser version, so a renamed or copied export still hits the cache while an
+    edited one (or a parser change) misses it. Entries are read back memory-mapped.
+    An `index.json` in the cache directory records the entries and their last use,
+    plus the hash of every source file keyed by size and mtime, so an unchanged
+    export is not re-hashed either.
+    """
+    INDEX_FILENAME = "index.json"
+    HASH_CHUNK_SIZE = 1 << 20
+
+    def __init__(self, cache_dir, max_bytes=None):
+        """
+        Args:
+            cache_dir (str): Directory holding the Parquet files and the index.
+            max_bytes (int, optional): Maximum total size of the cached Parquet files.
+                                       Least recently used entries are evicted beyond it.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(cache_dir, self.INDEX_FILENAME)
+        os.makedirs(cache_dir, exist_ok=True)
+        self.index = self._read_index()
+
+    def _read_index(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            index = {}
+        index.setdefault("entries", {})
+        index.setdefault("hashes", {})
+        return index
+
+    def _write_index(self):
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, indent=2)
+        os.replace(tmp_path, self.index_path)
+
+    def file_hash(self, file_path):
+        """Returns the SHA-256 of the file, reusing the stored one if size and mtime are unchanged."""
+        source = os.path.abspath(file_path)
+        stat = os.stat(source)
+        known = self.index["hashes"].get(source)
+        if known and known["size"] == stat.st_size and known["mtime_ns"] == stat.st_mtime_ns:
+            return known["sha256"]
+
+        digest = hashlib.sha256()
+        with open(source, 'rb') as f:
+            for chunk in iter(lambda: f.read(self.HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        sha256 = digest.hexdigest()
+        self.index["hashes"][source] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": sha256}
+        self._write_index()
+        return sha256
+
+    def key_for(self, file_path, parser_version):
+        """Returns the cache key of an export parsed with the given parser version."""
+        return f"{self.file_hash(file_path)}-{parser_version}"
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.parquet")
+
+    def load(self, file_path, parser_version):
+        """
+        Returns the cached DataFrame for the export, or None on a cache miss.
+        """
+        key = self.key_for(file_path, parser_version)
+        entry = self.index["entries"].get(key)
+        entry_path = self._entry_path(key)
+        if entry is None or not os.path.exists(entry_path):
+            return None
+        try:
+            df = pd.read_parquet(entry_path, engine='pyarrow', memory_map=True)
+        except Exception as e:
+            print(f"Error reading cached WordPress data {entry_path}: {e}")
+            self._remove(key)
+            self._write_index()
+            return None
+        entry["last_used"] = time.time()
+        self._write_index()
+        return df
+
+    def store(self, file_path, parser_version, df):
+        """
+        Stores the parsed DataFrame of the export, then evicts old entries if over `max_bytes`.
+        """
+        key = self.key_for(file_path, parser_version)
+        entry_path = self._entry_path(key)
+        tmp_path = entry_path + ".tmp"
+        df.to_parquet(tmp_path, engine='pyarrow', index=False)
+        os.replace(tmp_path, entry_path)
+        self.index["entries"][key] = {
+            "source": os.path.abspath(file_path),
+            "parser_version": parser_version,
+            "size": os.path.getsize(entry_path),
+            "last_used": time.time()
+        }
+        self._evict(keep=key)
+        self._write_index()
+
+    def invalidate(self, file_path=None):
+        """
+        Removes the entries parsed from `file_path` (any parser version), or every entry if None.
+        Returns the number of entries removed.
+        """
+        if file_path is None:
+            keys = list(self.index["entries"])
+            self.index["hashes"] = {}
+        else:
+            source = os.path.abspath(file_path)
+            keys = [key for key, entry in self.index["entries"].items() if entry["source"] == source]
+            self.index["hashes"].pop(source, None)
+        for key in keys:
+            self._remove(key)
+        self._write_index()
+        return len(keys)
+
+    def _remove(self, key):
+        self.index["entries"].pop(key, None)
+        try:
+            os.remove(self._entry_path(key))
+        except FileNotFoundError:
+            pass
+
+    def _evict(self, keep=None):
+        """Drops least recently used entries until the cache fits in `max_bytes`."""
+        if self.max_bytes is None:
+            return
+        entries = self.index["entries"]
+        total = sum(entry["size"] for entry in entries.values())
+        for key in sorted(entries, key=lambda k: entries[k]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            total -= entries[key]["size"]
+            self._remove(key)
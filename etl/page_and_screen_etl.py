@@ -1,6 +1,7 @@
 import pandas as pd
 import os
 from abc import ABC, abstractmethod
+from td_data_toolkit.ga4_toolkit import read_ga4_export
 
 class BasePageAndScreenETL(ABC):
     def __init__(self, input_filename=None, output_filename=None, df=None):
@@ -9,6 +10,7 @@ class BasePageAndScreenETL(ABC):
         self.data_path = os.path.join('etl', 'data', self.input_filename) if self.input_filename else None
         self.output_path = os.path.join('etl', 'output', self.output_filename) if self.output_filename else None
         self.df = df
+        self.metadata = None
 
     @property
     @abstractmethod
@@ -21,7 +23,9 @@ class BasePageAndScreenETL(ABC):
             return self.df
         if not self.data_path:
             raise ValueError("No input file or DataFrame provided.")
-        self.df = pd.read_csv(self.data_path, header=9)
+        # Typed read; the export's preamble (property, date range...) goes to self.metadata
+        self.df = read_ga4_export(self.data_path)
+        self.metadata = self.df.attrs['ga4_metadata']
         return self.df
 
     def drop_if_not_ends_with_html(self):
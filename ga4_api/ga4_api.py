@@ -1,30 +1,88 @@
 from google_auth_oauthlib.flow import InstalledAppFlow
-from google.analytics.data_v1beta import BetaAnalyticsDataClient
-from google.analytics.data_v1beta.types import RunReportRequest, DateRange, Dimension, Metric
+from google.analytics.data_v1beta import BetaAnalyticsDataAsyncClient, BetaAnalyticsDataClient
+from google.analytics.data_v1beta.types import (
+    BatchRunReportsRequest, RunReportRequest, RunReportResponse, DateRange, Dimension, Metric, MetricType
+)
+from google.api_core.exceptions import ResourceExhausted
 from google.auth.transport.requests import Request
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+import asyncio
+import numpy as np
 import pandas as pd
 import pickle
+import time
 import os
 
+try:
+    from ga4_api.query_filters import HTML_PAGES_FILTER, filter_expression, order_bys
+    from ga4_api.quota import RETRYABLE_ERRORS, QuotaTracker, backoff_delay
+    from ga4_api.response_cache import Ga4ResponseCache
+except ImportError:  # ga4_api.py run from its own directory
+    from query_filters import HTML_PAGES_FILTER, filter_expression, order_bys
+    from quota import RETRYABLE_ERRORS, QuotaTracker, backoff_delay
+    from response_cache import Ga4ResponseCache
+
 # List of ga4 metrics and dimensions
 # https://developers.google.com/analytics/devguides/reporting/data/v1/api-schema?hl=it#metrics
 
 SCOPES = ["https://www.googleapis.com/auth/analytics.readonly"]
 TOKEN_PICKLE = "token.pickle"
 
+# Rows per RunReport page (the API returns at most 250,000 rows per request)
+PAGE_SIZE = 100_000
+# Pages of the same report fetched concurrently
+MAX_PAGE_WORKERS = 4
+# Reports the API accepts in one batchRunReports call
+MAX_BATCH_REPORTS = 5
+# Requests a client keeps in flight at once (GA4 allows 10 per standard property)
+MAX_CONCURRENT_REQUESTS = 8
+# Seconds a request may spend retrying transient errors and waiting for quota
+RETRY_DEADLINE = 300
+
 class Ga4Client:
     """
     Google Analytics 4 API client for authenticated data access.
     Handles OAuth2 authentication and provides a method to run GA4 queries.
     """
-    def __init__(self, credentials_file=None, token_pickle=None, scopes=None):
+    def __init__(self, credentials_file=None, token_pickle=None, scopes=None, client=None,
+                 page_size=PAGE_SIZE, max_workers=MAX_PAGE_WORKERS, cache_dir=None, retry_deadline=RETRY_DEADLINE,
+                 categorical_dimensions=False):
+        """
+        Args:
+            client (optional): Data API client to use instead of an authenticated
+                               BetaAnalyticsDataClient, e.g. a local fake in tests.
+            page_size (int): Rows requested per RunReport page.
+            max_workers (int): Maximum number of pages fetched concurrently.
+            cache_dir (str, optional): Directory of the on-disk cache of query results
+                                       (see Ga4ResponseCache). No caching if None.
+            retry_deadline (float): Seconds a request may spend retrying transient errors
+                                    and waiting for quota before its error is raised.
+            categorical_dimensions (bool): Return the dimensions as categoricals instead of
+                                           string columns. Smaller for large reports, but new
+                                           values cannot be assigned to them without adding
+                                           the category first.
+        """
         # Default: credentials file in the same directory as this script
         default_credentials_path = os.path.join(os.path.dirname(__file__), "client_secret_722854453271-t3dg269vqsvjjhbmpkh2a5etk0mmf6ve.apps.googleusercontent.com.json")
         self.credentials_file = credentials_file or default_credentials_path
         self.token_pickle = token_pickle or TOKEN_PICKLE
         self.scopes = scopes or SCOPES
-        self.credentials = self._get_oauth_credentials()
-        self.client = BetaAnalyticsDataClient(credentials=self.credentials)
+        self.page_size = page_size
+        self.max_workers = max_workers
+        self.retry_deadline = retry_deadline
+        self.categorical_dimensions = categorical_dimensions
+        # Quota consumption of the run, see QuotaTracker.usage()
+        self.quota = QuotaTracker()
+        # Requests in flight at most, fewer as the quota runs out (see QuotaTracker.allowed_concurrency)
+        self.max_concurrency = MAX_CONCURRENT_REQUESTS
+        if client is None:
+            self.credentials = self._get_oauth_credentials()
+            client = self._create_client(self.credentials)
+        else:
+            self.credentials = None
+        self.client = client
+        self.cache = Ga4ResponseCache(cache_dir) if cache_dir else None
 
     def _get_oauth_credentials(self):
         creds = None
@@ -41,49 +99,355 @@ class Ga4Client:
                 pickle.dump(creds, token)
         return creds
 
-    def run_query(self, property_id, dimensions=None, metrics=None, start_date=None, end_date=None):
+    def _create_client(self, credentials):
+        return BetaAnalyticsDataClient(credentials=credentials)
+
+    def _quota_wait(self, deadline):
+        """Returns the seconds to wait for quota before the next request, raising if past the deadline."""
+        wait = self.quota.wait_time()
+        if wait and time.monotonic() + wait > deadline:
+            raise ResourceExhausted(
+                f"GA4 hourly tokens left: {self.quota.remaining.get('tokens_per_hour')}, "
+                f"waiting {wait:.0f}s for more would exceed the retry deadline"
+            )
+        self.quota.record_wait(wait)
+        return wait
+
+    def _retry_delay(self, error, attempt, deadline):
+        """Returns the backoff before retrying a failed request, re-raising the error if past the deadline."""
+        delay = backoff_delay(attempt)
+        if time.monotonic() + delay > deadline:
+            raise error
+        print(f"GA4 API error ({error.__class__.__name__}), retrying in {delay:.1f} seconds...")
+        self.quota.record_retry()
+        return delay
+
+    def _call(self, rpc, request):
+        """
+        Sends a request with a Data API client method, paced under the property quota:
+        it waits for hourly tokens and for a free slot among the concurrent requests
+        the quota allows. Transient errors are retried with jittered exponential backoff until `retry_deadline`;
+        the others are raised.
+        """
+        deadline = time.monotonic() + self.retry_deadline
+        attempt = 0
+        while True:
+            time.sleep(self._quota_wait(deadline))
+            try:
+                with self.quota.request(self.max_concurrency):
+                    response = rpc(request)
+            except RETRYABLE_ERRORS as e:
+                time.sleep(self._retry_delay(e, attempt, deadline))
+                attempt += 1
+                continue
+            self.quota.record_response(response)
+            return response
+
+    def _run_report(self, request):
+        return self._call(self.client.run_report, request)
+
+    def _page_request(self, request_kwargs, offset):
+        """Returns the request of the page starting at `offset`, within the query's row limit."""
+        limit = self.page_size
+        if request_kwargs.get("limit"):
+            limit = min(limit, request_kwargs["limit"] - offset)
+        return RunReportRequest(**dict(request_kwargs, offset=offset, limit=limit, return_property_quota=True))
+
+    def _page_offsets(self, request_kwargs, first):
+        """Returns the offsets of the pages after the `first` one."""
+        total = first.row_count
+        if request_kwargs.get("limit"):
+            total = min(total, request_kwargs["limit"])
+        return range(self.page_size, total, self.page_size)
+
+    def _fetch_rest(self, request_kwargs, first):
+        """
+        Fetches the pages of a report after its `first` one concurrently.
+        Returns all the responses in row order.
+        """
+        offsets = self._page_offsets(request_kwargs, first)
+        if not offsets:
+            return [first]
+        requests = [self._page_request(request_kwargs, offset) for offset in offsets]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(requests))) as executor:
+            return [first] + list(executor.map(self._run_report, requests))
+
+    def _fetch_pages(self, request_kwargs):
+        """Fetches every page of a report. The first page gives the total row count."""
+        first = self._run_report(self._page_request(request_kwargs, 0))
+        return self._fetch_rest(request_kwargs, first)
+
+    @staticmethod
+    def _request_kwargs(property_id, dimensions=None, metrics=None, start_date=None, end_date=None,
+                        dimension_filter=None, metric_filter=None, order_by=None, limit=None):
+        if metrics is None:
+            raise ValueError("metrics must be provided")
+        request_kwargs = dict(
+            property=f"properties/{property_id}",
+            dimensions=[Dimension(name=d) for d in dimensions] if dimensions else [],
+            metrics=[Metric(name=m) for m in metrics],
+            date_ranges=[DateRange(start_date=start_date, end_date=end_date)]
+        )
+        if dimension_filter:
+            request_kwargs["dimension_filter"] = filter_expression(dimension_filter)
+        if metric_filter:
+            request_kwargs["metric_filter"] = filter_expression(metric_filter)
+        if order_by:
+            request_kwargs["order_bys"] = order_bys(order_by, metrics)
+        if limit:
+            request_kwargs["limit"] = limit
+        return request_kwargs
+
+    def _to_dataframe(self, responses):
+        """
+        Builds a DataFrame from the pages of a report, one column at a time.
+        Dimensions become string columns (categoricals with `categorical_dimensions`),
+        integer metrics int64 and the other metrics float64.
+        """
+        # The raw protobuf messages are much faster to read than their proto-plus wrappers
+        pages = [RunReportResponse.pb(response) for response in responses]
+        columns = {}
+        for i, header in enumerate(pages[0].dimension_headers):
+            values = [row.dimension_values[i].value for page in pages for row in page.rows]
+            columns[header.name] = pd.Categorical(values) if self.categorical_dimensions else values
+        for i, header in enumerate(pages[0].metric_headers):
+            values = np.array([row.metric_values[i].value for page in pages for row in page.rows])
+            try:
+                columns[header.name] = values.astype(np.int64 if header.type_ == MetricType.TYPE_INTEGER else np.float64)
+            except ValueError:
+                columns[header.name] = pd.to_numeric(values, errors="coerce")
+        return pd.DataFrame(columns)
+
+    def _load_cached(self, request_kwargs):
+        if self.cache is None:
+            return None
+        df = self.cache.load(RunReportRequest(**request_kwargs))
+        if df is None:
+            return None
+        # Entries may have been stored by a client with the other dimension type
+        for dimension in request_kwargs["dimensions"]:
+            if dimension.name in df.columns:
+                dtype = "category" if self.categorical_dimensions else str
+                df[dimension.name] = df[dimension.name].astype(dtype)
+        return df
+
+    def _store_cached(self, request_kwargs, df):
+        if self.cache is not None:
+            self.cache.store(RunReportRequest(**request_kwargs), df)
+
+    def run_query(self, property_id, dimensions=None, metrics=None, start_date=None, end_date=None,
+                  dimension_filter=None, metric_filter=None, order_by=None, limit=None):
         """
         Run a GA4 query and return the results as a pandas DataFrame.
+        All the rows are returned: reports larger than `page_size` rows are
+        fetched in pages, up to `max_workers` at a time.
+        Filters, ordering and limit are applied by GA4, so only the rows kept are transferred.
         Args:
             property_id (str): GA4 property ID.
             dimensions (list, optional): List of dimension names. If None, no dimensions are used.
             metrics (list): List of metric names.
             start_date (str): Start date in 'YYYY-MM-DD' format.
             end_date (str): End date in 'YYYY-MM-DD' format.
+            dimension_filter (list, optional): (dimension, operator, value) conditions the rows must
+                                               all match, see query_filters.filter_expression.
+            metric_filter (list, optional): (metric, operator, value) conditions, applied after aggregation.
+            order_by (list, optional): Field names to sort by, prefixed with '-' for a descending order.
+            limit (int, optional): Maximum number of rows to return.
         Returns:
             pd.DataFrame: DataFrame with the query results.
+        Raises:
+            google.api_core.exceptions.GoogleAPICallError: If the query fails, or still fails
+                with transient errors after `retry_deadline` seconds.
+
+        Example:
+            # Top 100 articles by views
+            ga4.run_query('394327334', ['pagePath'], ['screenPageViews'], '7daysAgo', 'today',
+                          dimension_filter=HTML_PAGES_FILTER, order_by=['-screenPageViews'], limit=100)
         """
-        from google.api_core.exceptions import DeadlineExceeded
-        import time
-        if metrics is None:
-            raise ValueError("metrics must be provided")
-        request = RunReportRequest(
-            property=f"properties/{property_id}",
-            dimensions=[Dimension(name=d) for d in dimensions] if dimensions else [],
-            metrics=[Metric(name=m) for m in metrics],
-            date_ranges=[DateRange(start_date=start_date, end_date=end_date)]
-        )
+        request_kwargs = self._request_kwargs(property_id, dimensions, metrics, start_date, end_date,
+                                              dimension_filter, metric_filter, order_by, limit)
+        cached = self._load_cached(request_kwargs)
+        if cached is not None:
+            return cached
+        df = self._to_dataframe(self._fetch_pages(request_kwargs))
+        self._store_cached(request_kwargs, df)
+        return df
+
+    def run_queries(self, queries):
+        """
+        Run several GA4 queries with as few API calls as possible.
+        Queries on the same property are sent together in batchRunReports calls
+        of up to five reports; pages beyond the first are fetched as in `run_query`.
+        Queries found in the cache are not sent.
+        Args:
+            queries (list of dict): `run_query` keyword arguments of each query.
+        Returns:
+            list of pd.DataFrame: One DataFrame per query, in the order of `queries`.
+        Raises:
+            google.api_core.exceptions.GoogleAPICallError: As `run_query`. The results of
+                the batches completed before are cached, if the client has a cache.
+
+        Example:
+            weekly, monthly = ga4.run_queries([
+                dict(property_id='394327334', dimensions=['pagePath'], metrics=['screenPageViews'],
+                     start_date='2024-06-24', end_date='2024-06-30'),
+                dict(property_id='394327334', dimensions=['pagePath'], metrics=['screenPageViews', 'activeUsers'],
+                     start_date='2024-06-01', end_date='2024-06-30'),
+            ])
+        """
+        request_kwargs = [self._request_kwargs(**query) for query in queries]
+        results = [self._load_cached(kwargs) for kwargs in request_kwargs]
+        for batch, request in self._batches(request_kwargs, results):
+            response = self._call(self.client.batch_run_reports, request)
+            for i, first in zip(batch, response.reports):
+                results[i] = self._to_dataframe(self._fetch_rest(request_kwargs[i], first))
+                self._store_cached(request_kwargs[i], results[i])
+        return results
+
+    def _batches(self, request_kwargs, results):
+        """
+        Groups the queries without a result by property, in batches of up to five.
+        Returns (query indices, BatchRunReportsRequest) pairs.
+        """
+        by_property = {}
+        for i, kwargs in enumerate(request_kwargs):
+            if results[i] is None:
+                by_property.setdefault(kwargs["property"], []).append(i)
+        batches = []
+        for property_name, indices in by_property.items():
+            for start in range(0, len(indices), MAX_BATCH_REPORTS):
+                batch = indices[start:start + MAX_BATCH_REPORTS]
+                batches.append((batch, BatchRunReportsRequest(
+                    property=property_name,
+                    requests=[self._page_request(request_kwargs[i], 0) for i in batch]
+                )))
+        return batches
+
+
+class AsyncGa4Client(Ga4Client):
+    """
+    asyncio variant of Ga4Client, built on the async Data API client.
+    `run_query` and `run_queries` are coroutines returning the same DataFrames, so
+    independent reports can run concurrently; at most `max_concurrency` requests
+    (report pages and batches) are in flight at once, fewer as the quota runs out. Like the underlying gRPC channel,
+    a client is bound to the event loop it first runs in.
+
+    Example:
+        async def pull_reports(ga4):
+            return await asyncio.gather(
+                ga4.run_query(property_id, ['pagePath'], WEEKLY_REPORT_METRICS, *WEEKLY_REPORT_DATA_RANGE),
+                ga4.run_query(property_id, ['pagePath'], MONTHLY_REPORT_METRICS, '2025-08-01', '2025-08-31'),
+            )
+        weekly, monthly = asyncio.run(pull_reports(AsyncGa4Client()))
+    """
+    def __init__(self, credentials_file=None, token_pickle=None, scopes=None, client=None,
+                 page_size=PAGE_SIZE, max_concurrency=MAX_CONCURRENT_REQUESTS, cache_dir=None,
+                 retry_deadline=RETRY_DEADLINE, categorical_dimensions=False):
+        """
+        Args:
+            client (optional): Async Data API client to use instead of an authenticated
+                               BetaAnalyticsDataAsyncClient, e.g. a local fake in tests.
+            page_size (int): Rows requested per RunReport page.
+            max_concurrency (int): Maximum number of requests in flight.
+            cache_dir (str, optional): Directory of the on-disk cache of query results.
+            retry_deadline (float): Seconds a request may spend retrying transient errors
+                                    and waiting for quota before its error is raised.
+            categorical_dimensions (bool): Return the dimensions as categoricals, see Ga4Client.
+        """
+        super().__init__(credentials_file, token_pickle, scopes, client=client, page_size=page_size,
+                         max_workers=max_concurrency, cache_dir=cache_dir, retry_deadline=retry_deadline,
+                         categorical_dimensions=categorical_dimensions)
+        self.max_concurrency = max_concurrency
+        self._slot_freed = asyncio.Condition()
+
+    def _create_client(self, credentials):
+        # The gRPC channel binds to the running event loop, it is opened by the first request
+        return None
+
+    def _data_client(self):
+        if self.client is None:
+            self.client = BetaAnalyticsDataAsyncClient(credentials=self.credentials)
+        return self.client
+
+    @asynccontextmanager
+    async def _request_slot(self):
+        """Holds one of the concurrent requests the quota allows, like `QuotaTracker.request`."""
+        async with self._slot_freed:
+            # The predicate counts the request as soon as a slot is free
+            await self._slot_freed.wait_for(lambda: self.quota.start_request(self.max_concurrency, wait=False))
+        try:
+            yield
+        finally:
+            self.quota.end_request()
+            async with self._slot_freed:
+                self._slot_freed.notify_all()
+
+    async def _call(self, rpc, request):
+        """Sends a request with an async Data API client method, paced and retried as in `Ga4Client._call`."""
+        deadline = time.monotonic() + self.retry_deadline
+        attempt = 0
         while True:
+            await asyncio.sleep(self._quota_wait(deadline))
             try:
-                response = self.client.run_report(request)
-                rows = []
-                for row in response.rows:
-                    row_dict = {}
-                    for d, v in zip(response.dimension_headers, row.dimension_values):
-                        row_dict[d.name] = v.value
-                    for m, v in zip(response.metric_headers, row.metric_values):
-                        row_dict[m.name] = v.value
-                    rows.append(row_dict)
-                df = pd.DataFrame(rows)
-                return df
-            except DeadlineExceeded:
-                print("GA4 API timeout occurred, retrying in 2 seconds...")
-                time.sleep(2)
+                async with self._request_slot():
+                    response = await rpc(request)
+            except RETRYABLE_ERRORS as e:
+                await asyncio.sleep(self._retry_delay(e, attempt, deadline))
+                attempt += 1
                 continue
-            except Exception as e:
-                print(f"Error running GA4 query: {e}")
-                time.sleep(2)
-                return pd.DataFrame([])
+            self.quota.record_response(response)
+            return response
+
+    async def _run_report(self, request):
+        return await self._call(self._data_client().run_report, request)
+
+    async def _fetch_rest(self, request_kwargs, first):
+        """Fetches the pages of a report after its `first` one concurrently, in row order."""
+        rest = await asyncio.gather(*(
+            self._run_report(self._page_request(request_kwargs, offset))
+            for offset in self._page_offsets(request_kwargs, first)
+        ))
+        return [first] + list(rest)
+
+    async def _fetch_pages(self, request_kwargs):
+        first = await self._run_report(self._page_request(request_kwargs, 0))
+        return await self._fetch_rest(request_kwargs, first)
+
+    async def run_query(self, property_id, dimensions=None, metrics=None, start_date=None, end_date=None,
+                        dimension_filter=None, metric_filter=None, order_by=None, limit=None):
+        """
+        Run a GA4 query and return the results as a pandas DataFrame, see `Ga4Client.run_query`.
+        """
+        request_kwargs = self._request_kwargs(property_id, dimensions, metrics, start_date, end_date,
+                                              dimension_filter, metric_filter, order_by, limit)
+        cached = self._load_cached(request_kwargs)
+        if cached is not None:
+            return cached
+        df = self._to_dataframe(await self._fetch_pages(request_kwargs))
+        self._store_cached(request_kwargs, df)
+        return df
+
+    async def _run_batch(self, batch, request, request_kwargs, results):
+        response = await self._call(self._data_client().batch_run_reports, request)
+        pages = await asyncio.gather(*(
+            self._fetch_rest(request_kwargs[i], first) for i, first in zip(batch, response.reports)
+        ))
+        for i, responses in zip(batch, pages):
+            results[i] = self._to_dataframe(responses)
+            self._store_cached(request_kwargs[i], results[i])
+
+    async def run_queries(self, queries):
+        """
+        Run several GA4 queries in batchRunReports calls, see `Ga4Client.run_queries`.
+        The batches are sent concurrently.
+        """
+        request_kwargs = [self._request_kwargs(**query) for query in queries]
+        results = [self._load_cached(kwargs) for kwargs in request_kwargs]
+        await asyncio.gather(*(
+            self._run_batch(batch, request, request_kwargs, results)
+            for batch, request in self._batches(request_kwargs, results)
+        ))
+        return results
 
 # Example usage
 if __name__ == "__main__":
@@ -98,3 +462,4 @@ if __name__ == "__main__":
         end_date='2024-06-30'
     )
     print(df.head())
+    print(f"GA4 quota usage: {ga4.quota.usage()}")
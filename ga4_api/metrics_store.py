@@ -0,0 +1,215 @@
+import json
+import os
+import time
+from datetime import date, timedelta
+import pandas as pd
+
+try:
+    from ga4_api.response_cache import resolve_date
+except ImportError:  # ga4_api.py run from its own directory
+    from response_cache import resolve_date
+
+# Ratio metrics and the additive metric they are averaged over: the daily values,
+# weighted by it, give back the ratio of the whole window.
+RATIO_METRIC_WEIGHTS = {
+    "engagementRate": "sessions",
+    "bounceRate": "sessions",
+    "averageSessionDuration": "sessions",
+    "screenPageViewsPerSession": "sessions",
+    "sessionConversionRate": "sessions",
+    "eventsPerSession": "sessions",
+    "userEngagementDurationPerSession": "sessions",
+}
+# Counts of distinct users: a user active on several days of a window counts once,
+# so the window total is not the sum of the daily ones.
+NON_ADDITIVE_METRICS = frozenset((
+    "activeUsers", "totalUsers", "active1DayUsers", "active7DayUsers", "active28DayUsers",
+    "screenPageViewsPerUser", "sessionsPerUser", "userEngagementDurationPerUser",
+    "averageRevenuePerUser", "dauPerMau", "dauPerWau", "wauPerMau",
+))
+# Metrics allowed in one RunReport request
+MAX_REQUEST_METRICS = 10
+
+
+class Ga4MetricsStore:
+    """
+    Local store of daily GA4 metrics, from which any date window is aggregated.
+
+    Metrics are fetched with the `date` dimension added, only for the days missing
+    from the store, and kept as one Parquet file per day under
+    `store_dir/<property>_<dimensions>/`, with an `index.json` recording the metrics
+    and fetch time of each day. A window is answered from the daily files:
+    additive metrics (views, sessions, events...) are summed and ratio metrics
+    (see RATIO_METRIC_WEIGHTS) are recomputed as the average of the daily values
+    weighted by their base metric. User counts are not additive across days and
+    are refused.
+    Days fetched more than `immutable_after_days` after they ended are final;
+    more recent ones are refetched once older than `ttl_seconds`.
+
+    Example:
+        store = Ga4MetricsStore(Ga4Client(), STORE_DIR, '394327334')
+        weekly = store.get(['screenPageViews', 'engagementRate'], '2025-09-17', '2025-09-23')
+        monthly = store.get(['screenPageViews', 'engagementRate'], '2025-09-01', '2025-09-30')
+    """
+    INDEX_FILENAME = "index.json"
+
+    def __init__(self, ga4_client, store_dir, property_id, dimensions=None,
+                 immutable_after_days=3, ttl_seconds=6 * 3600):
+        """
+        Args:
+            ga4_client (Ga4Client): Client used to fetch the missing days.
+            store_dir (str): Root directory of the store.
+            property_id (str): GA4 property ID.
+            dimensions (list, optional): Dimensions of the stored rows, ['pagePath'] by default.
+            immutable_after_days (int): Days after which the numbers of a date are final.
+            ttl_seconds (int): Lifetime of the days that are not final yet.
+        """
+        self.ga4_client = ga4_client
+        self.property_id = property_id
+        self.dimensions = list(dimensions or ['pagePath'])
+        self.immutable_after_days = immutable_after_days
+        self.ttl_seconds = ttl_seconds
+        self.partition_dir = os.path.join(store_dir, f"{property_id}_{'+'.join(self.dimensions)}")
+        self.index_path = os.path.join(self.partition_dir, self.INDEX_FILENAME)
+        os.makedirs(self.partition_dir, exist_ok=True)
+        self.index = self._read_index()
+
+    def _read_index(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            index = {}
+        index.setdefault("days", {})
+        return index
+
+    def _write_index(self):
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, indent=2)
+        os.replace(tmp_path, self.index_path)
+
+    def _day_path(self, day):
+        return os.path.join(self.partition_dir, f"{day}.parquet")
+
+    def _is_fresh(self, day_entry):
+        return day_entry["final"] or time.time() - day_entry["fetched"] < self.ttl_seconds
+
+    def _stored_metrics(self, metrics):
+        """Returns the metrics to store for the requested ones: themselves plus the ratio weights."""
+        unsupported = [m for m in metrics if m in NON_ADDITIVE_METRICS]
+        if unsupported:
+            raise ValueError(
+                f"{unsupported} are not additive across days, query the window with Ga4Client.run_query"
+            )
+        needed = list(metrics)
+        for metric in metrics:
+            weight = RATIO_METRIC_WEIGHTS.get(metric)
+            if weight and weight not in needed:
+                needed.append(weight)
+        return needed
+
+    def _days_to_fetch(self, days, needed):
+        """Returns {day: metrics to fetch} for the missing, stale or incomplete days."""
+        to_fetch = {}
+        for day in days:
+            entry = self.index["days"].get(day)
+            if entry and os.path.exists(self._day_path(day)) and self._is_fresh(entry) \
+                    and set(needed) <= set(entry["metrics"]):
+                continue
+            metrics = list(needed)
+            if entry:
+                # Keep what the day already holds when the request allows it
+                metrics += [m for m in entry["metrics"] if m not in metrics]
+                if len(metrics) > MAX_REQUEST_METRICS:
+                    metrics = list(needed)
+            to_fetch[day] = metrics
+        return to_fetch
+
+    def _fetch(self, to_fetch):
+        """Fetches the days with one query per run of consecutive days needing the same metrics."""
+        runs = []
+        for day in sorted(to_fetch):
+            previous = runs[-1] if runs else None
+            if previous and previous["metrics"] == to_fetch[day] \
+                    and date.fromisoformat(previous["end"]) + timedelta(days=1) == date.fromisoformat(day):
+                previous["end"] = day
+            else:
+                runs.append({"start": day, "end": day, "metrics": to_fetch[day]})
+
+        queries = [
+            dict(property_id=self.property_id, dimensions=self.dimensions + ['date'], metrics=run["metrics"],
+                 start_date=run["start"], end_date=run["end"])
+            for run in runs
+        ]
+        today = date.today()
+        for run, df in zip(runs, self.ga4_client.run_queries(queries)):
+            df = df.copy()
+            df['date'] = pd.to_datetime(df['date'], format='%Y%m%d').dt.strftime('%Y-%m-%d')
+            for metric in run["metrics"]:
+                df[metric] = pd.to_numeric(df[metric], errors='coerce')
+            by_day = dict(tuple(df.groupby('date', sort=False)))
+            day = date.fromisoformat(run["start"])
+            while day <= date.fromisoformat(run["end"]):
+                day_df = by_day.get(day.isoformat(), df.iloc[0:0]).drop(columns='date')
+                day_df.to_parquet(self._day_path(day.isoformat()), engine='pyarrow', index=False)
+                self.index["days"][day.isoformat()] = {
+                    "metrics": run["metrics"],
+                    "final": (today - day).days > self.immutable_after_days,
+                    "fetched": time.time(),
+                }
+                day += timedelta(days=1)
+        self._write_index()
+
+    def daily(self, metrics, start_date, end_date):
+        """
+        Returns the daily rows of a window, with a 'date' column, fetching the missing days.
+        Args:
+            metrics (list): List of metric names.
+            start_date (str): Start date in 'YYYY-MM-DD' format, or 'NdaysAgo', 'yesterday', 'today'.
+            end_date (str): End date, in the same formats.
+        Returns:
+            pd.DataFrame: One row per day and dimension values, with the requested metrics
+                          and the weights of the ratio metrics among them.
+        """
+        needed = self._stored_metrics(metrics)
+        start = date.fromisoformat(resolve_date(start_date))
+        end = date.fromisoformat(resolve_date(end_date))
+        days = [(start + timedelta(days=i)).isoformat() for i in range((end - start).days + 1)]
+        to_fetch = self._days_to_fetch(days, needed)
+        if to_fetch:
+            self._fetch(to_fetch)
+
+        frames = []
+        for day in days:
+            if day not in self.index["days"] or not os.path.exists(self._day_path(day)):
+                print(f"GA4 metrics for {day} are missing from the store")
+                continue
+            day_df = pd.read_parquet(self._day_path(day), engine='pyarrow', columns=self.dimensions + needed)
+            frames.append(day_df.assign(date=day))
+        if not frames:
+            return pd.DataFrame(columns=self.dimensions + ['date'] + needed)
+        return pd.concat(frames, ignore_index=True)[self.dimensions + ['date'] + needed]
+
+    def get(self, metrics, start_date, end_date):
+        """
+        Returns the metrics of a window aggregated by the store's dimensions,
+        as `Ga4Client.run_query` would for the whole window, fetching only the missing days.
+        Args:
+            metrics (list): List of metric names, user counts excluded.
+            start_date (str): Start date in 'YYYY-MM-DD' format, or 'NdaysAgo', 'yesterday', 'today'.
+            end_date (str): End date, in the same formats.
+        Returns:
+            pd.DataFrame: One row per dimension values, with the requested metrics.
+        """
+        daily = self.daily(metrics, start_date, end_date)
+        for metric in metrics:
+            weight = RATIO_METRIC_WEIGHTS.get(metric)
+            if weight:
+                daily[metric] = daily[metric] * daily[weight]
+        summed = daily.drop(columns='date').groupby(self.dimensions, sort=False).sum()
+        for metric in metrics:
+            weight = RATIO_METRIC_WEIGHTS.get(metric)
+            if weight:
+                summed[metric] = summed[metric] / summed[weight].where(summed[weight] != 0)
+        return summed.reset_index()[self.dimensions + list(metrics)]
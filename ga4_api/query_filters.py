@@ -0,0 +1,104 @@
+from google.analytics.data_v1beta.types import Filter, FilterExpression, FilterExpressionList, NumericValue, OrderBy
+
+_STRING_MATCH_TYPES = {
+    "==": Filter.StringFilter.MatchType.EXACT,
+    "begins_with": Filter.StringFilter.MatchType.BEGINS_WITH,
+    "ends_with": Filter.StringFilter.MatchType.ENDS_WITH,
+    "contains": Filter.StringFilter.MatchType.CONTAINS,
+    "regex": Filter.StringFilter.MatchType.FULL_REGEXP,
+    "partial_regex": Filter.StringFilter.MatchType.PARTIAL_REGEXP,
+}
+_NUMERIC_OPERATIONS = {
+    "==": Filter.NumericFilter.Operation.EQUAL,
+    "<": Filter.NumericFilter.Operation.LESS_THAN,
+    "<=": Filter.NumericFilter.Operation.LESS_THAN_OR_EQUAL,
+    ">": Filter.NumericFilter.Operation.GREATER_THAN,
+    ">=": Filter.NumericFilter.Operation.GREATER_THAN_OR_EQUAL,
+}
+
+# Article pages only: what PageAndScreenETL.apply_transformations keeps
+HTML_PAGES_FILTER = [("pagePath", "ends_with", ".html"), ("pagePath", "!=", "/")]
+
+
+def _numeric_value(value):
+    if isinstance(value, int):
+        return NumericValue(int64_value=value)
+    return NumericValue(double_value=float(value))
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _condition(field_name, operator, value):
+    if operator == "!=":
+        return FilterExpression(not_expression=_condition(field_name, "==", value))
+    if operator.startswith("not_"):
+        return FilterExpression(not_expression=_condition(field_name, operator[len("not_"):], value))
+    if operator == "in":
+        # Case-sensitive, like the pandas filters it replaces
+        field_filter = Filter(field_name=field_name, in_list_filter=Filter.InListFilter(
+            values=[str(v) for v in value], case_sensitive=True))
+    elif operator == "between":
+        low, high = value
+        field_filter = Filter(field_name=field_name, between_filter=Filter.BetweenFilter(
+            from_value=_numeric_value(low), to_value=_numeric_value(high)))
+    elif _is_number(value) and operator in _NUMERIC_OPERATIONS:
+        field_filter = Filter(field_name=field_name, numeric_filter=Filter.NumericFilter(
+            operation=_NUMERIC_OPERATIONS[operator], value=_numeric_value(value)))
+    elif operator in _STRING_MATCH_TYPES:
+        field_filter = Filter(field_name=field_name, string_filter=Filter.StringFilter(
+            match_type=_STRING_MATCH_TYPES[operator], value=str(value), case_sensitive=True))
+    else:
+        raise ValueError(f"Unsupported filter operator {operator!r} for {field_name!r} and {value!r}")
+    return FilterExpression(filter=field_filter)
+
+
+def filter_expression(conditions):
+    """
+    Builds a FilterExpression that keeps the rows matching all the conditions.
+    Args:
+        conditions (list of tuple): (field name, operator, value) conditions. The operators are
+            '==', '!=', '<', '<=', '>', '>=' (numeric when the value is a number),
+            'begins_with', 'ends_with', 'contains', 'regex', 'partial_regex' (case-sensitive strings),
+            'in' (a list of values) and 'between' (a (low, high) pair, inclusive).
+            Prefixing an operator with 'not_' negates it, e.g. 'not_contains'.
+            A FilterExpression is returned as is.
+    Returns:
+        FilterExpression, or None if there are no conditions.
+
+    Example:
+        filter_expression([("pagePath", "ends_with", ".html"), ("pagePath", "!=", "/")])
+        filter_expression([("screenPageViews", ">", 30)])
+    """
+    if conditions is None or isinstance(conditions, FilterExpression):
+        return conditions
+    expressions = [_condition(*condition) for condition in conditions]
+    if not expressions:
+        return None
+    if len(expressions) == 1:
+        return expressions[0]
+    return FilterExpression(and_group=FilterExpressionList(expressions=expressions))
+
+
+def order_bys(order_by, metrics):
+    """
+    Builds the OrderBy list of a query.
+    Args:
+        order_by (list of str): Field names, prefixed with '-' for a descending order.
+        metrics (list): Metric names of the query; the other fields are ordered as dimensions.
+    Returns:
+        list of OrderBy.
+
+    Example:
+        order_bys(["-screenPageViews", "pagePath"], metrics=["screenPageViews"])
+    """
+    result = []
+    for field in order_by or []:
+        desc = field.startswith("-")
+        name = field.lstrip("-")
+        if name in metrics:
+            result.append(OrderBy(metric=OrderBy.MetricOrderBy(metric_name=name), desc=desc))
+        else:
+            result.append(OrderBy(dimension=OrderBy.DimensionOrderBy(dimension_name=name), desc=desc))
+    return result
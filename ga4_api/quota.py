@@ -0,0 +1,188 @@
+import random
+import threading
+import time
+from contextlib import contextmanager
+from google.api_core.exceptions import (
+    Aborted, DeadlineExceeded, InternalServerError, ServiceUnavailable, TooManyRequests
+)
+
+# Transient errors: timeouts, server errors and exhausted short-term quotas
+# (TooManyRequests also covers ResourceExhausted)
+RETRYABLE_ERRORS = (DeadlineExceeded, ServiceUnavailable, InternalServerError, Aborted, TooManyRequests)
+
+QUOTA_FIELDS = (
+    "tokens_per_day", "tokens_per_hour", "concurrent_requests", "server_errors_per_project_per_hour",
+    "potentially_thresholded_requests_per_hour", "tokens_per_project_per_hour",
+)
+
+
+# Requests the hourly tokens left must still pay for, at the average cost, per request
+# kept in flight: concurrency shrinks as the hourly quota runs out
+REQUESTS_PER_CONCURRENT_SLOT = 10
+
+
+def backoff_delay(attempt, base_delay=1.0, max_delay=32.0):
+    """
+    Returns the seconds to wait before retry number `attempt` (from 0): a random
+    duration up to base_delay * 2 ** attempt, capped at max_delay ("full jitter"),
+    so concurrent retries do not hit the API again at the same time.
+    """
+    return random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+
+
+class QuotaTracker:
+    """
+    Tracks the GA4 property quota reported with the responses and paces the requests under it.
+
+    Requests are sent with `return_property_quota`, so each response carries the tokens it
+    consumed and the remaining tokens per hour and day, concurrent requests, etc. The tracker
+    keeps the latest remaining values and the consumption of the current run. `wait_time`
+    tells how long to hold a new request so the in-flight ones cannot exhaust the hourly tokens,
+    and `allowed_concurrency` how many requests may be in flight as the quota runs out.
+    Thread-safe.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._slot_freed = threading.Condition(self._lock)
+        self.remaining = {}
+        # Clock hour of the latest reading: the hourly tokens refill on the next one
+        self._remaining_hour = None
+        self.in_flight = 0
+        # Requests of ours in flight when the latest concurrent requests reading was taken
+        self._in_flight_at_reading = 0
+        # Tokens and responses since creation, for the average cost of a request
+        self._all_tokens = 0
+        self._all_responses = 0
+        self.reset()
+
+    def reset(self):
+        """Starts a new run: clears the consumption counters, keeps the last known remaining quota."""
+        with self._lock:
+            self.requests = 0
+            self.responses = 0
+            self.retries = 0
+            self.tokens_consumed = 0
+            self.wait_seconds = 0.0
+            self.peak_in_flight = self.in_flight
+
+    def _hourly_tokens(self):
+        """Returns the hourly tokens left, None if unknown or read in a past hour. Lock held."""
+        if self._remaining_hour != int(time.time() // 3600):
+            return None
+        return self.remaining.get("tokens_per_hour")
+
+    def _average_cost(self):
+        """Returns the average tokens consumed per response, at least 1. Lock held."""
+        return max(1.0, self._all_tokens / max(1, self._all_responses))
+
+    def _allowed_concurrency(self, maximum):
+        allowed = maximum
+        concurrent = self.remaining.get("concurrent_requests")
+        if concurrent is not None:
+            allowed = min(allowed, self._in_flight_at_reading + concurrent)
+        hourly = self._hourly_tokens()
+        if hourly is not None:
+            affordable = hourly / self._average_cost()
+            allowed = min(allowed, int(affordable // REQUESTS_PER_CONCURRENT_SLOT))
+        return max(1, allowed)
+
+    def allowed_concurrency(self, maximum):
+        """
+        Returns how many requests may be in flight, from 1 to `maximum`:
+        no more than the property's concurrent requests had room for at the latest reading,
+        and one per REQUESTS_PER_CONCURRENT_SLOT requests the hourly tokens left can pay for
+        at the average cost, so requests slow down as the hourly quota runs out.
+        """
+        with self._lock:
+            return self._allowed_concurrency(maximum)
+
+    def start_request(self, maximum=None, wait=True):
+        """
+        Counts a new request in flight. With `maximum`, the request first needs a free slot
+        among `allowed_concurrency(maximum)`: waits for one, or returns False if `wait` is
+        False and none is free. Returns True once the request is counted.
+        """
+        with self._slot_freed:
+            while maximum is not None and self.in_flight >= self._allowed_concurrency(maximum):
+                if not wait:
+                    return False
+                # A new hour also frees slots, hence the timeout
+                self._slot_freed.wait(timeout=1.0)
+            self.requests += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            return True
+
+    def end_request(self):
+        """Counts a request in flight as done and wakes the requests waiting for a slot."""
+        with self._slot_freed:
+            self.in_flight -= 1
+            self._slot_freed.notify_all()
+
+    @contextmanager
+    def request(self, maximum=None):
+        """Counts a request in flight for the duration of the block, see `start_request`."""
+        self.start_request(maximum)
+        try:
+            yield
+        finally:
+            self.end_request()
+
+    def record_response(self, response):
+        """Records the property quota of a RunReportResponse or of each report in a BatchRunReportsResponse."""
+        reports = response.reports if hasattr(response, "reports") else [response]
+        with self._lock:
+            for report in reports:
+                if "property_quota" not in report:
+                    continue
+                quota = report.property_quota
+                self.responses += 1
+                self.tokens_consumed += quota.tokens_per_hour.consumed
+                self._all_responses += 1
+                self._all_tokens += quota.tokens_per_hour.consumed
+                for field in QUOTA_FIELDS:
+                    if field in quota:
+                        self.remaining[field] = getattr(quota, field).remaining
+                self._remaining_hour = int(time.time() // 3600)
+                # The reading counted the request of the response, no longer in flight
+                self._in_flight_at_reading = self.in_flight + 1
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def record_wait(self, seconds):
+        with self._lock:
+            self.wait_seconds += seconds
+
+    def wait_time(self):
+        """
+        Returns the seconds to wait before sending a request, 0 if it can go now.
+        Once the hourly tokens left cannot cover the in-flight requests and a new one,
+        at the average cost seen so far, requests wait for the next hour.
+        """
+        with self._lock:
+            hourly = self._hourly_tokens()
+            if hourly is None:
+                return 0.0
+            average_cost = self._average_cost()
+            if hourly - self.in_flight * average_cost >= average_cost:
+                return 0.0
+        return 3600 - time.time() % 3600
+
+    def usage(self):
+        """
+        Returns the quota consumption of the current run: requests sent, retries,
+        tokens consumed, seconds spent waiting for quota, peak concurrent requests
+        and the latest remaining quota (`remaining_tokens_per_hour`, ...).
+        """
+        with self._lock:
+            usage = {
+                "requests": self.requests,
+                "retries": self.retries,
+                "tokens_consumed": self.tokens_consumed,
+                "wait_seconds": round(self.wait_seconds, 1),
+                "peak_concurrent_requests": self.peak_in_flight,
+            }
+            usage.update({f"remaining_{field}": value for field, value in self.remaining.items()})
+        return usage
@@ -0,0 +1,155 @@
+import hashlib
+import json
+import os
+import re
+import time
+from datetime import date, timedelta
+import pandas as pd
+from google.analytics.data_v1beta.types import RunReportRequest
+
+_DAYS_AGO = re.compile(r'^(\d+)daysAgo$')
+
+
+def resolve_date(value, today=None):
+    """
+    Returns the ISO date of a GA4 date: 'YYYY-MM-DD', 'today', 'yesterday' or 'NdaysAgo'.
+    """
+    today = today or date.today()
+    if value == "today":
+        return today.isoformat()
+    if value == "yesterday":
+        return (today - timedelta(days=1)).isoformat()
+    match = _DAYS_AGO.match(value)
+    if match:
+        return (today - timedelta(days=int(match.group(1)))).isoformat()
+    return value
+
+
+class Ga4ResponseCache:
+    """
+    On-disk cache of GA4 query results.
+
+    Each entry is a Parquet file named after the SHA-256 of the query: property,
+    dimensions, metrics, filters, ordering, limit and date ranges, with relative
+    dates ('yesterday', '7daysAgo') resolved to the day they were run.
+    GA4 keeps processing data for a few days, so an entry is immutable, and never
+    expires, only if it was fetched more than `immutable_after_days` days after the
+    end of its date range. Entries covering recent days expire after `ttl_seconds`.
+    An `index.json` in the cache directory records the entries.
+    """
+    INDEX_FILENAME = "index.json"
+
+    def __init__(self, cache_dir, immutable_after_days=3, ttl_seconds=6 * 3600):
+        """
+        Args:
+            cache_dir (str): Directory holding the Parquet files and the index.
+            immutable_after_days (int): Days after which the numbers of a date are final.
+            ttl_seconds (int): Lifetime of the entries whose date range is not final yet.
+        """
+        self.cache_dir = cache_dir
+        self.immutable_after_days = immutable_after_days
+        self.ttl_seconds = ttl_seconds
+        self.index_path = os.path.join(cache_dir, self.INDEX_FILENAME)
+        os.makedirs(cache_dir, exist_ok=True)
+        self.index = self._read_index()
+
+    def _read_index(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            index = {}
+        index.setdefault("entries", {})
+        return index
+
+    def _write_index(self):
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, indent=2)
+        os.replace(tmp_path, self.index_path)
+
+    def _query(self, request, today):
+        """Returns the request as a dict, with absolute dates and without the paging fields."""
+        query = RunReportRequest.to_dict(request)
+        query.pop("offset", None)
+        for date_range in query.get("date_ranges", []):
+            date_range["start_date"] = resolve_date(date_range["start_date"], today)
+            date_range["end_date"] = resolve_date(date_range["end_date"], today)
+        return query
+
+    def key_for(self, request):
+        """Returns the cache key of a RunReportRequest."""
+        query = self._query(request, date.today())
+        return hashlib.sha256(json.dumps(query, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.parquet")
+
+    def _is_fresh(self, entry):
+        return entry["immutable"] or time.time() - entry["created"] < self.ttl_seconds
+
+    def load(self, request):
+        """
+        Returns the cached DataFrame for the request, or None on a cache miss.
+        """
+        key = self.key_for(request)
+        entry = self.index["entries"].get(key)
+        entry_path = self._entry_path(key)
+        if entry is None or not os.path.exists(entry_path):
+            return None
+        if not self._is_fresh(entry):
+            self._remove(key)
+            self._write_index()
+            return None
+        try:
+            return pd.read_parquet(entry_path, engine='pyarrow')
+        except Exception as e:
+            print(f"Error reading cached GA4 data {entry_path}: {e}")
+            self._remove(key)
+            self._write_index()
+            return None
+
+    def store(self, request, df):
+        """
+        Stores the DataFrame returned for the request.
+        """
+        today = date.today()
+        query = self._query(request, today)
+        key = self.key_for(request)
+        entry_path = self._entry_path(key)
+        tmp_path = entry_path + ".tmp"
+        df.to_parquet(tmp_path, engine='pyarrow', index=False)
+        os.replace(tmp_path, entry_path)
+        last_date = max((r["end_date"] for r in query.get("date_ranges", [])), default=today.isoformat())
+        final_until = (today - timedelta(days=self.immutable_after_days)).isoformat()
+        self.index["entries"][key] = {
+            "property": query.get("property"),
+            "dimensions": [d["name"] for d in query.get("dimensions", [])],
+            "metrics": [m["name"] for m in query.get("metrics", [])],
+            "date_ranges": [[r["start_date"], r["end_date"]] for r in query.get("date_ranges", [])],
+            "immutable": last_date < final_until,
+            "created": time.time(),
+            "size": os.path.getsize(entry_path)
+        }
+        self._write_index()
+
+    def invalidate(self, expired_only=False):
+        """
+        Removes every entry, or only the expired ones.
+        Returns the number of entries removed.
+        """
+        keys = [
+            key for key, entry in self.index["entries"].items()
+            if not expired_only or not self._is_fresh(entry)
+        ]
+        for key in keys:
+            self._remove(key)
+        self._write_index()
+        return len(keys)
+
+    def _remove(self, key):
+        self.index["entries"].pop(key, None)
+        try:
+            os.remove(self._entry_path(key))
+        except FileNotFoundError:
+            pass
@@ -13,6 +13,10 @@ class BatchSearchRequestModel(BaseModel):
     pagepaths: list[str]
 
 
+class BatchDeleteRequestModel(BaseModel):
+    pagepaths: list[str]
+
+
 app = FastAPI()
 article_user = ArticleUser()
 
@@ -201,6 +205,21 @@ def upsert_articles(articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         return response_json_wrapper(processed_articles)
 
 
+@app.post("/articles/delete/batch")
+def delete_articles(payload: BatchDeleteRequestModel) -> Dict[str, Any]:
+    """Delete articles from a list of pagepaths.
+
+    :param payload: A list of pagepaths.
+    :type payload: BatchDeleteRequestModel
+
+    :return: The number of deleted articles.
+    :rtype: Dict[str, Any]
+    """
+    with get_session() as db:
+        deleted = article_user.delete_by_pagepaths(db, payload.pagepaths)
+        return {"deleted": deleted}
+
+
 @app.delete("/articles/{article_id}")
 def delete_article(article_id: int) -> Dict[str, Any]:
     """
@@ -1,6 +1,7 @@
 import re
 import xml.etree.ElementTree as ET
 from typing import Dict, List, Optional
+from td_data_toolkit.utils.xml_utils import YOAST_META_KEYS, read_wxr_item
 from models.Article import Article
 from sqlalchemy.orm import sessionmaker
 
@@ -15,11 +16,7 @@ def get_articles_from_xml(file_path: str) -> List[Dict[str, Optional[str]]]:
     root = tree.getroot()
     channel = root[0]
     articles = channel.findall("item")
-    
-    namespaces: Dict[str, str] = {
-        'content': "http://purl.org/rss/1.0/modules/content/",
-        'wp': 'http://wordpress.org/export/1.2/'
-    }
+    meta_keys = frozenset(YOAST_META_KEYS)
     taxidrivers_domain: str = 'https://www.taxidrivers.it'
 
     def _get_domain(link: str) -> str:
@@ -31,27 +28,6 @@ def get_articles_from_xml(file_path: str) -> List[Dict[str, Optional[str]]]:
         """
         return link.split(taxidrivers_domain)[1]
 
-    def _get_text_from_element(element: Optional[ET.Element]) -> Optional[str]:
-        """
-        Helper function to safely extract text from an XML element.
-
-        :param element: The XML element from which to extract text.
-        :returns: The text content of the element or None if not found.
-        """
-        return element.text if element is not None else None
-
-    def _get_yoast_meta_data(article: ET.Element, key: str, namespaces: Dict[str, str]) -> Optional[str]:
-        """
-        Extracts Yoast SEO meta information for a given key from the article.
-
-        :param article: The article element to extract meta information from.
-        :param key: The Yoast meta key to search for.
-        :param namespaces: The namespaces used for querying XML elements.
-        :returns: The meta value associated with the given key or None if not found.
-        """
-        meta = article.find(f'wp:postmeta/wp:meta_key[. = "{key}"]/../wp:meta_value', namespaces)
-        return _get_text_from_element(meta)
-    
     def _clean_html(html_path: str) -> str:
         if html_path.endswith('html'):
             return html_path
@@ -72,20 +48,22 @@ def get_articles_from_xml(file_path: str) -> List[Dict[str, Optional[str]]]:
         :param article: The XML element representing the article.
         :returns: A dictionary containing the extracted article information.
         """
-        title: Optional[str] = _get_text_from_element(article.find('title'))
-        link: Optional[str] = _get_text_from_element(article.find('link'))
-        pubdate: Optional[str] = _get_text_from_element(article.find('pubDate'))
-        category: Optional[str] = _get_text_from_element(article.find('category'))
-        publication_tags: str = ", ".join([tag.text for tag in article.findall('.//category[@domain="post_tag"]') if tag.text])
-        content: Optional[str] = _get_text_from_element(article.find('content:encoded', namespaces))
-        post_id: Optional[str] = _get_text_from_element(article.find('wp:post_id', namespaces))
-        post_views: Optional[str] = _get_yoast_meta_data(article, "post_views_count", namespaces)
-        yoast_focus_keyword: Optional[str] = _get_yoast_meta_data(article, "_yoast_wpseo_focuskw", namespaces)
-        yoast_metadesc: Optional[str] = _get_yoast_meta_data(article, "_yoast_wpseo_metadesc", namespaces)
-        yoast_seo_score: Optional[str] = _get_yoast_meta_data(article, "_yoast_wpseo_linkdex", namespaces)
-        yoast_content_readability_score: Optional[str] = _get_yoast_meta_data(article, "_yoast_wpseo_content_score", namespaces)
-        yoast_keyword_synonyms: Optional[str] = _get_yoast_meta_data(article, "_yoast_wpseo_keywordsynonyms", namespaces)
-        yoast_estimated_reading_time: Optional[str] = _get_yoast_meta_data(article, "_yoast_wpseo_estimated-reading-time-minutes", namespaces)
+        fields = read_wxr_item(article, meta_keys)
+        meta: Dict[str, Optional[str]] = fields['meta']
+        title: Optional[str] = fields['title']
+        link: Optional[str] = fields['link']
+        pubdate: Optional[str] = fields['pubdate']
+        category: Optional[str] = fields['categories'][0][1] if fields['categories'] else None
+        publication_tags: str = ", ".join([text for domain, text in fields['categories'] if domain == "post_tag" and text])
+        content: Optional[str] = fields['content']
+        post_id: Optional[str] = fields['post_id']
+        post_views: Optional[str] = meta.get("post_views_count")
+        yoast_focus_keyword: Optional[str] = meta.get("_yoast_wpseo_focuskw")
+        yoast_metadesc: Optional[str] = meta.get("_yoast_wpseo_metadesc")
+        yoast_seo_score: Optional[str] = meta.get("_yoast_wpseo_linkdex")
+        yoast_content_readability_score: Optional[str] = meta.get("_yoast_wpseo_content_score")
+        yoast_keyword_synonyms: Optional[str] = meta.get("_yoast_wpseo_keywordsynonyms")
+        yoast_estimated_reading_time: Optional[str] = meta.get("_yoast_wpseo_estimated-reading-time-minutes")
 
         if yoast_keyword_synonyms:
             yoast_keyword_synonyms = yoast_keyword_synonyms.replace('[', '').replace(']', '').replace('"', '')
@@ -114,3 +114,20 @@ class ArticleUser:
         db.delete(db_article)
         db.commit()
         return True
+
+    def delete_by_pagepaths(self, db: Session, pagepaths: List[str]) -> int:
+        """
+        Delete multiple articles by their page paths.
+
+        :param db: The database session.
+        :type db: Session
+        :param pagepaths: A list of page paths of the articles to delete.
+        :type pagepaths: List[str]
+        :return: The number of deleted articles.
+        :rtype: int
+        """
+        db_articles = self.get_by_pagepaths(db, pagepaths)
+        for db_article in db_articles:
+            db.delete(db_article)
+        db.commit()
+        return len(db_articles)
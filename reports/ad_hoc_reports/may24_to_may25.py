@@ -102,6 +102,7 @@ def run_report_etl_and_analysis():
             "may24_may25_taxidriversit.WordPress.2025-06-04.xml",
         ),
         "WP_FILE_TYPE": "xml",
+        "WP_CACHE_DIR": os.path.join(project_root_from_script, "data", "wp_cache"),
         "OUTPUT_FILE_PATH": os.path.join(
             project_root_from_script, "output", "may24_may25_articles.csv"
         ),
@@ -137,6 +138,8 @@ def run_report_etl_and_analysis():
             "average engagement time per active user": "average_engagement_time_per_active_user",
         },
         # METRICS_TO_BUCKET_MAP will be derived by the Transformer based on METRICS_FOR_BENCHMARK
+        # Keep the content column without copying the merged data at every step
+        "COPY_FREE": True,
     }
 
     try:
@@ -147,6 +150,10 @@ def run_report_etl_and_analysis():
             sys.path.append(project_root_from_script)
             print(f"Added to sys.path: {project_root_from_script}")  # For debugging
         from etl.from_wp_ga4_to_report.etl import EtlPipeline
+        from etl.from_wp_ga4_to_report.memory_tracker import print_stage_memory
+
+        # Print the memory used by each transformation stage
+        etl_pipeline_config["MEMORY_HOOK"] = print_stage_memory
 
         print("Running ETL Pipeline for Report...")
         etl_process = EtlPipeline(config=etl_pipeline_config)
@@ -5,11 +5,11 @@ sys.path.append(os.path.join(os.path.abspath(__file__), "..", ".."))  # Adjust p
 sys.path.append(os.path.join(os.path.abspath(__file__), ".."))  # Adjust path as needed
 import pandas as pd
 from datetime import datetime, timedelta
-from ga4_api.ga4_api import Ga4Client
+from ga4_api.ga4_api import HTML_PAGES_FILTER, Ga4Client
 from etl.page_and_screen_etl import PageAndScreenETLFactory
 from map_ga4_categories import map_ga4_categories
 from td_data_toolkit.article_analytics.metadata import get_article_metadata
-from config import OUTPUT_DIR, WEEKLY_OUTPUT_DIR
+from config import GA4_CACHE_DIR, OUTPUT_DIR, WEEKLY_OUTPUT_DIR
 
 # Configurazione
 PROPERTY_ID = '394327334'
@@ -52,16 +52,21 @@ def main():
 
     # Inizializza il client GA4
     print("Inizializzazione client GA4...")
-    ga4 = Ga4Client()
+    ga4 = Ga4Client(cache_dir=GA4_CACHE_DIR)
     print("Recupero dati da Google Analytics...")
+    # Solo articoli (.html, no homepage), già ordinati e limitati alla top N da GA4
     df = ga4.run_query(
         property_id=PROPERTY_ID,
         dimensions=DIMENSIONS,
         metrics=METRICS,
         start_date=str(start_date),
-        end_date=str(end_date)
+        end_date=str(end_date),
+        dimension_filter=HTML_PAGES_FILTER,
+        order_by=[f"-{METRICS[0]}"],
+        limit=N_TOP
     )
     print(f"Dati recuperati: {len(df)} righe")
+    print(f"Quota GA4 consumata: {ga4.quota.usage()}")
 
     # Pulisci i dati usando il modulo OOP ETL
     print("Pulizia dati: rimozione homepage e path non .html...")
@@ -102,6 +102,7 @@ def run_report_etl_and_analysis():
             "YTD_21 maggio 2025_taxidriversit.WordPress.2025-05-21.xml",
         ),
         "WP_FILE_TYPE": "xml",
+        "WP_CACHE_DIR": os.path.join(project_root_from_script, "data", "wp_cache"),
         "OUTPUT_FILE_PATH": os.path.join(
             project_root_from_script, "output", "ytd_report_21052025.csv"
         ),
@@ -8,13 +8,14 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from config import (
+    GA4_CACHE_DIR,
     MONTHLY_OUTPUT_DIR,
     MONTHLY_PARAMETERS_MONTH,
     MONTHLY_REPORT_METRICS
 )
 
 from etl.page_and_screen_etl import PageAndScreenETLFactory
-from ga4_api.ga4_api import Ga4Client
+from ga4_api.ga4_api import HTML_PAGES_FILTER, Ga4Client
 from map_ga4_categories import map_ga4_categories
 from bs4 import BeautifulSoup
 from datetime import datetime
@@ -49,10 +50,12 @@ def contains_si_fara(path: str) -> bool:
 
 
 def get_ga4_data_api(
-    ga4_client, property_id, dimensions, metrics, start_date, end_date
+    ga4_client, property_id, dimensions, metrics, start_date, end_date,
+    dimension_filter=None, metric_filter=None,
 ):
     """
     Load GA4 data directly from the Google Analytics API using a Ga4Client instance.
+    The optional filters are applied by GA4 (see ga4_api.query_filters).
     """
     df = ga4_client.run_query(
         property_id=property_id,
@@ -60,6 +63,8 @@ def get_ga4_data_api(
         metrics=metrics,
         start_date=start_date,
         end_date=end_date,
+        dimension_filter=dimension_filter,
+        metric_filter=metric_filter,
     )
     etl = PageAndScreenETLFactory.get_etl("en", df=df)
     df = etl.run_etl()
@@ -73,7 +78,8 @@ def get_ga4_data(source="local", **kwargs):
         source (str): 'local' or 'api'.
         kwargs: arguments for the chosen source.
             For 'local': input_filename
-            For 'api': ga4_client, property_id, dimensions, metrics, start_date, end_date
+            For 'api': ga4_client, property_id, dimensions, metrics, start_date, end_date,
+                       and optionally dimension_filter, metric_filter
     Returns:
         pd.DataFrame
     """
@@ -85,6 +91,8 @@ def get_ga4_data(source="local", **kwargs):
             kwargs["metrics"],
             kwargs["start_date"],
             kwargs["end_date"],
+            kwargs.get("dimension_filter"),
+            kwargs.get("metric_filter"),
         )
     else:
         raise ValueError(f"Unknown GA4 data source: {source}")
@@ -203,6 +211,9 @@ def run_monthly_report(
     """
     if data_args is None:
         data_args = {}
+    if data_args.get("ga4_client") is not None:
+        # The quota usage printed after the report is this run's only
+        data_args["ga4_client"].quota.reset()
     df = get_ga4_data(**data_args)
     print("Number of articles that have generated views:", df.shape[0])
     print("Number of recent articles:", df.shape[0])
@@ -275,7 +286,7 @@ def run_monthly_report(
 
 if __name__ == "__main__":
     month = "August"
-    ga4_client = Ga4Client()
+    ga4_client = Ga4Client(cache_dir=GA4_CACHE_DIR)
     monthly_output = run_monthly_report(
         data_args={
             "source": "api",
@@ -285,6 +296,7 @@ if __name__ == "__main__":
             "metrics": ["activeUsers", "screenPageViews", 'engagementRate', 'bounceRate', 'averageSessionDuration'],
             "start_date": months_data_range[MONTHLY_PARAMETERS_MONTH][0],
             "end_date": months_data_range[MONTHLY_PARAMETERS_MONTH][1],
+            "dimension_filter": HTML_PAGES_FILTER,
         },
         domain="https://taxidrivers.it",
         max_workers=8,
@@ -292,3 +304,4 @@ if __name__ == "__main__":
             MONTHLY_OUTPUT_DIR, f"top_articles_{MONTHLY_PARAMETERS_MONTH}.xlsx"
         ),
     )
+    print(f"GA4 quota usage: {ga4_client.quota.usage()}")
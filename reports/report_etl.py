@@ -78,6 +78,7 @@ def run_report_etl_and_analysis(top_only: bool = False, report_prefix: str = "")
         "GA4_FILE_PATH": os.path.join(project_root_from_script, "data", "010525_300525_Pagine_e_schermate_Percorso_pagina_e_classe_schermata.csv"),
         "WP_FILE_PATH": os.path.join(project_root_from_script, "data", "taxidriversit.WordPress.2025-05-30.xml"),
         "WP_FILE_TYPE": "xml",
+        "WP_CACHE_DIR": os.path.join(project_root_from_script, "data", "wp_cache"),
         "OUTPUT_FILE_PATH": os.path.join(project_root_from_script, "output", "processed_data_for_report.csv"),
         "COLUMNS_TO_KEEP": [
             "title", "link", "category", "pagepath", "pubdate", "views",
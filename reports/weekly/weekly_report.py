@@ -18,6 +18,7 @@ from map_ga4_categories import map_ga4_categories
 from scrape_content.ArticleScraper import ArticleScraper
 
 from config import (
+    GA4_CACHE_DIR,
     WEEKLY_OUTPUT_DIR,
     WEEKLY_REPORT_OUTPUT_FILENAME,
     WEEKLY_REPORT_METRICS,
@@ -38,10 +39,12 @@ def contains_si_fara(path: str) -> bool:
 
 
 def get_ga4_data_api(
-    ga4_client, property_id, dimensions, metrics, start_date, end_date
+    ga4_client, property_id, dimensions, metrics, start_date, end_date,
+    dimension_filter=None, metric_filter=None,
 ):
     """
     Load GA4 data directly from the Google Analytics API using a Ga4Client instance.
+    The optional filters are applied by GA4 (see ga4_api.query_filters).
     """
     df = ga4_client.run_query(
         property_id=property_id,
@@ -49,6 +52,8 @@ def get_ga4_data_api(
         metrics=metrics,
         start_date=start_date,
         end_date=end_date,
+        dimension_filter=dimension_filter,
+        metric_filter=metric_filter,
     )
     etl = PageAndScreenETLFactory.get_etl("en", df=df)
     df = etl.run_etl()
@@ -62,7 +67,8 @@ def get_ga4_data(source="local", **kwargs):
         source (str): 'local' or 'api'.
         kwargs: arguments for the chosen source.
             For 'local': input_filename
-            For 'api': ga4_client, property_id, dimensions, metrics, start_date, end_date
+            For 'api': ga4_client, property_id, dimensions, metrics, start_date, end_date,
+                       and optionally dimension_filter, metric_filter
     Returns:
         pd.DataFrame
     """
@@ -74,6 +80,8 @@ def get_ga4_data(source="local", **kwargs):
             kwargs["metrics"],
             kwargs["start_date"],
             kwargs["end_date"],
+            kwargs.get("dimension_filter"),
+            kwargs.get("metric_filter"),
         )
     else:
         raise ValueError(f"Unknown GA4 data source: {source}")
@@ -215,6 +223,9 @@ def run_weekly_report(
     """
     if data_args is None:
         data_args = {}
+    if data_args.get("ga4_client") is not None:
+        # The quota usage printed after the report is this run's only
+        data_args["ga4_client"].quota.reset()
     df = get_ga4_data(**data_args)
     df["Categoria"] = df["pagePath"].apply(map_categories_func)
     # Map si farà articles directly in Categoria
@@ -275,9 +286,9 @@ if __name__ == "__main__":
         os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
     )
 
-    from ga4_api.ga4_api import Ga4Client
+    from ga4_api.ga4_api import HTML_PAGES_FILTER, Ga4Client
 
-    ga4_client = Ga4Client()
+    ga4_client = Ga4Client(cache_dir=GA4_CACHE_DIR)
     weekly_output = run_weekly_report(
         data_args={
             "source": "api",
@@ -287,6 +298,8 @@ if __name__ == "__main__":
             "metrics": WEEKLY_REPORT_METRICS,
             "start_date": WEEKLY_REPORT_DATA_RANGE[0],
             "end_date": WEEKLY_REPORT_DATA_RANGE[1],
+            "dimension_filter": HTML_PAGES_FILTER,
+            "metric_filter": [("screenPageViews", ">", 30)],
         },
         domain="https://taxidrivers.it",
         n=10,
@@ -302,3 +315,4 @@ if __name__ == "__main__":
         use_template=False,
         sort_by_metric="screenPageViews",
     )
+    print(f"GA4 quota usage: {ga4_client.quota.usage()}")
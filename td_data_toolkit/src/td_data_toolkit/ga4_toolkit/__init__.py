@@ -1,7 +1,12 @@
 from .properties_toolkit import translate_dataframe_columns, remove_home_page
+from .export_reader import GA4_EXPORT_DTYPES, read_ga4_preamble, read_ga4_export, iter_ga4_export
 
 
 __all__ = [
     "translate_dataframe_columns",
-    "remove_home_page"
-]
\ No newline at end of file
+    "remove_home_page",
+    "GA4_EXPORT_DTYPES",
+    "read_ga4_preamble",
+    "read_ga4_export",
+    "iter_ga4_export"
+]
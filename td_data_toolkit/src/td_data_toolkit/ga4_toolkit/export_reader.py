@@ -0,0 +1,253 @@
+import csv
+from datetime import datetime
+from typing import Any, Dict, IO, Iterable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # pyarrow is optional, pandas' C parser is used without it
+    pa = None
+    pa_csv = None
+
+# Declared types of the GA4 export columns (Italian and English UI), so metrics are
+# parsed straight into numbers instead of being inferred and converted later.
+GA4_EXPORT_DTYPES: Dict[str, str] = {
+    # Italian
+    'Data': 'str',
+    'Visualizzazioni': 'int64',
+    'Utenti attivi': 'int64',
+    'Nuovi utenti': 'int64',
+    'Utenti totali': 'int64',
+    'Sessioni': 'int64',
+    'Sessioni con coinvolgimento': 'int64',
+    'Visualizzazioni per utente attivo': 'float64',
+    'Durata media del coinvolgimento per utente attivo': 'float64',
+    'Tempo di coinvolgimento medio per utente attivo': 'float64',
+    'Tasso di coinvolgimento': 'float64',
+    'Frequenza di rimbalzo': 'float64',
+    'Conteggio eventi': 'int64',
+    'Eventi chiave': 'float64',
+    'Entrate totali': 'float64',
+    # English
+    'Date': 'str',
+    'Views': 'int64',
+    'Active users': 'int64',
+    'New users': 'int64',
+    'Total users': 'int64',
+    'Sessions': 'int64',
+    'Engaged sessions': 'int64',
+    'Views per active user': 'float64',
+    'Average engagement time per active user': 'float64',
+    'Engagement rate': 'float64',
+    'Bounce rate': 'float64',
+    'Event count': 'int64',
+    'Key events': 'float64',
+    'Total revenue': 'float64',
+}
+
+# Preamble keys (Italian and English UI) and the metadata field they fill.
+_PREAMBLE_KEYS: Dict[str, str] = {
+    'account': 'account',
+    'proprietà': 'property',
+    'property': 'property',
+    'data di inizio': 'start_date',
+    'start date': 'start_date',
+    'data di fine': 'end_date',
+    'end date': 'end_date',
+}
+
+_ARROW_TYPES = {'int64': 'int64', 'float64': 'float64', 'str': 'string'}
+
+
+def _parse_preamble(lines: Iterable[str]) -> Dict[str, Any]:
+    metadata: Dict[str, Any] = {
+        'report_name': None, 'account': None, 'property': None,
+        'start_date': None, 'end_date': None, 'fields': {}
+    }
+    for line in lines:
+        text = line.lstrip('#').strip()
+        if not text or set(text) == {'-'}:
+            continue
+        key, sep, value = text.partition(':')
+        field = _PREAMBLE_KEYS.get(key.strip().lower()) if sep else None
+        if field is None:
+            # The first free line is the report title, e.g. "Pagine e schermate: Percorso pagina..."
+            if metadata['report_name'] is None:
+                metadata['report_name'] = text
+            elif sep:
+                metadata['fields'][key.strip()] = value.strip()
+            continue
+        value = value.strip()
+        if field in ('start_date', 'end_date'):
+            try:
+                value = datetime.strptime(value, '%Y%m%d').date()
+            except ValueError:
+                pass
+        metadata[field] = value
+        metadata['fields'][key.strip()] = value
+    return metadata
+
+
+def _read_head(file_path: str) -> Tuple[Dict[str, Any], int, List[str]]:
+    """Returns the preamble metadata, the byte offset of the header row and the column names."""
+    offset = 0
+    preamble = []
+    with open(file_path, 'rb') as f:
+        for raw in f:
+            if not raw.lstrip(b'\xef\xbb\xbf').startswith(b'#'):
+                header = raw
+                break
+            preamble.append(raw.decode('utf-8-sig'))
+            offset += len(raw)
+        else:
+            header = b''
+    columns = next(csv.reader([header.decode('utf-8-sig')]), [])
+    metadata = _parse_preamble(preamble)
+    metadata['columns'] = columns
+    return metadata, offset, columns
+
+
+def read_ga4_preamble(file_path: str) -> Dict[str, Any]:
+    """
+    Parses the ``#`` comment preamble of a GA4 CSV export.
+
+    :param file_path: Path to the GA4 CSV export.
+    :type file_path: str
+    :return: The ``report_name``, ``account``, ``property``, ``start_date`` and ``end_date``
+        (as ``datetime.date``) of the export, None when missing, every ``key: value``
+        line of the preamble in ``fields`` and the names of the CSV ``columns``.
+    :rtype: dict
+
+    **Example**::
+
+        read_ga4_preamble("Pagine_e_schermate.csv")
+        # Output: {'report_name': 'Pagine e schermate: Percorso pagina e classe schermata',
+        #          'account': 'Taxidrivers', 'property': 'Taxidrivers - GA4',
+        #          'start_date': datetime.date(2025, 1, 1), 'end_date': datetime.date(2025, 12, 31), ...}
+    """
+    return _read_head(file_path)[0]
+
+
+def _selection(header: List[str], columns: Optional[Iterable[str]],
+               dtypes: Optional[Dict[str, str]], int_as_float: bool = False) -> Tuple[Optional[List[str]], Dict[str, str]]:
+    if columns is not None:
+        columns = set(columns)
+    selected = None if columns is None else [c for c in header if c in columns]
+    declared = GA4_EXPORT_DTYPES if dtypes is None else dtypes
+    types = {c: declared[c] for c in (selected if selected is not None else header) if c in declared}
+    if int_as_float:
+        types = {c: 'float64' if t == 'int64' else t for c, t in types.items()}
+    return selected, types
+
+
+def _arrow_options(selected, types, block_size=None):
+    read_options = pa_csv.ReadOptions(block_size=block_size) if block_size else pa_csv.ReadOptions()
+    # Empty and NA-like strings become missing values, as with pandas
+    convert_options = pa_csv.ConvertOptions(
+        column_types={c: _ARROW_TYPES[t] for c, t in types.items()},
+        include_columns=selected, strings_can_be_null=True
+    )
+    return read_options, convert_options
+
+
+def _open_body(file_path: str, offset: int) -> IO[bytes]:
+    f = open(file_path, 'rb')
+    f.seek(offset)
+    return f
+
+
+def _read_typed(file_path: str, offset: int, selected, types) -> pd.DataFrame:
+    with _open_body(file_path, offset) as f:
+        if pa_csv is not None:
+            read_options, convert_options = _arrow_options(selected, types)
+            table = pa_csv.read_csv(f, read_options=read_options, convert_options=convert_options)
+            # Arrow buffers are released as they are converted
+            return table.to_pandas(split_blocks=True, self_destruct=True)
+        return pd.read_csv(f, usecols=selected, dtype=types)
+
+
+def read_ga4_export(file_path: str, columns: Optional[Iterable[str]] = None,
+                    dtypes: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    """
+    Reads a GA4 CSV export with typed metric columns.
+
+    The ``#`` preamble is skipped whatever its length and parsed into ``df.attrs['ga4_metadata']``
+    (see :func:`read_ga4_preamble`). Columns listed in the dtype map are parsed straight into
+    ``int64``/``float64``; integer metrics fall back to ``float64`` if they have missing values.
+    Uses pyarrow's multithreaded CSV reader when it is installed.
+
+    :param file_path: Path to the GA4 CSV export.
+    :type file_path: str
+    :param columns: Columns to read, the others are skipped. Names absent from the export are ignored. All if None.
+    :type columns: Iterable[str] | None
+    :param dtypes: Column types, defaults to ``GA4_EXPORT_DTYPES``.
+    :type dtypes: dict[str, str] | None
+    :return: The export's rows.
+    :rtype: pd.DataFrame
+
+    **Example**::
+
+        df = read_ga4_export("Pagine_e_schermate.csv", columns=["Percorso pagina e classe schermata", "Visualizzazioni"])
+        df.attrs["ga4_metadata"]["start_date"]
+        # Output: datetime.date(2025, 1, 1)
+    """
+    metadata, offset, header = _read_head(file_path)
+    selected, types = _selection(header, columns, dtypes)
+    try:
+        df = _read_typed(file_path, offset, selected, types)
+    except ValueError:
+        # Missing values in an integer metric
+        selected, types = _selection(header, columns, dtypes, int_as_float=True)
+        df = _read_typed(file_path, offset, selected, types)
+    df.attrs['ga4_metadata'] = metadata
+    return df
+
+
+def _iter_arrow_chunks(f: IO[bytes], selected, types, chunksize: int) -> Iterator[pd.DataFrame]:
+    read_options, convert_options = _arrow_options(selected, types, block_size=1 << 22)
+    reader = pa_csv.open_csv(f, read_options=read_options, convert_options=convert_options)
+    pending: List[Any] = []
+    n_pending = 0
+    for batch in reader:
+        pending.append(batch)
+        n_pending += batch.num_rows
+        while n_pending >= chunksize:
+            table = pa.Table.from_batches(pending, schema=reader.schema)
+            yield table.slice(0, chunksize).to_pandas()
+            rest = table.slice(chunksize)
+            pending, n_pending = rest.to_batches(), rest.num_rows
+    if n_pending:
+        yield pa.Table.from_batches(pending, schema=reader.schema).to_pandas()
+
+
+def iter_ga4_export(file_path: str, chunksize: int = 100_000, columns: Optional[Iterable[str]] = None,
+                    dtypes: Optional[Dict[str, str]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Reads a GA4 CSV export in chunks of rows, with the same typing as :func:`read_ga4_export`.
+
+    Only one chunk is held in memory at a time, e.g. to filter a large export while reading it.
+    Integer metrics are read as ``float64`` here, as a missing value may only show up in a later chunk.
+
+    :param file_path: Path to the GA4 CSV export.
+    :type file_path: str
+    :param chunksize: Number of rows per chunk.
+    :type chunksize: int
+    :param columns: Columns to read, the others are skipped. All if None.
+    :type columns: Iterable[str] | None
+    :param dtypes: Column types, defaults to ``GA4_EXPORT_DTYPES``.
+    :type dtypes: dict[str, str] | None
+    :return: An iterator of DataFrames, each with the preamble in ``attrs['ga4_metadata']``.
+    :rtype: Iterator[pd.DataFrame]
+    """
+    metadata, offset, header = _read_head(file_path)
+    selected, types = _selection(header, columns, dtypes, int_as_float=True)
+    with _open_body(file_path, offset) as f:
+        if pa_csv is not None:
+            chunks = _iter_arrow_chunks(f, selected, types, chunksize)
+        else:
+            chunks = pd.read_csv(f, usecols=selected, dtype=types, chunksize=chunksize)
+        for chunk in chunks:
+            chunk.attrs['ga4_metadata'] = metadata
+            yield chunk
@@ -1,8 +1,13 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 import requests
-from ..utils.xml_utils import get_articles_from_xml
+from ..utils.xml_utils import WxrContentReader, get_articles_from_xml
+from ..utils.ingest_manifest import diff_articles, load_manifest, save_manifest
 import urllib.parse
 
+# Share of the previous ingest's posts that one incremental ingest may delete. A filtered
+# (partial) export leaves out far more posts than a day of real deletions.
+MAX_DELETE_SHARE = 0.05
+
 
 class TDArticleClient:
     def __init__(self, base_url="http://localhost:8000"):
@@ -57,6 +62,24 @@ class TDArticleClient:
         response = requests.post(f"{self.base_url}/articles/search/batch", json={"pagepaths": pagepaths})
         return response
     
+    def delete_articles_by_pagepaths(self, pagepaths: List[str]):
+        """
+        Delete a list of articles by their pagepaths.
+
+        :param pagepaths: List of pagepaths of the articles to delete.
+        :type pagepaths: List[str]
+        :return: The HTTP response from the API.
+        :rtype: requests.models.Response
+
+        **Example**::
+
+            client = TDArticleClient(base_url="http://localhost:8000")
+            response = client.delete_articles_by_pagepaths(["/old-post.html"])
+            print(response.json())  # Output: {"deleted": 1}
+        """
+        response = requests.post(f"{self.base_url}/articles/delete/batch", json={"pagepaths": pagepaths})
+        return response
+
     def get_by_pagepath(self, pagepath: str):
         """
         Add documentation
@@ -69,12 +92,24 @@ class TDArticleClient:
 class WpArticleClient(TDArticleClient):
     """TDArticleClient to perform CRUD operations on WordPress data."""
 
-    def add_wordpress_articles_from_file(self, file_path: str) -> Dict[str, Any]:
+    def add_wordpress_articles_from_file(self, file_path: str, manifest_path: Optional[str] = None,
+                                         max_delete_share: float = MAX_DELETE_SHARE) -> Dict[str, Any]:
         """
         Add WordPress articles from a local file path.
 
         :param file_path: The path pointing to the local XML file exported from WordPress.
         :type file_path: str
+        :param manifest_path: Optional path to the JSON manifest of the previous ingest. When given,
+            only new and changed articles are upserted, articles no longer in the export are deleted,
+            and the manifest is updated once the API calls succeed. The export is then parsed with
+            ``lazy_content=True``: post bodies are fingerprinted from their raw bytes, and only those
+            of the upserted articles are decoded.
+        :type manifest_path: Optional[str]
+        :param max_delete_share: Largest share of the manifest's posts that may be deleted. When the
+            export misses more of them, it is taken for a partial (date or category filtered) export:
+            nothing is upserted or deleted and the manifest is left as is. Pass 1.0 after a real
+            mass deletion.
+        :type max_delete_share: float
         :return: A dictionary containing the operation status, message, and metadata.
         :rtype: Dict[str, Any]
 
@@ -82,14 +117,14 @@ class WpArticleClient(TDArticleClient):
 
             file_path = "wp_articles.xml"
             client = WpArticleClient(base_url="http://localhost:8000")
-            result = client.add_wordpress_articles_from_file(file_path)
+            result = client.add_wordpress_articles_from_file(file_path, manifest_path="wp_manifest.json")
             print(result["status"])  # Output: 'success'
             print(result["articles_imported"])  # Output: Number of articles imported
 
         **Notes**:
         - The method assumes that the XML file contains a valid structure and that the function `get_articles_from_xml(file_path)` can parse it into a list of articles.
         """
-        wp_articles: List[dict] = get_articles_from_xml(file_path)
+        wp_articles: List[dict] = get_articles_from_xml(file_path, lazy_content=manifest_path is not None)
         wp_articles = [article for article in wp_articles if article.get("title")]  # Only keep articles with a title
 
         if not wp_articles:
@@ -99,12 +134,61 @@ class WpArticleClient(TDArticleClient):
                 "file_path": file_path,
                 "articles_imported": 0
             }
-        print("Upserting articles")
-        self.upsert_articles(wp_articles)
+
+        if manifest_path is None:
+            print("Upserting articles")
+            self.upsert_articles(wp_articles)
+
+            return {
+                "status": "success",
+                "message": "Articles successfully imported and updated.",
+                "file_path": file_path,
+                "articles_imported": len(wp_articles)
+            }
+
+        previous_manifest = load_manifest(manifest_path)
+        with WxrContentReader(file_path) as reader:
+            diff = diff_articles(wp_articles, previous_manifest, content_reader=reader)
+            to_upsert = reader.with_content(diff["new"] + diff["changed"])
+        if len(diff["deleted"]) > max_delete_share * len(previous_manifest):
+            return {
+                "status": "error",
+                "message": f"The export misses {len(diff['deleted'])} of the {len(previous_manifest)} articles "
+                           f"of the manifest, more than max_delete_share={max_delete_share}: it looks like a "
+                           f"partial export. Nothing imported or deleted, manifest not updated.",
+                "file_path": file_path,
+                "articles_imported": 0
+            }
+        print(f"Upserting {len(diff['new'])} new and {len(diff['changed'])} changed articles, "
+              f"deleting {len(diff['deleted'])}, skipping {diff['unchanged']} unchanged")
+
+        if to_upsert:
+            response = self.upsert_articles(to_upsert)
+            if not response.ok:
+                return {
+                    "status": "error",
+                    "message": f"Upsert failed with status {response.status_code}. Manifest not updated.",
+                    "file_path": file_path,
+                    "articles_imported": 0
+                }
+        if diff["deleted"]:
+            response = self.delete_articles_by_pagepaths(diff["deleted"])
+            if not response.ok:
+                return {
+                    "status": "error",
+                    "message": f"Delete failed with status {response.status_code}. Manifest not updated.",
+                    "file_path": file_path,
+                    "articles_imported": len(to_upsert)
+                }
+        save_manifest(manifest_path, diff["manifest"])
 
         return {
             "status": "success",
-            "message": "Articles successfully imported and updated.",
+            "message": "Changed articles successfully imported and updated.",
             "file_path": file_path,
-            "articles_imported": len(wp_articles)
+            "articles_imported": len(to_upsert),
+            "articles_new": len(diff["new"]),
+            "articles_changed": len(diff["changed"]),
+            "articles_deleted": len(diff["deleted"]),
+            "articles_unchanged": diff["unchanged"]
         }
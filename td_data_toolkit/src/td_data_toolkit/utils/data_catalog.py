@@ -0,0 +1,226 @@
+import hashlib
+import json
+import os
+import re
+from datetime import date
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Optional, Union
+
+from td_data_toolkit.ga4_toolkit.export_reader import read_ga4_preamble
+
+# Kinds of files recorded in the catalog.
+GA4_PAGE_SCREEN = "ga4_page_screen"
+GA4_REPORT = "ga4"
+WXR = "wxr"
+
+# Page path column of the page-and-screen report (Italian and English UI).
+_GA4_PAGE_SCREEN_COLUMNS = frozenset(('Percorso pagina e classe schermata', 'Page path and screen class'))
+_HASH_CHUNK_SIZE = 1 << 20
+# A WXR header (namespaces, channel title, authors, terms) fits well within this.
+_WXR_HEAD_SIZE = 1 << 16
+_WXR_NAMESPACE = b'http://wordpress.org/export/'
+_WXR_CHANNEL_PUBDATE = re.compile(rb'<pubDate>([^<]+)</pubDate>')
+_FILENAME_DATE = re.compile(r'(\d{4})-(\d{2})-(\d{2})')
+
+DateLike = Union[str, date, None]
+
+
+def _to_date(value: DateLike) -> Optional[date]:
+    if value is None or isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _describe_ga4(path: str) -> Optional[Dict[str, Any]]:
+    with open(path, 'rb') as f:
+        if not f.read(3).lstrip(b'\xef\xbb\xbf').startswith(b'#'):
+            return None
+    metadata = read_ga4_preamble(path)
+    kind = GA4_PAGE_SCREEN if _GA4_PAGE_SCREEN_COLUMNS.intersection(metadata['columns']) else GA4_REPORT
+    start, end = metadata['start_date'], metadata['end_date']
+    return {
+        "kind": kind,
+        "start_date": start.isoformat() if isinstance(start, date) else None,
+        "end_date": end.isoformat() if isinstance(end, date) else None,
+        "name": metadata['report_name'],
+    }
+
+
+def _describe_wxr(path: str) -> Optional[Dict[str, Any]]:
+    with open(path, 'rb') as f:
+        head = f.read(_WXR_HEAD_SIZE)
+    if _WXR_NAMESPACE not in head:
+        return None
+    # The channel's <pubDate> is the export date; it comes before the first <item>
+    channel_head = head.split(b'<item>', 1)[0]
+    export_date = None
+    match = _WXR_CHANNEL_PUBDATE.search(channel_head)
+    if match:
+        try:
+            export_date = parsedate_to_datetime(match.group(1).decode('utf-8')).date()
+        except (TypeError, ValueError):
+            pass
+    if export_date is None:
+        # e.g. taxidriversit.WordPress.2025-04-14.xml
+        name_match = _FILENAME_DATE.search(os.path.basename(path))
+        if name_match:
+            export_date = date(*map(int, name_match.groups()))
+    # An export holds every post published up to its date
+    return {
+        "kind": WXR,
+        "start_date": None,
+        "end_date": export_date.isoformat() if export_date else None,
+        "name": os.path.basename(path),
+    }
+
+
+class DataCatalog:
+    """
+    Catalog of the GA4 exports and WordPress (WXR) dumps in a data directory.
+
+    Each ``.csv``/``.xml`` file is recorded once with its SHA-256, kind (``GA4_PAGE_SCREEN``,
+    ``GA4_REPORT`` or ``WXR``) and the date range it covers: the range in the GA4 preamble, or
+    everything up to the export date for a WXR dump. The catalog is persisted as a JSON index
+    in the directory; :meth:`refresh` only re-reads the files whose size or mtime changed, and
+    lookups are answered from the index without opening any file.
+
+    **Example**::
+
+        catalog = DataCatalog(DATA_DIR)
+        catalog.refresh()
+        ga4_path = catalog.find(GA4_PAGE_SCREEN, "2025-05-01", "2025-05-30")
+        wp_path = catalog.find(WXR, "2025-05-01", "2025-05-30")
+    """
+    INDEX_FILENAME = ".data_catalog.json"
+
+    def __init__(self, data_dir: str, index_path: Optional[str] = None):
+        """
+        :param data_dir: Directory to catalog, scanned recursively.
+        :param index_path: Path of the JSON index, defaults to ``.data_catalog.json`` in ``data_dir``.
+        """
+        self.data_dir = os.path.abspath(data_dir)
+        self.index_path = index_path or os.path.join(self.data_dir, self.INDEX_FILENAME)
+        self.entries: Dict[str, Dict[str, Any]] = self._read_index()
+        self._by_range: Dict[tuple, str] = {}
+        self._reindex()
+
+    def _read_index(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                return json.load(f).get("entries", {})
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _write_index(self) -> None:
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"entries": self.entries}, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.index_path)
+
+    def _reindex(self) -> None:
+        """Rebuilds the (kind, start, end) -> path map used for exact lookups."""
+        self._by_range = {}
+        for relative_path in sorted(self.entries, key=lambda p: self.entries[p]["mtime_ns"]):
+            entry = self.entries[relative_path]
+            # The most recently modified file wins between files covering the same range
+            self._by_range[(entry["kind"], entry["start_date"], entry["end_date"])] = relative_path
+
+    def _describe(self, path: str) -> Optional[Dict[str, Any]]:
+        extension = os.path.splitext(path)[1].lower()
+        try:
+            if extension == '.csv':
+                return _describe_ga4(path)
+            if extension == '.xml':
+                return _describe_wxr(path)
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Error reading {path} for the data catalog: {e}")
+        return None
+
+    def refresh(self) -> Dict[str, int]:
+        """
+        Scans the data directory and updates the index for new, changed and removed files.
+
+        :returns: The number of ``added``, ``updated`` and ``removed`` entries.
+        """
+        seen = set()
+        counts = {"added": 0, "updated": 0, "removed": 0}
+        for root, dirs, files in os.walk(self.data_dir):
+            dirs[:] = [d for d in dirs if not d.startswith('.')]
+            for filename in files:
+                if filename.startswith('.') or os.path.splitext(filename)[1].lower() not in ('.csv', '.xml'):
+                    continue
+                path = os.path.join(root, filename)
+                relative_path = os.path.relpath(path, self.data_dir)
+                stat = os.stat(path)
+                known = self.entries.get(relative_path)
+                if known and known["size"] == stat.st_size and known["mtime_ns"] == stat.st_mtime_ns:
+                    seen.add(relative_path)
+                    continue
+                description = self._describe(path)
+                if description is None:
+                    continue
+                seen.add(relative_path)
+                self.entries[relative_path] = dict(
+                    description, size=stat.st_size, mtime_ns=stat.st_mtime_ns, sha256=_file_sha256(path)
+                )
+                counts["updated" if known else "added"] += 1
+
+        for relative_path in [p for p in self.entries if p not in seen]:
+            del self.entries[relative_path]
+            counts["removed"] += 1
+        if any(counts.values()):
+            self._reindex()
+            self._write_index()
+        return counts
+
+    def files(self, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Returns the catalog entries, with their absolute ``path``.
+
+        :param kind: Only return entries of this kind. All if None.
+        """
+        return [
+            dict(entry, path=os.path.join(self.data_dir, relative_path))
+            for relative_path, entry in self.entries.items()
+            if kind is None or entry["kind"] == kind
+        ]
+
+    def find(self, kind: str, start: DateLike, end: DateLike) -> Optional[str]:
+        """
+        Returns the best file of a kind covering the dates from ``start`` to ``end``.
+
+        A file whose range is exactly ``[start, end]`` is returned with a single lookup.
+        Otherwise the tightest covering range wins: the latest start, then the earliest end
+        (for WXR dumps, the first export made after ``end``).
+
+        :param kind: ``GA4_PAGE_SCREEN``, ``GA4_REPORT`` or ``WXR``.
+        :param start: First date needed, as a ``datetime.date`` or ISO string.
+        :param end: Last date needed, as a ``datetime.date`` or ISO string.
+        :returns: The absolute path of the file, or None if no file covers the range.
+        """
+        start, end = _to_date(start), _to_date(end)
+        if start is None or end is None:
+            raise ValueError("Both start and end dates are needed.")
+        exact = self._by_range.get((kind, start.isoformat(), end.isoformat()))
+        if exact is not None:
+            return os.path.join(self.data_dir, exact)
+
+        best, best_key = None, None
+        for relative_path, entry in self.entries.items():
+            if entry["kind"] != kind:
+                continue
+            entry_start, entry_end = _to_date(entry["start_date"]), _to_date(entry["end_date"])
+            if (entry_start is not None and entry_start > start) or entry_end is None or entry_end < end:
+                continue
+            key = (entry_start or date.min, -entry_end.toordinal(), entry["mtime_ns"])
+            if best_key is None or key > best_key:
+                best, best_key = relative_path, key
+        return os.path.join(self.data_dir, best) if best is not None else None
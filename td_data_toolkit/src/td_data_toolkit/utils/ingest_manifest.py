@@ -0,0 +1,128 @@
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+from .xml_utils import YOAST_META_KEYS, WxrContentReader
+
+# Fields of a parsed article that only change when the post is edited. The view count
+# (post_views_count) changes every day without an edit and is left to the full ingest.
+FINGERPRINT_FIELDS: List[str] = [
+    "title", "link", "pubdate", "category", "publication_tags", "content"
+] + [key for key in YOAST_META_KEYS if key != "post_views_count"]
+
+
+def article_fingerprint(article: Dict[str, Any], raw_content: Optional[bytes] = None) -> str:
+    """
+    Computes a fingerprint of the fields of a parsed article that change on an edit.
+
+    Editing the title, content, link, publication date, categories, tags or Yoast metadata
+    changes the fingerprint; a new view count does not (see ``FINGERPRINT_FIELDS``).
+
+    :param article: Article as returned by ``get_articles_from_xml``.
+    :param raw_content: For an article parsed with ``lazy_content=True``, the raw bytes of its
+        content (:meth:`WxrContentReader.read_raw`), hashed without being decoded. Lazy and eager
+        fingerprints of the same post differ, so a manifest must always be built the same way.
+    :returns: Hex SHA-1 digest of the article's fingerprint fields.
+    """
+    fields = {field: article.get(field) for field in FINGERPRINT_FIELDS}
+    payload = json.dumps(fields, sort_keys=True, ensure_ascii=False, default=str)
+    digest = hashlib.sha1(payload.encode('utf-8'))
+    if raw_content is not None:
+        digest.update(raw_content)
+    return digest.hexdigest()
+
+
+def _article_key(article: Dict[str, Any]) -> Optional[str]:
+    return article.get("post_id") or article.get("pagepath")
+
+
+def load_manifest(path: str) -> Dict[str, Dict[str, Optional[str]]]:
+    """
+    Loads the manifest saved by a previous ingest.
+
+    :param path: Path to the JSON manifest.
+    :returns: The manifest, or an empty one if the file does not exist.
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_manifest(path: str, manifest: Dict[str, Dict[str, Optional[str]]]) -> None:
+    """
+    Atomically saves a manifest as JSON.
+
+    :param path: Path to the JSON manifest.
+    :param manifest: Manifest as returned by :func:`diff_articles`.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def diff_articles(articles: List[Dict[str, Any]], previous_manifest: Dict[str, Dict[str, Optional[str]]],
+                  content_reader: Optional[WxrContentReader] = None) -> Dict[str, Any]:
+    """
+    Compares freshly parsed articles with the manifest of the previous ingest.
+
+    :param articles: Articles as returned by ``get_articles_from_xml``.
+    :param previous_manifest: Manifest of the previous ingest, mapping each post ID (or pagepath
+        when missing) to its ``fingerprint`` and ``pagepath``.
+    :param content_reader: Reader of the export, for articles parsed with ``lazy_content=True``:
+        their content is fingerprinted from its raw bytes, and never decoded.
+    :returns: A dictionary with the ``new`` and ``changed`` articles, the ``deleted`` pagepaths
+        (posts no longer in the export, or the old pagepath of a post whose pagepath changed),
+        the number of ``unchanged`` articles and the ``manifest`` of the current articles.
+
+    **Example**::
+
+        previous = load_manifest("wp_manifest.json")
+        with WxrContentReader("export.xml") as reader:
+            diff = diff_articles(get_articles_from_xml("export.xml", lazy_content=True), previous, reader)
+            client.upsert_articles(reader.with_content(diff["new"] + diff["changed"]))
+        save_manifest("wp_manifest.json", diff["manifest"])
+    """
+    manifest = {}
+    new, changed, deleted = [], [], []
+    unchanged = 0
+
+    for article in articles:
+        key = _article_key(article)
+        if key is None:
+            new.append(article)
+            continue
+        raw_content = None
+        if content_reader is not None:
+            raw_content = content_reader.read_raw(article.get("content_start"), article.get("content_end"))
+        entry = {"fingerprint": article_fingerprint(article, raw_content), "pagepath": article.get("pagepath")}
+        manifest[key] = entry
+        previous = previous_manifest.get(key)
+        if previous is None:
+            new.append(article)
+        elif previous["fingerprint"] != entry["fingerprint"]:
+            changed.append(article)
+            if previous.get("pagepath") and previous["pagepath"] != entry["pagepath"]:
+                deleted.append(previous["pagepath"])
+        else:
+            unchanged += 1
+
+    for key, previous in previous_manifest.items():
+        if key not in manifest and previous.get("pagepath"):
+            deleted.append(previous["pagepath"])
+    # A pagepath taken over by another post must not be deleted
+    current_pagepaths = {entry["pagepath"] for entry in manifest.values()}
+    deleted = [pagepath for pagepath in deleted if pagepath not in current_pagepaths]
+
+    return {
+        "new": new,
+        "changed": changed,
+        "deleted": deleted,
+        "unchanged": unchanged,
+        "manifest": manifest
+    }
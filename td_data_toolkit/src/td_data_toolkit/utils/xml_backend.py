@@ -0,0 +1,124 @@
+import xml.etree.ElementTree as ET
+from typing import IO, Any, Iterable, Iterator, List, Optional, Union
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:  # lxml is optional
+    lxml_etree = None
+
+# Errors raised by either backend on malformed XML.
+XML_PARSE_ERRORS = (ET.ParseError,) if lxml_etree is None else (ET.ParseError, lxml_etree.ParseError)
+
+
+class EtreeBackend:
+    """
+    XML parser backend built on the standard library's ``xml.etree.ElementTree``.
+
+    Backends parse WordPress exports into elements with the ElementTree API
+    (``tag``, ``text``, ``get``, iteration over children), so the readers in
+    :mod:`td_data_toolkit.utils.xml_utils` work unchanged on either of them.
+    """
+    name = "etree"
+
+    def parse(self, source: Union[str, IO]) -> Any:
+        """Parses a whole document from a path or binary file-like object."""
+        return ET.parse(source)
+
+    def channel_items(self, root: Any) -> List[Any]:
+        """Returns the ``<item>`` children of the ``<channel>`` elements under the ``<rss>`` root."""
+        return root.findall('channel/item')
+
+    def iter_channel_items(self, chunks: Iterable[bytes]) -> Iterator[Any]:
+        """
+        Incrementally parses a document fed as byte chunks and yields the ``<item>``
+        children of ``<channel>`` one at a time. Once consumed, each item is cleared
+        and detached from ``<channel>`` so memory does not grow with the document.
+        """
+        parser = ET.XMLPullParser(events=('start', 'end'))
+        stack: List[ET.Element] = []
+
+        def _drain() -> Iterator[ET.Element]:
+            for event, elem in parser.read_events():
+                if event == 'start':
+                    stack.append(elem)
+                    continue
+                stack.pop()
+                if elem.tag == 'item' and stack and stack[-1].tag == 'channel':
+                    yield elem
+                    elem.clear()
+                    # The parser may already be building the next item: it stays
+                    # referenced by its own events, so detaching it here is safe.
+                    stack[-1].clear()
+
+        for chunk in chunks:
+            parser.feed(chunk)
+            yield from _drain()
+        parser.close()
+        yield from _drain()
+
+
+class LxmlBackend(EtreeBackend):
+    """
+    XML parser backend built on lxml's libxml2 parser, with compiled XPath lookups.
+
+    Large text nodes (long post content) are allowed, and only internal entities are
+    resolved, as with ElementTree. When streaming, libxml2 only reports the end of
+    ``<item>`` elements instead of every start and end event.
+    """
+    name = "lxml"
+
+    def __init__(self):
+        self._parser = lxml_etree.XMLParser(huge_tree=True, resolve_entities='internal')
+        self._channel_items = lxml_etree.XPath('channel/item')
+
+    def parse(self, source: Union[str, IO]) -> Any:
+        return lxml_etree.parse(source, self._parser)
+
+    def channel_items(self, root: Any) -> List[Any]:
+        return self._channel_items(root)
+
+    def iter_channel_items(self, chunks: Iterable[bytes]) -> Iterator[Any]:
+        parser = lxml_etree.XMLPullParser(events=('end',), tag='item', huge_tree=True, resolve_entities='internal')
+
+        def _drain() -> Iterator[Any]:
+            for _, elem in parser.read_events():
+                channel = elem.getparent()
+                if channel is None or channel.tag != 'channel':
+                    continue
+                yield elem
+                # libxml2 may still be building the next item under <channel>:
+                # only the items already read are removed, this one goes next time.
+                elem.clear(keep_tail=True)
+                while elem.getprevious() is not None:
+                    del channel[0]
+
+        for chunk in chunks:
+            parser.feed(chunk)
+            yield from _drain()
+        parser.close()
+        yield from _drain()
+
+
+_BACKENDS = {}
+
+
+def get_xml_backend(name: Optional[str] = None) -> EtreeBackend:
+    """
+    Returns an XML parser backend.
+
+    :param name: ``"lxml"``, ``"etree"``, or None (or ``"auto"``) for lxml when it is
+        installed and ElementTree otherwise. ``"lxml"`` also falls back to ElementTree
+        when lxml is missing.
+    :returns: The backend, shared between calls.
+    """
+    if name in (None, "auto"):
+        name = "etree" if lxml_etree is None else "lxml"
+    elif name == "lxml" and lxml_etree is None:
+        print("lxml is not installed, using the ElementTree XML backend.")
+        name = "etree"
+    elif name not in ("lxml", "etree"):
+        raise ValueError(f"Unknown XML backend: {name}")
+
+    if name not in _BACKENDS:
+        _BACKENDS[name] = LxmlBackend() if name == "lxml" else EtreeBackend()
+    return _BACKENDS[name]
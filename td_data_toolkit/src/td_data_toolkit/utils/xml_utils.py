@@ -1,27 +1,503 @@
+import functools
+import itertools
+import mmap
+import os
 import re
 import xml.etree.ElementTree as ET
-from typing import Dict, List, Optional, Union, IO
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Collection, Dict, Iterable, Iterator, List, Optional, Tuple, Union, IO
 from urllib.parse import urlparse
 import pandas as pd
+from .xml_backend import XML_PARSE_ERRORS, get_xml_backend
 
-def get_articles_from_xml(file_path: Optional[str] = None, file_like: Optional[IO] = None, as_dataframe: bool = False) -> Union[List[Dict[str, Optional[str]]], pd.DataFrame]:
+WXR_NAMESPACES: Dict[str, str] = {
+    'content': "http://purl.org/rss/1.0/modules/content/",
+    'wp': 'http://wordpress.org/export/1.2/',
+    'dc': 'http://purl.org/dc/elements/1.1/'
+}
+
+YOAST_META_KEYS: List[str] = [
+    "post_views_count", "_yoast_wpseo_focuskw", "_yoast_wpseo_metadesc",
+    "_yoast_wpseo_linkdex", "_yoast_wpseo_content_score", "_yoast_wpseo_keywordsynonyms",
+    "_yoast_wpseo_estimated-reading-time-minutes"
+]
+_YOAST_META_KEY_SET = frozenset(YOAST_META_KEYS)
+
+_CHUNK_SIZE = 1 << 20
+_XML_PROLOG = re.compile(rb'<\?xml[^>]*\?>')
+_RSS_START_TAG = re.compile(rb'<rss\b[^>]*>')
+# End of an item directly followed by the next one (or by the end of the channel).
+_ITEM_BOUNDARY = re.compile(rb'</item>\s*(?=<item>|</channel>)')
+_CDATA_OPEN = b'<![CDATA['
+_CDATA_CLOSE = b']]>'
+_SHARD_SUFFIX = b'</channel></rss>'
+_CONTENT_OPEN_TAG = b'<content:encoded>'
+_CONTENT_CLOSE_TAG = b'</content:encoded>'
+_CONTENT_TAG = "{%s}encoded" % WXR_NAMESPACES['content']
+
+_WP = "{%s}" % WXR_NAMESPACES['wp']
+_POSTMETA_TAG = _WP + "postmeta"
+_META_KEY_TAG = _WP + "meta_key"
+_META_VALUE_TAG = _WP + "meta_value"
+
+# Child tags of an <item> read as plain text, mapped to their field name.
+_WXR_TEXT_FIELDS: Dict[str, str] = {
+    'title': 'title',
+    'link': 'link',
+    'pubDate': 'pubdate',
+    _CONTENT_TAG: 'content',
+    _WP + 'post_id': 'post_id',
+    _WP + 'post_type': 'post_type',
+}
+
+
+def read_wxr_item(item: ET.Element, meta_keys: Optional[Collection[str]] = None,
+                  lazy_content: bool = False, meta_wins: str = 'first') -> Dict[str, Any]:
+    """
+    Reads the fields of a WordPress export ``<item>`` walking its children only once.
+
+    :param item: The ``<item>`` element.
+    :param meta_keys: Postmeta keys to collect. All keys are collected if None.
+    :param lazy_content: Set when the item comes from a parse with ``lazy_content=True``
+        (see :func:`iter_wxr_items`): ``content`` is then None and ``content_span`` holds the
+        ``(start, end)`` byte offsets of the content in the file, to read with :class:`WxrContentReader`.
+    :param meta_wins: Which value of a postmeta key repeated in the item is kept: ``'first'``,
+        as with an XPath lookup, or ``'last'``, as when every ``<wp:postmeta>`` is assigned in turn.
+    :returns: A dictionary with the text of ``title``, ``link``, ``pubdate``, ``content``,
+        ``post_id`` and ``post_type`` (None when missing), the ``categories`` as a list of
+        ``(domain, text)`` pairs in document order, and a ``meta`` dictionary mapping each
+        postmeta key to its value. As with an XPath lookup, the first occurrence of a
+        field wins; for meta keys, see ``meta_wins``.
+    """
+    if meta_wins not in ('first', 'last'):
+        raise ValueError(f"meta_wins must be 'first' or 'last', got {meta_wins!r}")
+    keep_last = meta_wins == 'last'
+    fields: Dict[str, Any] = dict.fromkeys(_WXR_TEXT_FIELDS.values())
+    seen = set()
+    categories = []
+    meta: Dict[str, Optional[str]] = {}
+
+    # Texts are read as ``node.text or None``: for an empty element, or an empty
+    # ``<![CDATA[]]>``, lxml gives '' where ElementTree gives None.
+    for child in item:
+        tag = child.tag
+        if tag == _POSTMETA_TAG:
+            key = value = None
+            has_value = False
+            for node in child:
+                if node.tag == _META_KEY_TAG:
+                    if key is None:
+                        key = node.text or None
+                elif node.tag == _META_VALUE_TAG and not has_value:
+                    value = node.text or None
+                    has_value = True
+            if (key is not None and has_value and (keep_last or key not in meta)
+                    and (meta_keys is None or key in meta_keys)):
+                meta[key] = value
+        elif tag == 'category':
+            categories.append((child.get('domain'), child.text or None))
+        else:
+            field = _WXR_TEXT_FIELDS.get(tag)
+            if field is not None and field not in seen:
+                fields[field] = child.text or None
+                seen.add(field)
+
+    fields['categories'] = categories
+    fields['meta'] = meta
+    if lazy_content:
+        span = fields['content']
+        fields['content'] = None
+        fields['content_span'] = tuple(int(offset) for offset in span.split(':')) if span else None
+    return fields
+
+
+def _iter_channel_items(chunks: Iterable[bytes], backend: Optional[str] = None) -> Iterator[ET.Element]:
+    """
+    Incrementally parses a WordPress export fed as byte chunks and yields the
+    ``<item>`` children of ``<channel>`` one at a time. Once consumed, each item
+    is cleared and detached from ``<channel>`` so memory does not grow with the file.
+    """
+    return get_xml_backend(backend).iter_channel_items(chunks)
+
+
+def _slices(mm: mmap.mmap, start: int, end: int) -> Iterator[bytes]:
+    for offset in range(start, end, _CHUNK_SIZE):
+        yield mm[offset:min(offset + _CHUNK_SIZE, end)]
+
+
+def _lazy_content_chunks(mm: mmap.mmap, start: int, end: int) -> Iterator[bytes]:
+    """
+    Yields the bytes in ``[start, end)`` with the body of every ``<content:encoded>`` replaced
+    by its ``start:end`` byte offsets, so the parser never has to decode the post content.
+    Tags inside CDATA sections (post content may quote ``</content:encoded>``) are ignored.
+    """
+    pos = start
+    while pos < end:
+        open_at = _find_outside_cdata(mm, _CONTENT_OPEN_TAG, pos, end)
+        if open_at == -1:
+            yield from _slices(mm, pos, end)
+            return
+        body = open_at + len(_CONTENT_OPEN_TAG)
+        close_at = _find_outside_cdata(mm, _CONTENT_CLOSE_TAG, body, end)
+        if close_at == -1:
+            raise ValueError(f"Unterminated <content:encoded> at byte {open_at}.")
+        yield from _slices(mm, pos, body)
+        yield b'%d:%d' % (body, close_at)
+        pos = close_at
+
+
+def iter_wxr_items(source: Union[str, IO], lazy_content: bool = False,
+                   backend: Optional[str] = None) -> Iterator[ET.Element]:
+    """
+    Streams the ``<item>`` elements of a WordPress export without loading the whole tree.
+
+    :param source: Path to the XML file or binary file-like object.
+    :param lazy_content: Skip the body of ``<content:encoded>`` while parsing, leaving its byte
+        offsets as the element text (decoded by ``read_wxr_item(..., lazy_content=True)``).
+        Requires ``source`` to be a path, as the file is memory-mapped.
+    :param backend: XML parser backend, see :func:`~td_data_toolkit.utils.xml_backend.get_xml_backend`.
+    :returns: An iterator of ``<item>`` elements, each valid until the next one is requested.
+    """
+    if lazy_content:
+        if not isinstance(source, str):
+            raise ValueError("lazy_content requires a file path.")
+        with open(source, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield from _iter_channel_items(_lazy_content_chunks(mm, 0, len(mm)), backend)
+    elif isinstance(source, str):
+        with open(source, 'rb') as f:
+            yield from _iter_channel_items(iter(lambda: f.read(_CHUNK_SIZE), b''), backend)
+    else:
+        yield from _iter_channel_items(iter(lambda: source.read(_CHUNK_SIZE), b''), backend)
+
+
+def _cdata_end(mm: mmap.mmap, pos: int, target: int) -> Optional[int]:
+    """
+    Scans ``[pos, target)``, with ``pos`` outside any CDATA section, and returns the offset
+    just past the CDATA section containing ``target``, or None if ``target`` is outside CDATA.
+    """
+    while True:
+        open_at = mm.find(_CDATA_OPEN, pos, target)
+        if open_at == -1:
+            return None
+        close_at = mm.find(_CDATA_CLOSE, open_at + len(_CDATA_OPEN))
+        if close_at == -1:
+            raise ValueError(f"Unterminated CDATA section at byte {open_at}.")
+        pos = close_at + len(_CDATA_CLOSE)
+        if pos > target:
+            return pos
+
+
+def _find_outside_cdata(mm: mmap.mmap, tag: bytes, pos: int, end: int) -> int:
+    """
+    Returns the offset of the first ``tag`` in ``[pos, end)`` that is not inside a CDATA
+    section, scanning from ``pos``, outside any CDATA section. -1 if there is none.
+    """
+    target = pos
+    while True:
+        found = mm.find(tag, target, end)
+        if found == -1:
+            return -1
+        cdata_end = _cdata_end(mm, pos, found)
+        if cdata_end is None:
+            return found
+        pos = target = cdata_end
+
+
+def _next_item_boundary(mm: mmap.mmap, pos: int, target: int, end: int) -> Optional[int]:
+    """
+    Returns the end of the first ``</item>`` boundary at or after ``target`` that is not
+    inside a CDATA section (post content may hold ``</item><item>`` markup), scanning
+    from ``pos``, a boundary. None if there is none before ``end``.
+    """
+    while True:
+        match = _ITEM_BOUNDARY.search(mm, target, end)
+        if match is None:
+            return None
+        cdata_end = _cdata_end(mm, pos, match.start())
+        if cdata_end is None:
+            return match.end()
+        pos = target = cdata_end
+
+
+def split_wxr_file(file_path: str, n_shards: int) -> Tuple[bytes, List[Tuple[int, int]]]:
+    """
+    Splits a WordPress export into byte ranges falling on ``<item>`` boundaries.
+    Boundaries inside CDATA sections are skipped.
+
+    :param file_path: Path to the XML file.
+    :param n_shards: Number of ranges wanted. Fewer are returned for small files.
+    :returns: The document prefix to prepend to every range (XML declaration, ``<rss>``
+        start tag with its namespace declarations and ``<channel>``) and the list of
+        ``(start, end)`` byte offsets, in document order.
+    """
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        first = mm.find(b'<item>')
+        if first == -1:
+            return b'', []
+        header = mm[:first]
+        prolog = _XML_PROLOG.match(header)
+        rss_tag = _RSS_START_TAG.search(header)
+        if rss_tag is None:
+            raise ValueError("No <rss> start tag found in the XML header.")
+        prefix = (prolog.group(0) if prolog else b'') + rss_tag.group(0) + b'<channel>'
+
+        end = mm.rfind(b'</channel>')
+        if end < first:
+            raise ValueError("No </channel> end tag found after the first <item>.")
+
+        bounds = [first]
+        for k in range(1, max(n_shards, 1)):
+            target = first + (end - first) * k // n_shards
+            if target <= bounds[-1]:
+                continue
+            boundary = _next_item_boundary(mm, bounds[-1], target, end)
+            if boundary is None:
+                break
+            if boundary > bounds[-1]:
+                bounds.append(boundary)
+        bounds.append(end)
+        ranges = [(start, stop) for start, stop in zip(bounds, bounds[1:]) if stop > start]
+    return prefix, ranges
+
+
+def _parse_wxr_shard(file_path: str, start: int, end: int, prefix: bytes,
+                     parse_item: Callable[[ET.Element], Optional[Dict[str, Any]]],
+                     lazy_content: bool = False, backend: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Parses the items in ``[start, end)`` of a memory-mapped export, wrapped in ``prefix``."""
+    rows = []
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        body = _lazy_content_chunks(mm, start, end) if lazy_content else _slices(mm, start, end)
+        chunks = itertools.chain((prefix,), body, (_SHARD_SUFFIX,))
+        try:
+            for item in _iter_channel_items(chunks, backend):
+                row = parse_item(item)
+                if row is not None:
+                    rows.append(row)
+        except XML_PARSE_ERRORS as e:
+            # lxml errors cannot be pickled back from a worker process
+            raise ET.ParseError(f"{e} (bytes {start}-{end})") from None
+    return rows
+
+
+def parse_wxr_parallel(file_path: str, parse_item: Callable[[ET.Element], Optional[Dict[str, Any]]],
+                       workers: Optional[int] = None, lazy_content: bool = False,
+                       backend: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Parses a WordPress export across a pool of processes.
+
+    The file is memory-mapped and split on ``<item>`` boundaries (see :func:`split_wxr_file`);
+    every shard is parsed by a worker with the namespace declarations of the original header,
+    and the rows are joined back in document order.
+
+    :param file_path: Path to the XML file.
+    :param parse_item: Picklable callable turning an ``<item>`` into a row, or None to skip it.
+    :param workers: Number of worker processes. Defaults to the number of CPUs.
+    :param lazy_content: Skip the post content as in :func:`iter_wxr_items`.
+    :param backend: Name of the XML parser backend used by the workers.
+    :returns: The rows of all the items, in the same order as a single-process parse.
+    """
+    workers = workers or os.cpu_count() or 1
+    # Resolved here so every worker uses the same one
+    backend = get_xml_backend(backend).name
+    prefix, ranges = split_wxr_file(file_path, workers)
+    if not ranges:
+        return []
+    if len(ranges) == 1:
+        return _parse_wxr_shard(file_path, ranges[0][0], ranges[0][1], prefix, parse_item, lazy_content, backend)
+
+    rows: List[Dict[str, Any]] = []
+    try:
+        with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as executor:
+            futures = [
+                executor.submit(_parse_wxr_shard, file_path, start, end, prefix, parse_item, lazy_content, backend)
+                for start, end in ranges
+            ]
+            for future in futures:
+                rows.extend(future.result())
+    except XML_PARSE_ERRORS as e:
+        # A shard cut in the middle of an item does not parse: the whole file is parsed in
+        # one stream instead, which raises the error again if the file itself is malformed
+        print(f"Parsing {file_path} in shards failed ({e}), parsing it in a single process.")
+        return _parse_wxr_shard(file_path, ranges[0][0], ranges[-1][1], prefix, parse_item, lazy_content, backend)
+    return rows
+
+
+class WxrContentReader:
+    """
+    Reads post content from a WordPress export by byte offsets, on demand.
+
+    Pairs with a parse done with ``lazy_content=True``, which records where each post's
+    ``<content:encoded>`` body lies instead of building the string. The file is memory-mapped,
+    so only the content actually read is paged in.
+
+    **Example**::
+
+        articles = get_articles_from_xml("export.xml", lazy_content=True)
+        with WxrContentReader("export.xml") as reader:
+            content = reader.read(articles[0]["content_start"], articles[0]["content_end"])
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._file = open(file_path, 'rb')
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def read(self, start: Optional[int], end: Optional[int]) -> Optional[str]:
+        """
+        Decodes the content between two byte offsets, as the XML parser would.
+
+        :param start: Offset of the first byte of the content, or None/NaN if the post has none.
+        :param end: Offset just past the last byte of the content.
+        :returns: The content text, or None if empty.
+        """
+        raw = self.read_raw(start, end)
+        if raw is None:
+            return None
+        if raw.startswith(b'<![CDATA[') and raw.endswith(b']]>') and raw.count(b']]>') == 1:
+            # Plain CDATA section: only line endings need normalizing
+            text = raw[9:-3].decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+        else:
+            text = ET.fromstring(b'<content>' + raw + b'</content>').text
+        return text if text else None
+
+    def read_raw(self, start: Optional[int], end: Optional[int]) -> Optional[bytes]:
+        """
+        Returns the content between two byte offsets as it is in the file, without decoding it.
+
+        :param start: Offset of the first byte of the content, or None/NaN if the post has none.
+        :param end: Offset just past the last byte of the content.
+        :returns: The raw bytes, CDATA markers and entities included, or None if the post has no content.
+        """
+        if start is None or end is None or start != start or end != end:  # None or NaN
+            return None
+        return self._mm[int(start):int(end)]
+
+    def read_many(self, starts: Iterable[Optional[int]], ends: Iterable[Optional[int]]) -> List[Optional[str]]:
+        """
+        Reads the content of several posts.
+
+        :param starts: Start offsets, e.g. the ``content_start`` column of the parsed articles.
+        :param ends: End offsets, e.g. the ``content_end`` column of the parsed articles.
+        :returns: The contents, in the same order.
+        """
+        return [self.read(start, end) for start, end in zip(starts, ends)]
+
+    def with_content(self, articles: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Reads back the content of articles parsed with ``lazy_content=True``.
+
+        :param articles: Articles with ``content_start`` and ``content_end`` offsets.
+        :returns: Copies of the articles with their ``content`` in place of the offsets.
+        """
+        articles_with_content = []
+        for article in articles:
+            article = dict(article)
+            article['content'] = self.read(article.pop('content_start', None), article.pop('content_end', None))
+            articles_with_content.append(article)
+        return articles_with_content
+
+    def close(self) -> None:
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self) -> "WxrContentReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _get_domain(link: str) -> str:
+    parsed_url = urlparse(link)
+    return parsed_url.path.lstrip('/')
+
+
+def _clean_html(path: str) -> str:
+    if path.endswith('.html'):
+        return path
+    match = re.search(r'.*\.html', path)
+    return match.group(0) if match else ""
+
+
+def _clean_article(article_data: Dict[str, Optional[str]]) -> Dict[str, Optional[str]]:
+    if article_data.get("pagepath"):
+        article_data["pagepath"] = _clean_html(article_data["pagepath"])
+    return article_data
+
+
+def _parse_article(article: ET.Element, lazy_content: bool = False) -> Dict[str, Optional[str]]:
+    fields = read_wxr_item(article, _YOAST_META_KEY_SET, lazy_content=lazy_content)
+    categories = fields['categories']
+    data = {
+        'title': fields['title'],
+        'link': fields['link'],
+        'pubdate': fields['pubdate'],
+        'category': categories[0][1] if categories else None,
+        'publication_tags': ", ".join([text for domain, text in categories if domain == "post_tag" and text]),
+    }
+    if lazy_content:
+        span = fields['content_span']
+        data['content_start'], data['content_end'] = span if span else (None, None)
+    else:
+        data['content'] = fields['content']
+    data['post_id'] = fields['post_id']
+
+    for key in YOAST_META_KEYS:
+        data[key] = fields['meta'].get(key)
+
+    if data.get("yoast_keyword_synonyms"):
+        data["yoast_keyword_synonyms"] = data["yoast_keyword_synonyms"].replace('[', '').replace(']', '').replace('"', '')
+
+    if data['link']:
+        data["pagepath"] = _get_domain(data['link'])
+
+    return _clean_article(data)
+
+
+def get_articles_from_xml(file_path: Optional[str] = None, file_like: Optional[IO] = None, as_dataframe: bool = False,
+                          workers: int = 1, lazy_content: bool = False,
+                          backend: Optional[str] = None) -> Union[List[Dict[str, Optional[str]]], pd.DataFrame]:
     """
     Parses an XML file or file-like object and extracts articles' information.
 
     :param file_path: Path to the XML file.
     :param file_like: File-like object (e.g., FastAPI UploadFile).
     :param as_dataframe: Return a pandas DataFrame if True, else a list of dicts.
+    :param workers: Number of processes used to parse ``file_path``. With more than one,
+        the file is split on ``<item>`` boundaries and parsed in parallel.
+    :param lazy_content: Do not parse the post content of ``file_path``: articles get its byte
+        offsets as ``content_start`` and ``content_end`` instead of ``content``, to be read
+        with :class:`WxrContentReader` only where needed.
+    :param backend: XML parser backend: ``"lxml"``, ``"etree"``, or None for lxml when installed.
     :returns: Parsed articles as a DataFrame or list of dictionaries.
     """
+    if lazy_content and (file_like or not file_path):
+        print("Error: lazy_content requires file_path.")
+        return pd.DataFrame() if as_dataframe else []
+
+    if (workers > 1 or lazy_content) and file_path and not file_like:
+        parse_item = functools.partial(_parse_article, lazy_content=lazy_content)
+        try:
+            articles_data = parse_wxr_parallel(file_path, parse_item, workers=workers, lazy_content=lazy_content,
+                                               backend=backend)
+        except XML_PARSE_ERRORS as e:
+            print(f"Error parsing XML: {e}")
+            return pd.DataFrame() if as_dataframe else []
+        except Exception as e:
+            print(f"General error while parsing XML: {e}")
+            return pd.DataFrame() if as_dataframe else []
+        return pd.DataFrame(articles_data) if as_dataframe else articles_data
+
+    xml_backend = get_xml_backend(backend)
     try:
         if file_like:
-            tree = ET.parse(file_like)
+            tree = xml_backend.parse(file_like)
         elif file_path:
-            tree = ET.parse(file_path)
+            tree = xml_backend.parse(file_path)
         else:
             raise ValueError("Either file_path or file_like must be provided.")
         root = tree.getroot()
-    except ET.ParseError as e:
+    except XML_PARSE_ERRORS as e:
         print(f"Error parsing XML: {e}")
         return pd.DataFrame() if as_dataframe else []
     except Exception as e:
@@ -29,70 +505,11 @@ def get_articles_from_xml(file_path: Optional[str] = None, file_like: Optional[I
         return pd.DataFrame() if as_dataframe else []
 
     channel = root.find('channel')
-    if not channel:
+    if channel is None or len(channel) == 0:
         print("Error: No <channel> element found in the XML.")
         return pd.DataFrame() if as_dataframe else []
 
-    articles = channel.findall("item")
-    namespaces = {
-        'content': "http://purl.org/rss/1.0/modules/content/",
-        'wp': 'http://wordpress.org/export/1.2/'
-    }
-
-    def _get_domain(link: str) -> str:
-        parsed_url = urlparse(link)
-        return parsed_url.path.lstrip('/')
-
-    def _get_text(element: Optional[ET.Element]) -> Optional[str]:
-        return element.text if element is not None else None
-
-    def _get_yoast_meta(article: ET.Element, key: str) -> Optional[str]:
-        try:
-            meta = article.find(f'wp:postmeta/wp:meta_key[. = "{key}"]/../wp:meta_value', namespaces)
-            return _get_text(meta)
-        except Exception as e:
-            print(f"Error extracting Yoast {key}: {e}")
-            return None
-
-    def _clean_html(path: str) -> str:
-        if path.endswith('.html'):
-            return path
-        match = re.search(r'.*\.html', path)
-        return match.group(0) if match else ""
-
-    def _clean_article(article_data: Dict[str, Optional[str]]) -> Dict[str, Optional[str]]:
-        if article_data.get("pagepath"):
-            article_data["pagepath"] = _clean_html(article_data["pagepath"])
-        return article_data
-
-    def parse_article(article: ET.Element) -> Dict[str, Optional[str]]:
-        data = {
-            'title': _get_text(article.find('title')),
-            'link': _get_text(article.find('link')),
-            'pubdate': _get_text(article.find('pubDate')),
-            'category': _get_text(article.find('category')),
-            'publication_tags': ", ".join([t.text for t in article.findall('.//category[@domain="post_tag"]') if t.text]),
-            'content': _get_text(article.find('content:encoded', namespaces)),
-            'post_id': _get_text(article.find('wp:post_id', namespaces))
-        }
-
-        yoast_keys = [
-            "post_views_count", "_yoast_wpseo_focuskw", "_yoast_wpseo_metadesc",
-            "_yoast_wpseo_linkdex", "_yoast_wpseo_content_score", "_yoast_wpseo_keywordsynonyms",
-            "_yoast_wpseo_estimated-reading-time-minutes"
-        ]
-
-        for key in yoast_keys:
-            data[key] = _get_yoast_meta(article, key)
-
-        if data.get("yoast_keyword_synonyms"):
-            data["yoast_keyword_synonyms"] = data["yoast_keyword_synonyms"].replace('[', '').replace(']', '').replace('"', '')
-
-        if data['link']:
-            data["pagepath"] = _get_domain(data['link'])
-
-        return _clean_article(data)
-
-    articles_data = [parse_article(article) for article in articles]
+    articles = xml_backend.channel_items(root)
+    articles_data = [_parse_article(article) for article in articles]
 
     return pd.DataFrame(articles_data) if as_dataframe else articles_data
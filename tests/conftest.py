@@ -0,0 +1,11 @@
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+# The installed layout of td_data_toolkit: its src directory comes before the project
+# root, whose td_data_toolkit directory is not the package
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "td_data_toolkit", "src"))
+sys.path.append(PROJECT_ROOT)
+# The reports import their helpers from the reports directory
+sys.path.append(os.path.join(PROJECT_ROOT, "reports"))
+sys.path.append(os.path.dirname(__file__))
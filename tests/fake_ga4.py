@@ -0,0 +1,108 @@
+"""
+Local fakes of the GA4 Data API clients, serving reports from in-memory rows.
+"""
+import asyncio
+import threading
+from google.analytics.data_v1beta.types import (
+    BatchRunReportsResponse, DimensionHeader, DimensionValue, MetricHeader, MetricType, MetricValue,
+    PropertyQuota, QuotaStatus, Row, RunReportResponse
+)
+
+
+class FakeDataClient:
+    """
+    Serves RunReport and batchRunReports requests from the rows of a report.
+
+    The report of a request is `rows` of (dimension values, metric values), or
+    `rows(request)` when it is a callable, paged with the request's offset and limit
+    like the Data API, so `row_count` is the total number of rows. Errors queued in
+    `errors` are raised by the next calls. Each response consumes `tokens_per_request`
+    of `tokens_per_hour`.
+    """
+    def __init__(self, dimensions, metrics, rows, metric_types=None, tokens_per_hour=10_000,
+                 tokens_per_request=10, concurrent_requests=10):
+        self.dimensions = dimensions
+        self.metrics = metrics
+        self.rows = rows
+        self.metric_types = metric_types or {m: MetricType.TYPE_INTEGER for m in metrics}
+        self.tokens_per_hour = tokens_per_hour
+        self.tokens_per_request = tokens_per_request
+        self.concurrent_requests = concurrent_requests
+        self.errors = []
+        self.run_report_requests = []
+        self.batch_requests = []
+        self._lock = threading.Lock()
+
+    def _raise_queued_error(self):
+        with self._lock:
+            if self.errors:
+                raise self.errors.pop(0)
+
+    def _report(self, request):
+        rows = self.rows(request) if callable(self.rows) else self.rows
+        end = request.offset + request.limit if request.limit else len(rows)
+        response = RunReportResponse(
+            dimension_headers=[DimensionHeader(name=d) for d in self.dimensions],
+            metric_headers=[MetricHeader(name=m, type_=self.metric_types[m]) for m in self.metrics],
+            rows=[
+                Row(dimension_values=[DimensionValue(value=v) for v in dimension_values],
+                    metric_values=[MetricValue(value=str(v)) for v in metric_values])
+                for dimension_values, metric_values in rows[request.offset:end]
+            ],
+            row_count=len(rows),
+        )
+        if request.return_property_quota:
+            with self._lock:
+                self.tokens_per_hour -= self.tokens_per_request
+                response.property_quota = PropertyQuota(
+                    tokens_per_hour=QuotaStatus(consumed=self.tokens_per_request, remaining=self.tokens_per_hour),
+                    concurrent_requests=QuotaStatus(consumed=0, remaining=self.concurrent_requests),
+                )
+        return response
+
+    def run_report(self, request):
+        self._raise_queued_error()
+        with self._lock:
+            self.run_report_requests.append(request)
+        return self._report(request)
+
+    def batch_run_reports(self, request):
+        self._raise_queued_error()
+        with self._lock:
+            self.batch_requests.append(request)
+        return BatchRunReportsResponse(reports=[self._report(r) for r in request.requests])
+
+
+class FakeAsyncDataClient(FakeDataClient):
+    """
+    FakeDataClient with coroutine methods. Each call takes `latency` seconds, or
+    `latency(request)` when it is a callable, and the calls in flight are counted:
+    `in_flight_at_calls` holds their number when each call starts.
+    """
+    def __init__(self, *args, latency=0.01, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.latency = latency
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.in_flight_at_calls = []
+
+    async def _serve(self, method, request):
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        self.in_flight_at_calls.append(self.in_flight)
+        try:
+            await asyncio.sleep(self.latency(request) if callable(self.latency) else self.latency)
+            return method(request)
+        finally:
+            self.in_flight -= 1
+
+    async def run_report(self, request):
+        return await self._serve(super().run_report, request)
+
+    async def batch_run_reports(self, request):
+        return await self._serve(super().batch_run_reports, request)
+
+
+def page_rows(n_rows):
+    """Report rows of pages and their views, views decreasing with the page number."""
+    return [((f"/articolo-{i}.html",), (n_rows - i,)) for i in range(n_rows)]
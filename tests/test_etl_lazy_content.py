@@ -0,0 +1,34 @@
+import os
+
+import pandas as pd
+import pytest
+
+from etl.from_wp_ga4_to_report.etl import EtlPipeline
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+COLUMNS_TO_KEEP = ["title", "pagepath", "pubdate", "views", "active users", "content"]
+
+
+def _run(tmp_path, name, **config):
+    output_path = str(tmp_path / f"{name}.csv")
+    EtlPipeline({
+        "GA4_FILE_PATH": os.path.join(FIXTURES, "ga4_pages.csv"),
+        "WP_FILE_PATH": os.path.join(FIXTURES, "wxr_empty_cdata.xml"),
+        "OUTPUT_FILE_PATH": output_path,
+        **config,
+    }).run()
+    return pd.read_csv(output_path)
+
+
+@pytest.mark.parametrize("mode", ["stream", "parallel"])
+def test_lazy_content_is_read_back(tmp_path, mode):
+    eager = _run(tmp_path, "eager", COLUMNS_TO_KEEP=COLUMNS_TO_KEEP, WP_XML_MODE=mode)
+    lazy = _run(tmp_path, "lazy", COLUMNS_TO_KEEP=COLUMNS_TO_KEEP, WP_XML_MODE=mode, WP_LAZY_CONTENT=True)
+    pd.testing.assert_frame_equal(lazy, eager)
+    assert lazy["content"].tolist()[0] == "<p>Il testo della recensione.</p>"
+
+
+def test_lazy_content_not_read_without_content_column(tmp_path):
+    columns = [c for c in COLUMNS_TO_KEEP if c != "content"]
+    lazy = _run(tmp_path, "lazy", COLUMNS_TO_KEEP=columns, WP_LAZY_CONTENT=True)
+    assert lazy.columns.tolist() == columns
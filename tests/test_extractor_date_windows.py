@@ -0,0 +1,49 @@
+import os
+
+import pandas as pd
+
+from etl.from_wp_ga4_to_report.etl import EtlPipeline
+from etl.from_wp_ga4_to_report.extractor import Extractor
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+WP_FILE_PATH = os.path.join(FIXTURES, "wxr_empty_cdata.xml")
+
+
+def _daily_ga4_export(tmp_path):
+    """The pages of ga4_pages.csv with a date column: visits on 31 May, 15 June and 2 July."""
+    with open(os.path.join(FIXTURES, "ga4_pages.csv"), encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    preamble = [line for line in lines if line.startswith("#")]
+    header, *pages = [line for line in lines if not line.startswith("#")]
+    rows = [f"{day},{page}" for day in ("20250531", "20250615", "20250702") for page in pages]
+    path = tmp_path / "ga4_daily.csv"
+    path.write_text("\n".join(preamble + [f"Data,{header}"] + rows) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def test_pubdate_window_does_not_filter_ga4_dates(tmp_path):
+    extractor = Extractor({"GA4_FILE_PATH": _daily_ga4_export(tmp_path), "WP_FILE_PATH": WP_FILE_PATH,
+                           "PUBDATE_WINDOW": ("2025-06-01", "2025-06-30")})
+    assert extractor.extract_ga4_data()["Data"].tolist() == ["20250531"] * 2 + ["20250615"] * 2 + ["20250702"] * 2
+
+
+def test_ga4_date_window(tmp_path):
+    extractor = Extractor({"GA4_FILE_PATH": _daily_ga4_export(tmp_path), "WP_FILE_PATH": WP_FILE_PATH,
+                           "GA4_DATE_WINDOW": ("2025-06-01", "2025-06-30")})
+    ga4_df = extractor.extract_ga4_data()
+    assert ga4_df["Data"].tolist() == ["20250615", "20250615"]
+    assert ga4_df["Visualizzazioni"].tolist() == [120, 80]
+
+
+def test_pubdate_window_applies_to_ga4_through_the_posts(tmp_path):
+    output_path = str(tmp_path / "report.csv")
+    EtlPipeline({
+        "GA4_FILE_PATH": os.path.join(FIXTURES, "ga4_pages.csv"),
+        "WP_FILE_PATH": WP_FILE_PATH,
+        "OUTPUT_FILE_PATH": output_path,
+        "COLUMNS_TO_KEEP": ["title", "pagepath", "views"],
+        "PUBDATE_WINDOW": ("2025-06-03", None),
+    }).run()
+    report = pd.read_csv(output_path)
+    assert report["title"].tolist() == ["Articolo senza contenuto"]
+    assert report["views"].tolist() == [80]
@@ -0,0 +1,56 @@
+import asyncio
+
+from fake_ga4 import FakeAsyncDataClient, page_rows
+from ga4_api.ga4_api import AsyncGa4Client
+
+PROPERTY_ID = "394327334"
+PAGE_SIZE = 10
+
+
+def _query(**kwargs):
+    return dict(dict(property_id=PROPERTY_ID, dimensions=["pagePath"], metrics=["screenPageViews"],
+                     start_date="2025-06-01", end_date="2025-06-30"), **kwargs)
+
+
+def _later_pages_first(request):
+    # Pages further in the report answer sooner, so responses arrive out of order
+    return 0.05 / (1 + request.offset // PAGE_SIZE)
+
+
+def _client(rows, max_concurrency=8, latency=0.01):
+    fake = FakeAsyncDataClient(["pagePath"], ["screenPageViews"], rows, latency=latency)
+    return AsyncGa4Client(client=fake, page_size=PAGE_SIZE, max_concurrency=max_concurrency), fake
+
+
+def test_pages_keep_row_order():
+    ga4, fake = _client(page_rows(75), latency=_later_pages_first)
+    df = asyncio.run(ga4.run_query(**_query()))
+    assert df["screenPageViews"].tolist() == list(range(75, 0, -1))
+    assert len(fake.run_report_requests) == 8
+
+
+def test_concurrent_requests_are_bounded():
+    ga4, fake = _client(page_rows(200), max_concurrency=3)
+    df = asyncio.run(ga4.run_query(**_query()))
+    assert len(df) == 200
+    assert fake.peak_in_flight == 3
+    assert ga4.quota.usage()["peak_concurrent_requests"] == 3
+
+
+def test_concurrent_queries_keep_their_order():
+    def rows_by_start_date(request):
+        day = int(request.date_ranges[0].start_date[-2:])
+        return [((f"/giorno-{day}/articolo-{i}.html",), (day,)) for i in range(3 * day)]
+
+    ga4, fake = _client(rows_by_start_date, max_concurrency=4)
+
+    async def pull():
+        single = [ga4.run_query(**_query(start_date=f"2025-06-{day:02d}")) for day in range(1, 4)]
+        batched = ga4.run_queries([_query(start_date=f"2025-06-{day:02d}") for day in range(4, 12)])
+        return await asyncio.gather(*single, batched)
+
+    *single, batched = asyncio.run(pull())
+    for day, df in enumerate(single + batched, start=1):
+        assert df["pagePath"].tolist() == [f"/giorno-{day}/articolo-{i}.html" for i in range(3 * day)]
+    assert [len(b.requests) for b in fake.batch_requests] == [5, 3]
+    assert fake.peak_in_flight <= 4
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+from google.analytics.data_v1beta.types import MetricType
+
+from fake_ga4 import FakeDataClient
+from ga4_api.ga4_api import Ga4Client
+from map_ga4_categories import map_ga4_categories
+
+PROPERTY_ID = "394327334"
+ROWS = [
+    (("/serie-tv/review/titolo-1.html",), (120, 31.5)),
+    (("/latest-news/si-fara-sequel.html",), (80, 12.0)),
+    (("/in-sala/titolo-2.html",), (45, 60.25)),
+]
+
+
+def _client(**kwargs):
+    fake = FakeDataClient(
+        ["pagePath"], ["screenPageViews", "userEngagementDuration"], ROWS,
+        metric_types={"screenPageViews": MetricType.TYPE_INTEGER, "userEngagementDuration": MetricType.TYPE_SECONDS},
+    )
+    return Ga4Client(client=fake, **kwargs)
+
+
+def _query(ga4):
+    return ga4.run_query(PROPERTY_ID, ["pagePath"], ["screenPageViews", "userEngagementDuration"],
+                         "2025-06-01", "2025-06-30")
+
+
+def test_typed_columns():
+    df = _query(_client())
+    assert not isinstance(df["pagePath"].dtype, pd.CategoricalDtype)
+    assert df["pagePath"].tolist() == [r[0][0] for r in ROWS]
+    assert df["screenPageViews"].dtype == np.int64
+    assert df["userEngagementDuration"].dtype == np.float64
+
+
+def test_report_categorisation():
+    # The categorisation of reports/weekly/weekly_report.py and reports/monthly/monthly_report.py
+    df = _query(_client())
+    df["Categoria"] = df["pagePath"].apply(map_ga4_categories)
+    df.loc[df["pagePath"].apply(lambda path: "si-fara" in path), "Categoria"] = "Si farà"
+    df.loc[
+        (df["Categoria"] == "Recensioni / In Sala") | (df["Categoria"] == "Recensioni"),
+        "Categoria",
+    ] = "Recensioni"
+    assert df["Categoria"].tolist()[1] == "Si farà"
+
+
+def test_categorical_dimensions():
+    df = _query(_client(categorical_dimensions=True))
+    assert isinstance(df["pagePath"].dtype, pd.CategoricalDtype)
+
+
+def test_cached_dimensions_follow_the_client(tmp_path):
+    _query(_client(cache_dir=str(tmp_path), categorical_dimensions=True))
+    df = _query(_client(cache_dir=str(tmp_path)))
+    assert not isinstance(df["pagePath"].dtype, pd.CategoricalDtype)
+    assert df["screenPageViews"].tolist() == [120, 80, 45]
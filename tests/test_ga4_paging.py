@@ -0,0 +1,73 @@
+import pytest
+
+from fake_ga4 import FakeDataClient, page_rows
+from ga4_api.ga4_api import MAX_BATCH_REPORTS, Ga4Client
+
+PROPERTY_ID = "394327334"
+PAGE_SIZE = 10
+
+
+def _client(rows):
+    fake = FakeDataClient(["pagePath"], ["screenPageViews"], rows)
+    return Ga4Client(client=fake, page_size=PAGE_SIZE, max_workers=3), fake
+
+
+def _query(**kwargs):
+    return dict(dict(property_id=PROPERTY_ID, dimensions=["pagePath"], metrics=["screenPageViews"],
+                     start_date="2025-06-01", end_date="2025-06-30"), **kwargs)
+
+
+def _pages(fake):
+    return sorted((r.offset, r.limit) for r in fake.run_report_requests)
+
+
+def test_multi_page_report():
+    ga4, fake = _client(page_rows(25))
+    df = ga4.run_query(**_query())
+    assert _pages(fake) == [(0, 10), (10, 10), (20, 10)]
+    assert df["pagePath"].tolist() == [r[0][0] for r in page_rows(25)]
+    assert df["screenPageViews"].tolist() == list(range(25, 0, -1))
+
+
+def test_single_page_report():
+    ga4, fake = _client(page_rows(PAGE_SIZE))
+    assert len(ga4.run_query(**_query())) == PAGE_SIZE
+    assert _pages(fake) == [(0, 10)]
+
+
+@pytest.mark.parametrize("limit, pages", [(15, [(0, 10), (10, 5)]), (5, [(0, 5)]), (40, [(0, 10), (10, 10), (20, 10)])])
+def test_limit(limit, pages):
+    ga4, fake = _client(page_rows(25))
+    df = ga4.run_query(**_query(limit=limit))
+    assert _pages(fake) == pages
+    assert df["screenPageViews"].tolist() == list(range(25, 0, -1))[:limit]
+
+
+def test_empty_report():
+    ga4, fake = _client([])
+    df = ga4.run_query(**_query())
+    assert df.empty
+    assert df.columns.tolist() == ["pagePath", "screenPageViews"]
+    assert _pages(fake) == [(0, 10)]
+
+
+def _rows_by_start_date(request):
+    # Each query has its own start date, and as many rows as its day of the month
+    day = int(request.date_ranges[0].start_date[-2:])
+    return [((f"/giorno-{day}/articolo-{i}.html",), (day,)) for i in range(day)]
+
+
+def test_batches_of_more_than_five_reports():
+    ga4, fake = _client(_rows_by_start_date)
+    queries = [_query(start_date=f"2025-06-{day:02d}") for day in range(1, 13)]
+    queries.append(_query(property_id="111111111", start_date="2025-06-13"))
+    results = ga4.run_queries(queries)
+
+    batches = [(b.property, len(b.requests)) for b in fake.batch_requests]
+    assert batches == [(f"properties/{PROPERTY_ID}", MAX_BATCH_REPORTS), (f"properties/{PROPERTY_ID}", MAX_BATCH_REPORTS),
+                       (f"properties/{PROPERTY_ID}", 2), ("properties/111111111", 1)]
+    # The first page of every report comes with its batch, the others with RunReport
+    assert len(fake.run_report_requests) == sum((day - 1) // PAGE_SIZE for day in range(1, 14))
+    for day, df in enumerate(results, start=1):
+        assert df["pagePath"].tolist() == [f"/giorno-{day}/articolo-{i}.html" for i in range(day)]
+        assert (df["screenPageViews"] == day).all()
@@ -0,0 +1,90 @@
+import asyncio
+import random
+
+import pytest
+from google.analytics.data_v1beta.types import PropertyQuota, QuotaStatus, RunReportResponse
+
+import ga4_api.quota as quota_module
+from fake_ga4 import FakeAsyncDataClient, FakeDataClient, page_rows
+from ga4_api.ga4_api import AsyncGa4Client, Ga4Client
+from ga4_api.quota import QuotaTracker, backoff_delay
+
+QUERY = dict(property_id="394327334", dimensions=["pagePath"], metrics=["screenPageViews"],
+             start_date="2025-06-01", end_date="2025-06-30")
+
+
+def _response(consumed, tokens_per_hour, concurrent_requests=10):
+    return RunReportResponse(property_quota=PropertyQuota(
+        tokens_per_hour=QuotaStatus(consumed=consumed, remaining=tokens_per_hour),
+        concurrent_requests=QuotaStatus(consumed=0, remaining=concurrent_requests),
+    ))
+
+
+def _tracker(*responses):
+    tracker = QuotaTracker()
+    for response in responses:
+        with tracker.request():
+            pass
+        tracker.record_response(response)
+    return tracker
+
+
+def test_backoff_delay_is_jittered_and_capped():
+    random.seed(0)
+    for attempt in range(10):
+        delays = [backoff_delay(attempt) for _ in range(200)]
+        cap = min(32.0, 2 ** attempt)
+        assert all(0 <= delay <= cap for delay in delays)
+        assert max(delays) > cap / 2
+
+
+def test_wait_time_until_the_next_hour(monkeypatch):
+    now = 1_750_000_000.0 - 1_750_000_000.0 % 3600 + 600
+    monkeypatch.setattr(quota_module.time, "time", lambda: now)
+    assert _tracker(_response(10, 500)).wait_time() == 0
+    tracker = _tracker(_response(10, 5))
+    assert tracker.wait_time() == 3000
+    # The hourly tokens refill on the next hour
+    monkeypatch.setattr(quota_module.time, "time", lambda: now + 3600)
+    assert tracker.wait_time() == 0
+
+
+@pytest.mark.parametrize("tokens_per_hour, allowed", [(10_000, 8), (400, 4), (250, 2), (50, 1), (0, 1)])
+def test_concurrency_shrinks_with_hourly_tokens(tokens_per_hour, allowed):
+    # 10 tokens per request, and a slot per REQUESTS_PER_CONCURRENT_SLOT (10) requests left
+    assert _tracker(_response(10, tokens_per_hour)).allowed_concurrency(8) == allowed
+
+
+def test_concurrency_bounded_by_concurrent_requests():
+    # The reading counted the request it came with: one more slot than remaining
+    assert _tracker(_response(10, 10_000, concurrent_requests=2)).allowed_concurrency(8) == 3
+    assert _tracker(_response(10, 10_000, concurrent_requests=0)).allowed_concurrency(8) == 1
+
+
+def test_reset_keeps_the_remaining_quota():
+    tracker = _tracker(_response(10, 500), _response(10, 490))
+    assert tracker.usage()["tokens_consumed"] == 20
+    tracker.reset()
+    usage = tracker.usage()
+    assert (usage["requests"], usage["tokens_consumed"], usage["retries"]) == (0, 0, 0)
+    assert usage["remaining_tokens_per_hour"] == 490
+
+
+def test_client_slows_down_as_tokens_run_out():
+    # 25 pages of 100 tokens: 2 requests in flight while 2000+ tokens are left, then 1
+    fake = FakeAsyncDataClient(["pagePath"], ["screenPageViews"], page_rows(250),
+                               tokens_per_hour=3000, tokens_per_request=100, latency=0.005)
+    ga4 = AsyncGa4Client(client=fake, page_size=10, max_concurrency=8)
+    df = asyncio.run(ga4.run_query(**QUERY))
+    assert len(df) == 250
+    assert fake.peak_in_flight == 2
+    assert fake.in_flight_at_calls[-10:] == [1] * 10
+    assert ga4.quota.usage()["remaining_tokens_per_hour"] == 500
+
+
+def test_sync_client_slots_follow_the_quota():
+    fake = FakeDataClient(["pagePath"], ["screenPageViews"], page_rows(250),
+                          tokens_per_hour=2500, tokens_per_request=100)
+    ga4 = Ga4Client(client=fake, page_size=10, max_workers=8)
+    assert len(ga4.run_query(**QUERY)) == 250
+    assert ga4.quota.usage()["peak_concurrent_requests"] <= 2
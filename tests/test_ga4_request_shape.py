@@ -0,0 +1,79 @@
+import pytest
+from google.analytics.data_v1beta.types import Filter, OrderBy
+
+from fake_ga4 import FakeDataClient, page_rows
+from ga4_api.ga4_api import Ga4Client
+from ga4_api.query_filters import HTML_PAGES_FILTER, filter_expression, order_bys
+
+PROPERTY_ID = "394327334"
+
+
+def _sent_request(**kwargs):
+    fake = FakeDataClient(["pagePath"], ["screenPageViews"], page_rows(5))
+    Ga4Client(client=fake).run_query(PROPERTY_ID, ["pagePath"], ["screenPageViews", "activeUsers"],
+                                     "2025-06-01", "2025-06-30", **kwargs)
+    return fake.run_report_requests[0]
+
+
+def test_plain_query():
+    request = _sent_request()
+    assert request.property == f"properties/{PROPERTY_ID}"
+    assert [d.name for d in request.dimensions] == ["pagePath"]
+    assert [m.name for m in request.metrics] == ["screenPageViews", "activeUsers"]
+    assert (request.date_ranges[0].start_date, request.date_ranges[0].end_date) == ("2025-06-01", "2025-06-30")
+    assert "dimension_filter" not in request and "metric_filter" not in request
+    assert not request.order_bys
+    assert request.return_property_quota
+
+
+def test_filters_order_and_limit():
+    request = _sent_request(dimension_filter=HTML_PAGES_FILTER, metric_filter=[("screenPageViews", ">", 30)],
+                            order_by=["-screenPageViews", "pagePath"], limit=100)
+    ends_with, not_root = request.dimension_filter.and_group.expressions
+    assert ends_with.filter.field_name == "pagePath"
+    assert ends_with.filter.string_filter.match_type == Filter.StringFilter.MatchType.ENDS_WITH
+    assert ends_with.filter.string_filter.value == ".html"
+    assert not_root.not_expression.filter.string_filter.value == "/"
+    assert not_root.not_expression.filter.string_filter.match_type == Filter.StringFilter.MatchType.EXACT
+
+    views = request.metric_filter.filter
+    assert views.field_name == "screenPageViews"
+    assert views.numeric_filter.operation == Filter.NumericFilter.Operation.GREATER_THAN
+    assert views.numeric_filter.value.int64_value == 30
+
+    assert request.order_bys[0].metric.metric_name == "screenPageViews" and request.order_bys[0].desc
+    assert request.order_bys[1].dimension.dimension_name == "pagePath" and not request.order_bys[1].desc
+    assert request.limit == 100
+
+
+@pytest.mark.parametrize("condition, check", [
+    (("pagePath", "in", ["/a.html", "/b.html"]),
+     lambda e: list(e.filter.in_list_filter.values) == ["/a.html", "/b.html"] and e.filter.in_list_filter.case_sensitive),
+    (("screenPageViews", "between", (10, 20.5)),
+     lambda e: (e.filter.between_filter.from_value.int64_value, e.filter.between_filter.to_value.double_value) == (10, 20.5)),
+    (("pagePath", "not_contains", "si-fara"),
+     lambda e: e.not_expression.filter.string_filter.match_type == Filter.StringFilter.MatchType.CONTAINS),
+    (("pagePath", "regex", r"^/serie-tv/.*\.html$"),
+     lambda e: e.filter.string_filter.match_type == Filter.StringFilter.MatchType.FULL_REGEXP),
+    (("averageSessionDuration", "<=", 1.5),
+     lambda e: e.filter.numeric_filter.value.double_value == 1.5),
+])
+def test_single_conditions(condition, check):
+    assert check(filter_expression([condition]))
+
+
+def test_filter_expression_passthrough_and_errors():
+    expression = filter_expression(HTML_PAGES_FILTER)
+    assert filter_expression(expression) is expression
+    assert filter_expression([]) is None
+    assert filter_expression(None) is None
+    with pytest.raises(ValueError):
+        filter_expression([("pagePath", "~", "x")])
+
+
+def test_order_bys():
+    result = order_bys(["-activeUsers", "date"], metrics=["activeUsers"])
+    assert result == [
+        OrderBy(metric=OrderBy.MetricOrderBy(metric_name="activeUsers"), desc=True),
+        OrderBy(dimension=OrderBy.DimensionOrderBy(dimension_name="date"), desc=False),
+    ]
@@ -0,0 +1,59 @@
+import pytest
+from google.api_core.exceptions import DeadlineExceeded, InvalidArgument, ResourceExhausted, ServiceUnavailable
+
+import ga4_api.ga4_api as ga4_module
+from fake_ga4 import FakeDataClient, page_rows
+from ga4_api.ga4_api import Ga4Client
+
+QUERY = dict(property_id="394327334", dimensions=["pagePath"], metrics=["screenPageViews"],
+             start_date="2025-06-01", end_date="2025-06-30")
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Records the waits of the client instead of sleeping, with a fixed 1s backoff."""
+    waits = []
+    monkeypatch.setattr(ga4_module.time, "sleep", waits.append)
+    monkeypatch.setattr(ga4_module, "backoff_delay", lambda attempt: 1.0)
+    return waits
+
+
+def _client(retry_deadline=60):
+    fake = FakeDataClient(["pagePath"], ["screenPageViews"], page_rows(5))
+    return Ga4Client(client=fake, retry_deadline=retry_deadline), fake
+
+
+@pytest.mark.parametrize("error", [ServiceUnavailable("down"), DeadlineExceeded("slow"), ResourceExhausted("quota")])
+def test_transient_errors_are_retried(sleeps, error):
+    ga4, fake = _client()
+    fake.errors = [error, error]
+    df = ga4.run_query(**QUERY)
+    assert len(df) == 5
+    assert ga4.quota.usage()["retries"] == 2
+    assert [wait for wait in sleeps if wait] == [1.0, 1.0]
+
+
+def test_batches_are_retried(sleeps):
+    ga4, fake = _client()
+    fake.errors = [ServiceUnavailable("down")]
+    results = ga4.run_queries([QUERY, dict(QUERY, start_date="2025-06-15")])
+    assert [len(df) for df in results] == [5, 5]
+    assert len(fake.batch_requests) == 1
+    assert ga4.quota.usage()["retries"] == 1
+
+
+def test_other_errors_are_raised(sleeps):
+    ga4, fake = _client()
+    fake.errors = [InvalidArgument("unknown metric")]
+    with pytest.raises(InvalidArgument):
+        ga4.run_query(**QUERY)
+    assert ga4.quota.usage()["retries"] == 0
+    assert fake.run_report_requests == []
+
+
+def test_error_raised_past_the_retry_deadline(sleeps):
+    ga4, fake = _client(retry_deadline=0.5)
+    fake.errors = [ServiceUnavailable("down")]
+    with pytest.raises(ServiceUnavailable):
+        ga4.run_query(**QUERY)
+    assert ga4.quota.usage()["retries"] == 0
@@ -0,0 +1,124 @@
+import types
+
+import pytest
+
+import td_data_toolkit.td_db_clients.ArticleClient as article_client_module
+from td_data_toolkit.td_db_clients import WpArticleClient
+from td_data_toolkit.utils.ingest_manifest import diff_articles, load_manifest
+from td_data_toolkit.utils.xml_utils import WxrContentReader, get_articles_from_xml
+
+ITEM = """
+	<item>
+		<title><![CDATA[{title}]]></title>
+		<link>https://www.taxidrivers.it/news/articolo-{post_id}.html</link>
+		<pubDate>Mon, 02 Jun 2025 09:30:00 +0000</pubDate>
+		<category domain="category" nicename="news"><![CDATA[News]]></category>
+		<content:encoded><![CDATA[{body}]]></content:encoded>
+		<wp:post_id>{post_id}</wp:post_id>
+		<wp:post_type><![CDATA[post]]></wp:post_type>
+		<wp:postmeta>
+			<wp:meta_key><![CDATA[post_views_count]]></wp:meta_key>
+			<wp:meta_value><![CDATA[{views}]]></wp:meta_value>
+		</wp:postmeta>
+	</item>"""
+
+
+def write_export(path, posts):
+    """Writes a WordPress export of posts given as {post_id: {"title": ..., "body": ..., "views": ...}}."""
+    items = "".join(ITEM.format(post_id=post_id, title=post.get("title", f"Articolo {post_id}"),
+                                body=post.get("body", f"<p>Il testo dell'articolo {post_id}.</p>"),
+                                views=post.get("views", 0))
+                    for post_id, post in posts.items())
+    path.write_text(
+        '<?xml version="1.0" encoding="UTF-8" ?>\n'
+        '<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/"'
+        ' xmlns:wp="http://wordpress.org/export/1.2/">\n'
+        f"<channel>\n\t<title>Taxidrivers</title>{items}\n</channel>\n</rss>\n",
+        encoding="utf-8")
+    return str(path)
+
+
+def test_view_counts_do_not_change_articles(tmp_path):
+    first = write_export(tmp_path / "day1.xml", {1: {"views": 10}, 2: {"views": 20}})
+    previous = diff_articles(get_articles_from_xml(first), {})["manifest"]
+
+    second = write_export(tmp_path / "day2.xml", {1: {"views": 15}, 2: {"views": 31, "title": "Nuovo titolo"}})
+    diff = diff_articles(get_articles_from_xml(second), previous)
+    assert diff["unchanged"] == 1
+    assert [article["post_id"] for article in diff["changed"]] == ["2"]
+    assert diff["new"] == [] and diff["deleted"] == []
+
+
+def test_lazy_content_changes_are_detected(tmp_path):
+    first = write_export(tmp_path / "day1.xml", {1: {}, 2: {}})
+    with WxrContentReader(first) as reader:
+        previous = diff_articles(get_articles_from_xml(first, lazy_content=True), {}, reader)["manifest"]
+
+    second = write_export(tmp_path / "day2.xml", {1: {"views": 5}, 2: {"body": "<p>Il testo corretto.</p>"}})
+    with WxrContentReader(second) as reader:
+        diff = diff_articles(get_articles_from_xml(second, lazy_content=True), previous, reader)
+    assert diff["unchanged"] == 1
+    assert [article["post_id"] for article in diff["changed"]] == ["2"]
+
+
+@pytest.fixture
+def api_calls(monkeypatch):
+    """Records the requests of the article clients instead of sending them."""
+    calls = []
+
+    def record(method):
+        def send(url, json):
+            calls.append((method, url.rsplit("/articles", 1)[1], json))
+            return types.SimpleNamespace(ok=True, status_code=200)
+        return send
+
+    monkeypatch.setattr(article_client_module.requests, "put", record("PUT"))
+    monkeypatch.setattr(article_client_module.requests, "post", record("POST"))
+    return calls
+
+
+def _ingest(tmp_path, posts, **kwargs):
+    export = write_export(tmp_path / "export.xml", posts)
+    return WpArticleClient().add_wordpress_articles_from_file(export, str(tmp_path / "manifest.json"), **kwargs)
+
+
+def test_partial_export_does_not_mass_delete(tmp_path, api_calls):
+    assert _ingest(tmp_path, {post_id: {} for post_id in range(1, 41)})["status"] == "success"
+    manifest = load_manifest(str(tmp_path / "manifest.json"))
+    api_calls.clear()
+
+    # An export filtered on a category: 30 of the 40 posts are missing, one is edited
+    result = _ingest(tmp_path, {post_id: {"title": "Nuovo titolo"} if post_id == 1 else {} for post_id in range(1, 11)})
+    assert result["status"] == "error"
+    assert api_calls == []
+    assert load_manifest(str(tmp_path / "manifest.json")) == manifest
+
+    result = _ingest(tmp_path, {post_id: {} for post_id in range(1, 11)}, max_delete_share=1.0)
+    assert result["articles_deleted"] == 30
+    assert [(method, path) for method, path, _ in api_calls] == [("POST", "/delete/batch")]
+
+
+def test_few_deletions_go_through(tmp_path, api_calls):
+    _ingest(tmp_path, {post_id: {} for post_id in range(1, 41)})
+    api_calls.clear()
+
+    result = _ingest(tmp_path, {post_id: {} for post_id in range(1, 40)})
+    assert result["status"] == "success"
+    assert api_calls == [("POST", "/delete/batch", {"pagepaths": ["news/articolo-40.html"]})]
+
+
+def test_only_upserted_contents_are_decoded(tmp_path, api_calls, monkeypatch):
+    _ingest(tmp_path, {post_id: {} for post_id in range(1, 41)})
+    api_calls.clear()
+
+    decoded = []
+    read = WxrContentReader.read
+    monkeypatch.setattr(WxrContentReader, "read", lambda self, start, end: decoded.append(start) or read(self, start, end))
+    result = _ingest(tmp_path, {post_id: {"title": "Nuovo titolo"} if post_id == 7 else {"views": 99}
+                                for post_id in range(1, 41)})
+    assert (result["articles_changed"], result["articles_unchanged"]) == (1, 39)
+    assert len(decoded) == 1
+    [(method, path, articles)] = api_calls
+    assert (method, path) == ("PUT", "/batch")
+    assert articles[0]["content"] == "<p>Il testo dell'articolo 7.</p>"
+    assert "content_start" not in articles[0]
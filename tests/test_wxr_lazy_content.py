@@ -0,0 +1,29 @@
+import os
+
+import pytest
+
+from td_data_toolkit.utils.xml_backend import lxml_etree
+from td_data_toolkit.utils.xml_utils import WxrContentReader, get_articles_from_xml, iter_wxr_items, read_wxr_item
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "wxr_content_tag_in_cdata.xml")
+BACKENDS = ["etree", pytest.param("lxml", marks=pytest.mark.skipif(lxml_etree is None, reason="lxml is not installed"))]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_content_tags_inside_cdata(backend):
+    eager = [read_wxr_item(item)["content"] for item in iter_wxr_items(FIXTURE, backend=backend)]
+    assert eager[0].endswith("chiuso da <code></content:encoded></code>.</p>")
+
+    spans = [read_wxr_item(item, lazy_content=True)["content_span"]
+             for item in iter_wxr_items(FIXTURE, lazy_content=True, backend=backend)]
+    with WxrContentReader(FIXTURE) as reader:
+        assert [reader.read(*span) for span in spans] == eager
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_get_articles_from_xml_lazy_content_inside_cdata(workers):
+    eager = get_articles_from_xml(FIXTURE, workers=workers)
+    lazy = get_articles_from_xml(FIXTURE, workers=workers, lazy_content=True)
+    with WxrContentReader(FIXTURE) as reader:
+        assert reader.with_content(lazy) == eager
+    assert [article["post_id"] for article in eager] == ["201", "202"]
@@ -0,0 +1,50 @@
+import os
+import sys
+
+import pytest
+
+from etl.from_wp_ga4_to_report.extractor import Extractor
+from td_data_toolkit.utils.xml_backend import lxml_etree
+from td_data_toolkit.utils.xml_utils import get_articles_from_xml, iter_wxr_items, read_wxr_item
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "wxr_repeated_meta.xml")
+BACKENDS = ["etree", pytest.param("lxml", marks=pytest.mark.skipif(lxml_etree is None, reason="lxml is not installed"))]
+
+
+@pytest.mark.parametrize("meta_wins, focuskw, linkdex", [("first", "prima", "40"), ("last", "ultima", "72")])
+def test_read_wxr_item_meta_wins(meta_wins, focuskw, linkdex):
+    item, = [read_wxr_item(item, meta_wins=meta_wins) for item in iter_wxr_items(FIXTURE)]
+    assert item["meta"] == {"_yoast_wpseo_focuskw": focuskw, "_yoast_wpseo_linkdex": linkdex}
+
+
+def test_read_wxr_item_rejects_unknown_meta_wins():
+    item = next(iter_wxr_items(FIXTURE))
+    with pytest.raises(ValueError):
+        read_wxr_item(item, meta_wins="latest")
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("mode, lazy", [("stream", False), ("stream", True), ("tree", False), ("parallel", False)])
+def test_extractor_keeps_the_last_value(backend, mode, lazy):
+    # As the Extractor always has: every wp:postmeta is assigned in turn
+    wp_df = Extractor({"GA4_FILE_PATH": None, "WP_FILE_PATH": FIXTURE, "WP_XML_MODE": mode,
+                       "WP_XML_WORKERS": 2, "WP_XML_BACKEND": backend, "WP_LAZY_CONTENT": lazy}).extract_wp_data()
+    assert wp_df["_yoast_wpseo_focuskw"].tolist() == ["ultima"]
+    assert wp_df["_yoast_wpseo_linkdex"].tolist() == ["72"]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("workers", [1, 2])
+def test_get_articles_from_xml_keeps_the_first_value(backend, workers):
+    # As its XPath lookup always has
+    article, = get_articles_from_xml(FIXTURE, workers=workers, backend=backend)
+    assert article["_yoast_wpseo_focuskw"] == "prima"
+    assert article["_yoast_wpseo_linkdex"] == "40"
+
+
+def test_get_data_keeps_the_first_value():
+    pytest.importorskip("sqlalchemy")
+    sys.path.append(os.path.join(os.path.dirname(__file__), "..", "postgresql_server"))
+    from postgresql_server.get_data import get_articles_from_xml as get_data_articles
+    article, = get_data_articles(FIXTURE)
+    assert article["yoast_focus_keyword"] == "prima"
@@ -0,0 +1,65 @@
+import pytest
+
+import td_data_toolkit.utils.xml_utils as xml_utils
+from td_data_toolkit.utils.xml_utils import iter_wxr_items, parse_wxr_parallel, read_wxr_item, split_wxr_file
+
+HEADER = b"""<?xml version="1.0" encoding="UTF-8" ?>
+<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/" xmlns:wp="http://wordpress.org/export/1.2/">
+<channel>
+\t<title>Taxidrivers</title>
+"""
+# Post content quoting an RSS feed: </item><item> markup inside CDATA
+CONTENT = b"<p>Il feed:</p><pre></item>\n<item><title>finto</title></item>\n</channel></pre>" * 20
+
+
+def _item(i):
+    return b"""\t<item>
+\t\t<title><![CDATA[Articolo %d]]></title>
+\t\t<content:encoded><![CDATA[%s]]></content:encoded>
+\t\t<wp:post_id>%d</wp:post_id>
+\t\t<wp:post_type><![CDATA[post]]></wp:post_type>
+\t</item>
+""" % (i, CONTENT, i)
+
+
+@pytest.fixture
+def export_path(tmp_path):
+    path = tmp_path / "export.xml"
+    path.write_bytes(HEADER + b"".join(_item(i) for i in range(40)) + b"</channel>\n</rss>\n")
+    return str(path)
+
+
+def _shards(export_path, n_shards):
+    prefix, ranges = split_wxr_file(export_path, n_shards)
+    with open(export_path, "rb") as f:
+        data = f.read()
+    return [data[start:end] for start, end in ranges]
+
+
+@pytest.mark.parametrize("n_shards", [2, 7, 40, 200])
+def test_shards_hold_whole_items(export_path, n_shards):
+    shards = _shards(export_path, n_shards)
+    assert len(shards) > 1
+    for shard in shards:
+        assert shard.lstrip().startswith(b"<item>")
+        # Every item starts with its <title>: a shard cut inside the content would not
+        assert shard.count(b"<item>\n\t\t<title><![CDATA[") == shard.count(b"\t</item>\n")
+
+
+@pytest.mark.parametrize("workers", [2, 5])
+def test_parallel_parse_matches_streaming(export_path, workers):
+    expected = [read_wxr_item(item) for item in iter_wxr_items(export_path)]
+    assert len(expected) == 40
+    assert expected[0]["content"] == CONTENT.decode()
+    assert parse_wxr_parallel(export_path, read_wxr_item, workers=workers, backend="etree") == expected
+
+
+@pytest.mark.parametrize("backend", ["etree", "lxml"])
+def test_bad_split_falls_back_to_a_single_stream(export_path, monkeypatch, backend):
+    prefix, ranges = split_wxr_file(export_path, 1)
+    (start, end), = ranges
+    with open(export_path, "rb") as f:
+        cut = f.read().index(b"</item>\n<item><title>finto") + len(b"</item>\n")
+    monkeypatch.setattr(xml_utils, "split_wxr_file", lambda path, n: (prefix, [(start, cut), (cut, end)]))
+    expected = [read_wxr_item(item) for item in iter_wxr_items(export_path)]
+    assert parse_wxr_parallel(export_path, read_wxr_item, workers=2, backend=backend) == expected
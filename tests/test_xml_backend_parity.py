@@ -0,0 +1,49 @@
+import os
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("lxml")
+
+from etl.from_wp_ga4_to_report.extractor import Extractor
+from td_data_toolkit.utils.xml_utils import get_articles_from_xml, iter_wxr_items, read_wxr_item
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "wxr_empty_cdata.xml")
+
+
+def _read_items(backend):
+    return [read_wxr_item(item) for item in iter_wxr_items(FIXTURE, backend=backend)]
+
+
+def test_read_wxr_item_parity():
+    etree_items, lxml_items = _read_items("etree"), _read_items("lxml")
+    assert lxml_items == etree_items
+    assert etree_items[1]["content"] is None
+    assert etree_items[1]["meta"]["_yoast_wpseo_focuskw"] is None
+    assert etree_items[0]["meta"]["_yoast_wpseo_metadesc"] is None
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_get_articles_from_xml_parity(workers):
+    etree_articles = get_articles_from_xml(FIXTURE, as_dataframe=True, workers=workers, backend="etree")
+    lxml_articles = get_articles_from_xml(FIXTURE, as_dataframe=True, workers=workers, backend="lxml")
+    pd.testing.assert_frame_equal(lxml_articles, etree_articles)
+
+
+@pytest.mark.parametrize("mode", ["stream", "tree", "parallel"])
+def test_extractor_parity(mode):
+    frames = {}
+    for backend in ("etree", "lxml"):
+        extractor = Extractor({"GA4_FILE_PATH": None, "WP_FILE_PATH": FIXTURE,
+                               "WP_XML_MODE": mode, "WP_XML_WORKERS": 2, "WP_XML_BACKEND": backend})
+        frames[backend] = extractor.extract_wp_data()
+    pd.testing.assert_frame_equal(frames["lxml"], frames["etree"])
+    assert frames["etree"]["content"].isna().tolist() == [False, True]
+
+
+def test_cache_version_depends_on_backend():
+    versions = {
+        backend: Extractor({"GA4_FILE_PATH": None, "WP_FILE_PATH": FIXTURE, "WP_XML_BACKEND": backend}).wp_cache_version
+        for backend in ("etree", "lxml")
+    }
+    assert versions["etree"] != versions["lxml"]